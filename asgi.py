@@ -0,0 +1,8 @@
+# asgi.py
+# Optional ASGI entry point (the WSGI one, wsgi.py, is still the default):
+#   uvicorn asgi:app --workers 2
+#   gunicorn -k uvicorn.workers.UvicornWorker -w 2 asgi:app
+
+from resume_site.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1 @@
+"""Load/latency benchmarks for the resume site; run with ``python -m benchmarks.run``."""
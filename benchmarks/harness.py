@@ -0,0 +1,186 @@
+# benchmarks/harness.py
+"""
+Load generation, latency statistics and result storage.
+
+A scenario is a name plus a ``call(client, i) -> status`` function. The
+harness runs it ``requests`` times over ``concurrency`` threads (one client
+per thread, created by ``make_client``), times every call with
+``perf_counter`` and reduces the samples to count/errors/req/s and
+p50/p95/p99. The client is whatever the scenario expects: a Flask test
+client in-process, an ``http.client`` connection against gunicorn.
+
+Results are written to ``benchmarks/results/<commit>.json`` so runs on
+different commits can be compared with ``--compare``.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+@dataclass
+class Scenario:
+    name: str
+    call: Callable[[Any, int], int]  # (client, request number) -> HTTP status
+    ok: tuple[int, ...] = (200,)
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of already-sorted samples."""
+    if not sorted_samples:
+        return math.nan
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(latencies: list[float], errors: int, wall: float) -> dict:
+    samples = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / wall, 1) if wall > 0 else 0.0,
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "mean_ms": ms(sum(samples) / len(samples)) if samples else math.nan,
+        "max_ms": ms(samples[-1]) if samples else math.nan,
+    }
+
+
+def run_scenario(
+    scenario: Scenario,
+    make_client: Callable[[], Any],
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> dict:
+    """Drive ``scenario`` and return its summary (see ``summarize``)."""
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+    latencies: list[float] = []
+    errors = [0]
+    results_lock = threading.Lock()
+    start_gate = threading.Barrier(concurrency + 1)
+
+    def worker():
+        client = make_client()
+        for i in range(warmup // concurrency):
+            try:
+                scenario.call(client, -1 - i)  # warm-up: not timed
+            except Exception:
+                pass
+        start_gate.wait()
+        local, failed = [], 0
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            started = time.perf_counter()
+            try:
+                status = scenario.call(client, i)
+            except Exception:
+                status = None
+            local.append(time.perf_counter() - started)
+            if status not in scenario.ok:
+                failed += 1
+        with results_lock:
+            latencies.extend(local)
+            errors[0] += failed
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    wall_started = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_started
+    return summarize(latencies, errors[0], wall)
+
+
+# --- results ---
+
+def git_commit() -> str:
+    """Short HEAD hash, suffixed with ``-dirty`` when tracked files are modified."""
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{sha}-dirty" if dirty else sha
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "executable": sys.executable,
+    }
+
+
+def save_results(payload: dict, directory: Path = RESULTS_DIR) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{payload['commit']}.json"
+    payload = {**payload, "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def load_results(ref: str, directory: Path = RESULTS_DIR) -> Optional[dict]:
+    """Results by file path or by commit name under ``directory``."""
+    path = Path(ref)
+    if not path.is_file():
+        path = directory / f"{ref}.json"
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def format_table(results: dict, baseline: Optional[dict] = None) -> str:
+    """One row per mode/scenario; with a baseline, p50/p95/req/s deltas in %."""
+    header = f"{'mode':<10} {'scenario':<16} {'n':>6} {'err':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for mode, scenarios in results.items():
+        for name, row in scenarios.items():
+            line = (
+                f"{mode:<10} {name:<16} {row['count']:>6} {row['errors']:>4} {row['rps']:>9.1f} "
+                f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+            )
+            old = (baseline or {}).get(mode, {}).get(name)
+            if old:
+                line += "   " + " ".join(
+                    f"{label} {_delta(row[key], old[key])}"
+                    for label, key in (("req/s", "rps"), ("p50", "p50_ms"), ("p95", "p95_ms"))
+                )
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _delta(new: float, old: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Benchmark the site in-process (Flask test client) and under gunicorn.
+
+Scenarios: GET /, GET /resume, POST /resume (mail goes to a local SMTP sink
+with optional accept latency) and the admin listing over a seeded
+EmailRequest table. Each reports req/s and p50/p95/p99 latency; results are
+saved to benchmarks/results/<commit>.json.
+
+Everything runs against a scratch SQLite database in a temp directory
+unless --database-url is given (it is seeded, so never point it at real data).
+The gunicorn run uses gunicorn.conf.py, i.e. the Procfile settings.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --mode inprocess --requests 500 --concurrency 4
+    python -m benchmarks.run --smtp-latency 200 --mail-mode inline --compare 3af7851
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+from .harness import (
+    ROOT,
+    Scenario,
+    environment,
+    format_table,
+    git_commit,
+    load_results,
+    run_scenario,
+    save_results,
+)
+
+sys.path.insert(0, str(ROOT))
+from tests.smtp_sink import SMTPSink  # noqa: E402
+
+logger = logging.getLogger("benchmarks")
+
+ADMIN_PATH = "/secret-email-view-98347"
+FORM_TYPE = "application/x-www-form-urlencoded"
+
+def _ensure_logging():
+    # If the root logger has no handlers (invoked outside Flask), set a sane default.
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(name)s — %(levelname)s — %(message)s")
+
+
+# --- clients: both expose request(method, path, body) -> status ---
+
+class TestClientDriver:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        resp = self.client.open(path, method=method, data=body, content_type=FORM_TYPE if body else None)
+        resp.get_data()  # drain streamed bodies
+        resp.close()
+        return resp.status_code
+
+
+class HTTPDriver:
+    """HTTP/1.1 client for one benchmark thread; a fresh connection per request
+    unless ``keepalive`` (gthread workers answer kept-alive connections only
+    after their poll loop wakes up, which dominates small-page latency)."""
+
+    def __init__(self, port, keepalive=False):
+        self.port = port
+        self.keepalive = keepalive
+        self.conn = None
+
+    def request(self, method, path, body=None):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        headers = {"Content-Type": FORM_TYPE} if body else {}
+        if not self.keepalive:
+            headers["Connection"] = "close"
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            self.close()  # reconnect on the next request
+            raise
+        if resp.will_close or not self.keepalive:
+            self.close()
+        return resp.status
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def build_scenarios(tag, admin_password):
+    def form(i):
+        return urlencode({"name": f"Bench {i}", "email": f"bench-{tag}-{i}@example.com", "format": "pdf"})
+
+    admin = f"{ADMIN_PATH}?{urlencode({'password': admin_password})}"
+    return [
+        Scenario("GET /", lambda c, i: c.request("GET", "/")),
+        Scenario("GET /resume", lambda c, i: c.request("GET", "/resume")),
+        Scenario("POST /resume", lambda c, i: c.request("POST", "/resume", form(i))),
+        Scenario("GET admin", lambda c, i: c.request("GET", admin)),
+    ]
+
+
+# --- environment ---
+
+def bench_env(workdir, sink_port, args):
+    """Environment for both the in-process app and the gunicorn children."""
+    env = {
+        "FLASK_ENV": "production",
+        "DATABASE_URL": args.database_url or f"sqlite:///{workdir / 'bench.db'}",
+        "SECRET_KEY": os.getenv("SECRET_KEY") or "bench-secret",
+        "ADMIN_PASSWORD": os.getenv("ADMIN_PASSWORD") or "bench-admin",
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": str(sink_port),
+        "MAIL_USE_TLS": "False",
+        "MAIL_USE_SSL": "False",
+        "MAIL_USERNAME": "bench",
+        "MAIL_PASSWORD": "bench",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "MAIL_QUEUE_ENABLED": str(args.mail_mode == "queue"),
+        "RATE_LIMIT_ENABLED": "False",  # every request comes from 127.0.0.1
+        "RATE_LIMIT_SQLITE_PATH": str(workdir / "ratelimit.db"),
+        "METRICS_DIR": str(workdir / "metrics"),
+        "TEMPLATE_CACHE_DIR": str(workdir / "jinja_cache"),
+        "LOG_DIR": str(workdir / "logs"),
+    }
+    for key in [k for k in os.environ if k.startswith("BREVO_")]:
+        os.environ.pop(key)  # these take precedence over MAIL_* in config.py
+    return env
+
+
+def seed_email_requests(app, rows):
+    """Create the schema and insert ``rows`` EmailRequest rows (in chunks)."""
+    from sqlalchemy import func, insert, select
+
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+
+    with app.app_context():
+        db.create_all()
+        existing = db.session.scalar(select(func.count()).select_from(EmailRequest))
+        now = datetime.now(timezone.utc)
+        batch = []
+        for n in range(existing, rows):
+            stamp = now - timedelta(minutes=n)
+            batch.append({
+                "name": f"Seed {n}",
+                "email": f"seed-{n}@example.com",
+                "ip_address": f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}",
+                "timestamp": stamp,
+                "request_count": 1 + n % 3,
+                "last_requested_at": stamp,
+            })
+            if len(batch) == 5000:
+                db.session.execute(insert(EmailRequest), batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(EmailRequest), batch)
+        db.session.commit()
+        return max(rows - existing, 0)
+
+
+def _shutdown(app):
+    """Stop the in-process app's background threads before the sink and temp dir go away."""
+    for name in ("mail_queue", "download_recorder", "log_queue"):
+        component = app.extensions.get(name)
+        if component is not None:
+            component.stop()
+
+
+def _quiet_console(app, path):
+    """Send the app's console log output to a file; the handlers' cost stays the same."""
+    log_queue = app.extensions.get("log_queue")
+    handlers = log_queue.handlers if log_queue is not None else app.logger.handlers
+    stream = open(path, "a")  # left open: handlers flush at exit
+    for handler in handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(stream)
+
+
+# --- modes ---
+
+def run_inprocess(app, scenarios, args):
+    results = {}
+    for scenario in scenarios:
+        logger.info("in-process: %s", scenario.name)
+        results[scenario.name] = run_scenario(
+            scenario, lambda: TestClientDriver(app), args.requests, args.concurrency, args.warmup
+        )
+    return results
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(proc, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            if HTTPDriver(port).request("GET", "/") == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    return False
+
+
+def run_gunicorn(env, scenarios, args, workdir):
+    port = _free_port()
+    child_env = {
+        **os.environ,
+        **env,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(args.workers),
+        "GUNICORN_THREADS": str(args.threads),
+    }
+    log_path = workdir / "gunicorn.log"
+    with open(log_path, "ab") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+            cwd=ROOT, env=child_env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    try:
+        if not _wait_ready(proc, port, args.startup_timeout):
+            logger.error("❌ gunicorn did not come up; see %s", log_path)
+            return None
+        results = {}
+        for scenario in scenarios:
+            logger.info("gunicorn: %s", scenario.name)
+            results[scenario.name] = run_scenario(
+                scenario, lambda: HTTPDriver(port, args.keepalive), args.requests, args.concurrency, args.warmup
+            )
+        return results
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    _ensure_logging()
+
+    parser = argparse.ArgumentParser(description="Benchmark the resume site.")
+    parser.add_argument("--mode", choices=("inprocess", "gunicorn", "both"), default="both")
+    parser.add_argument("--requests", type=int, default=1000, help="Timed requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads.")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests per scenario.")
+    parser.add_argument("--seed-rows", type=int, default=50_000, help="EmailRequest rows for the admin listing.")
+    parser.add_argument("--smtp-latency", type=float, default=0.0, help="SMTP sink accept latency (ms).")
+    parser.add_argument("--smtp-max-rate", type=float, help="SMTP sink acceptance cap (messages/s).")
+    parser.add_argument("--smtp-transient-rate", type=float, default=0.0,
+                        help="Fraction of messages the sink defers with 451.")
+    parser.add_argument("--mail-mode", choices=("queue", "inline"), default="queue",
+                        help="POST /resume enqueues (default) or sends inline.")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers (Procfile: 2).")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads (Procfile: 8).")
+    parser.add_argument("--keepalive", action="store_true", help="Reuse HTTP connections (gunicorn mode).")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--database-url", help="Scratch database to seed and use instead of SQLite.")
+    parser.add_argument("--compare", metavar="REF", help="Commit (or results file) to compare with.")
+    parser.add_argument("--no-save", action="store_true", help="Don't write benchmarks/results/.")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp directory (DB, logs).")
+    parser.add_argument("--allow-dotenv", action="store_true",
+                        help="Run even though a .env file exists (config.py lets it override settings).")
+    args = parser.parse_args()
+
+    if (ROOT / ".env").exists() and not args.allow_dotenv:
+        logger.error("❌ .env overrides the benchmark's mail/DB settings; move it aside or pass --allow-dotenv")
+        raise SystemExit(2)
+
+    workdir = Path(tempfile.mkdtemp(prefix="resume-bench-"))
+    sink = SMTPSink(
+        latency=args.smtp_latency / 1000,
+        max_rate=args.smtp_max_rate,
+        transient_rate=args.smtp_transient_rate,
+        seed=0,
+    ).start()
+    env = bench_env(workdir, sink.port, args)
+    os.environ.update(env)  # before config.py is imported
+
+    from resume_site import create_app
+
+    results = {}
+    app = None
+    try:
+        # Schema and rows first, like a deploy's release phase: create_app()
+        # keeps the mail queue on only if its table already exists
+        setup = create_app({"MAIL_QUEUE_ENABLED": False})
+        try:
+            _quiet_console(setup, workdir / "inprocess.log")
+            seeded = seed_email_requests(setup, args.seed_rows)
+        finally:
+            _shutdown(setup)
+        logger.info("Seeded %s EmailRequest rows; working in %s", seeded, workdir)
+        app = create_app()
+        _quiet_console(app, workdir / "inprocess.log")
+
+        tag = str(int(time.time()))
+        if args.mode in ("inprocess", "both"):
+            results["inprocess"] = run_inprocess(app, build_scenarios(f"i{tag}", env["ADMIN_PASSWORD"]), args)
+        if args.mode in ("gunicorn", "both"):
+            gunicorn_results = run_gunicorn(env, build_scenarios(f"g{tag}", env["ADMIN_PASSWORD"]), args, workdir)
+            if gunicorn_results is None:
+                raise SystemExit(1)
+            results["gunicorn"] = gunicorn_results
+    finally:
+        if app is not None:
+            _shutdown(app)
+        sink.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        previous = load_results(args.compare)
+        if previous is None:
+            logger.warning("No results found for %s", args.compare)
+        else:
+            baseline = previous["results"]
+    print(format_table(results, baseline))
+
+    if not args.no_save:
+        path = save_results({
+            "commit": git_commit(),
+            "environment": environment(),
+            "settings": {
+                key: getattr(args, key)
+                for key in ("requests", "concurrency", "warmup", "seed_rows", "smtp_latency",
+                            "smtp_max_rate", "smtp_transient_rate", "mail_mode", "workers", "threads", "keepalive")
+            } | {"database": env["DATABASE_URL"].split(":", 1)[0]},
+            "smtp": dict(sink.stats),
+            "results": results,
+        })
+        logger.info("Results saved to %s", path)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 import os
 import logging
-from logging.handlers import RotatingFileHandler
-logging.basicConfig(level=logging.DEBUG)
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -27,6 +25,56 @@ if not DATABASE_URL:
     else:
         raise RuntimeError("❌ DATABASE_URL is not set in the environment.")
 
+# --- SQLAlchemy engine / pool tuning ---
+# One pooled connection per gunicorn thread (Procfile: --threads 8) plus one per
+# mail dispatcher thread, so request threads never queue behind the pool.
+WEB_THREADS = int(os.getenv("GUNICORN_THREADS", 8))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", WEB_THREADS + int(os.getenv("MAIL_QUEUE_WORKERS", 2))))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds waiting for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds; below typical server idle cutoffs
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 5000))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 5))  # seconds
+
+
+def build_engine_options(database_url: str) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS for the given URL (pool sizing + per-backend timeouts).
+
+    pool_pre_ping replaces the old per-request ``SELECT 1``: stale connections are
+    detected when checked out of the pool instead of on every POST.
+    """
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if database_url.startswith(("postgres://", "postgresql")):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={
+                "connect_timeout": DB_CONNECT_TIMEOUT,
+                "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+            },
+        )
+    elif database_url.startswith("sqlite") and ":memory:" not in database_url:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            # sqlite3 busy timeout (seconds) is the closest analogue to a statement timeout
+            connect_args={"timeout": DB_STATEMENT_TIMEOUT_MS / 1000},
+        )
+    return options
+
+
+def build_binds(replica_url: str) -> dict:
+    """SQLALCHEMY_BINDS with the read replica (if any) under the ``replica`` key."""
+    if not replica_url:
+        return {}
+    return {"replica": {"url": replica_url, **build_engine_options(replica_url)}}
+
+
 # Load and validate critical secrets
 SECRET_KEY = os.getenv("SECRET_KEY")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
@@ -40,6 +88,29 @@ class Config:
 
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(DATABASE_URL)
+
+    # SQLite profile (resume_site/sqlite_tuning.py), file databases only: pragmas on
+    # connect, an in-process queue for the single write slot, periodic checkpoints
+    SQLITE_TUNING = str_to_bool(os.getenv("SQLITE_TUNING", "True"))
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))  # bytes
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 16384))  # per connection
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", DB_STATEMENT_TIMEOUT_MS))
+    SQLITE_WRITE_QUEUE = str_to_bool(os.getenv("SQLITE_WRITE_QUEUE", "True"))
+    SQLITE_MAINTENANCE_INTERVAL = float(os.getenv("SQLITE_MAINTENANCE_INTERVAL", 300))  # seconds; 0 = off
+    SQLITE_CHECKPOINT_MODE = os.getenv("SQLITE_CHECKPOINT_MODE", "PASSIVE")  # PASSIVE | FULL | RESTART | TRUNCATE
+
+    # Optional read replica (resume_site/replica.py): reads from these endpoints go
+    # there while it is up and no more than REPLICA_MAX_LAG seconds behind
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "").strip()
+    SQLALCHEMY_BINDS = build_binds(DATABASE_REPLICA_URL)
+    REPLICA_READ_ENDPOINTS = ("main.email_requests",)
+    REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 5))  # seconds
+    REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", 5))  # seconds between health/lag checks
+    REPLICA_RETRY_AFTER = float(os.getenv("REPLICA_RETRY_AFTER", 30))  # seconds out of rotation after a failure
+    REPLICA_LAG_QUERY = os.getenv("REPLICA_LAG_QUERY")  # returns lag in seconds; built in for Postgres
 
     MAIL_DEBUG = 0
     MAIL_SERVER = os.getenv("BREVO_MAIL_SERVER") or os.getenv("MAIL_SERVER")
@@ -51,6 +122,111 @@ class Config:
     # MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER")
     MAIL_DEFAULT_SENDER = os.getenv("BREVO_MAIL_DEFAULT_SENDER") or os.getenv("MAIL_DEFAULT_SENDER")
 
+    # SMTP connection pool: authenticated sessions reused across sends (per process)
+    MAIL_POOL_ENABLED = str_to_bool(os.getenv("MAIL_POOL_ENABLED", "True"))
+    MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", 2))
+    MAIL_POOL_MAX_MESSAGES = int(os.getenv("MAIL_POOL_MAX_MESSAGES", 50))  # recycle after N sends
+    MAIL_POOL_IDLE_TIMEOUT = float(os.getenv("MAIL_POOL_IDLE_TIMEOUT", 30))  # seconds
+    MAIL_POOL_ACQUIRE_TIMEOUT = float(os.getenv("MAIL_POOL_ACQUIRE_TIMEOUT", 30))  # seconds
+
+    # Outbound mail queue: POST /resume enqueues, background dispatcher threads send
+    MAIL_QUEUE_ENABLED = str_to_bool(os.getenv("MAIL_QUEUE_ENABLED", "True"))
+    MAIL_QUEUE_WORKERS = int(os.getenv("MAIL_QUEUE_WORKERS", 2))
+    MAIL_QUEUE_POLL_INTERVAL = float(os.getenv("MAIL_QUEUE_POLL_INTERVAL", 5))  # seconds
+    MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("MAIL_QUEUE_MAX_ATTEMPTS", 5))
+    MAIL_QUEUE_BACKOFF_BASE = float(os.getenv("MAIL_QUEUE_BACKOFF_BASE", 30))  # seconds
+    MAIL_QUEUE_BACKOFF_MAX = float(os.getenv("MAIL_QUEUE_BACKOFF_MAX", 3600))  # seconds
+    MAIL_QUEUE_STALE_AFTER = float(os.getenv("MAIL_QUEUE_STALE_AFTER", 300))  # seconds
+
+    # ASGI mode (asgi.py): WSGI requests run on a bounded thread pool; resume()
+    # mail goes out on the event loop (aiosmtplib) or on a small executor.
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", 32))
+    ASGI_MAX_BODY = int(os.getenv("ASGI_MAX_BODY", 10_000_000))  # bytes; larger bodies get 413
+    ASYNC_MAIL_BACKEND = os.getenv("ASYNC_MAIL_BACKEND", "auto")  # auto | aiosmtplib | executor
+    ASYNC_MAIL_CONCURRENCY = int(os.getenv("ASYNC_MAIL_CONCURRENCY", 200))  # sends in flight
+    ASYNC_MAIL_THREADS = int(os.getenv("ASYNC_MAIL_THREADS", 4))  # executor backend only
+
+    # Full-page cache for the content pages (invalidated when any template changes)
+    RESPONSE_CACHE_ENABLED = str_to_bool(os.getenv("RESPONSE_CACHE_ENABLED", "True"))
+    RESPONSE_CACHE_ENDPOINTS = ("main.index", "main.resume", "main.books", "main.references")
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 8_000_000))
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # memory | filesystem | redis
+    RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR")  # filesystem backend; default instance/page_cache
+    RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 3600))  # seconds, shared backends only
+    RESPONSE_CACHE_CHECK_INTERVAL = float(os.getenv("RESPONSE_CACHE_CHECK_INTERVAL", 2))  # template mtime poll
+
+    # HTTP validators / Cache-Control for GET routes of the main blueprint.
+    # CONDITIONAL_ENDPOINTS render from templates only, so they also get
+    # Last-Modified and a pre-render 304 check.
+    CONDITIONAL_ENDPOINTS = ("main.index", "main.resume", "main.books", "main.references")
+    CACHE_CONTROL_DEFAULT = "no-cache"
+    CACHE_CONTROL_POLICIES = {
+        "main.index": "public, max-age=300",
+        "main.resume": "public, max-age=300",
+        "main.books": "public, max-age=3600",
+        "main.references": "public, max-age=3600",
+        "main.email_requests": "no-store",
+        "main.test_email": "no-store",
+        "main.metrics": "no-store",
+        "main.profiles": "no-store",
+    }
+
+    # Request/DB/SMTP metrics at /metrics (admin password). Each worker writes
+    # its counters to METRICS_DIR/<pid>.json so a scrape sums all workers;
+    # clear the directory when the server (re)starts.
+    METRICS_ENABLED = str_to_bool(os.getenv("METRICS_ENABLED", "True"))
+    METRICS_DIR = os.getenv("METRICS_DIR")  # default instance/metrics
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))  # seconds
+
+    # Per-request cProfile, triggered by ?profile=1 (or X-Profile: 1) plus the
+    # admin password; results listed at /admin/profiles.
+    PROFILING_ENABLED = str_to_bool(os.getenv("PROFILING_ENABLED", "False"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR")  # default instance/profiles
+    PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 20))  # newest profiles kept on disk
+
+    # Proxies in front of the app (Heroku's router = 1) whose X-Forwarded-For/-Proto
+    # are trusted, so remote_addr (rate limits, logs) is the visitor, not the router
+    TRUSTED_PROXIES = int(os.getenv("TRUSTED_PROXIES", 0))
+
+    # Token-bucket limits for endpoints that send email, as "N/period" per key
+    # (ip and/or submitted email). "sqlite" shares buckets across gunicorn workers.
+    RATE_LIMIT_ENABLED = str_to_bool(os.getenv("RATE_LIMIT_ENABLED", "True"))
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite")  # memory | sqlite
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH")  # default instance/rate_limits.sqlite3
+    RATE_LIMITS = {
+        "main.resume": {
+            "methods": ("POST",),
+            "ip": os.getenv("RATE_LIMIT_RESUME_IP", "5/minute"),
+            "email": os.getenv("RATE_LIMIT_RESUME_EMAIL", "3/hour"),
+        },
+        "main.test_email": {
+            "methods": ("GET",),
+            "ip": os.getenv("RATE_LIMIT_TEST_EMAIL_IP", "2/minute"),
+        },
+    }
+
+    # Direct résumé downloads. USE_X_SENDFILE hands the file to a fronting
+    # nginx/Apache instead of streaming it from the worker.
+    RESUME_DOWNLOAD_MAX_AGE = int(os.getenv("RESUME_DOWNLOAD_MAX_AGE", 3600))  # seconds
+    USE_X_SENDFILE = str_to_bool(os.getenv("USE_X_SENDFILE", "False"))
+    RESUME_DOWNLOAD_QUEUE_SIZE = int(os.getenv("RESUME_DOWNLOAD_QUEUE_SIZE", 1000))  # events buffered per process
+    RESUME_DOWNLOAD_BATCH_SIZE = int(os.getenv("RESUME_DOWNLOAD_BATCH_SIZE", 100))
+
+    # Responsive image variants for static/images (requires Pillow; plain <img> without it)
+    IMAGE_WIDTHS = tuple(int(w) for w in os.getenv("IMAGE_WIDTHS", "320,640,960,1280").split(","))
+    IMAGE_FORMATS = tuple(os.getenv("IMAGE_FORMATS", "avif,webp").split(","))  # preference order
+    IMAGE_QUALITY = {"webp": 80, "avif": 55}
+    IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR")  # default instance/image_cache
+
+    # Compile every template in create_app() (drafts excluded), and keep Jinja's
+    # compiled bytecode on disk so workers and restarts skip the compile step.
+    TEMPLATE_WARMUP = str_to_bool(os.getenv("TEMPLATE_WARMUP", "True"))
+    TEMPLATE_WARMUP_EXCLUDE = ("_drafts/",)  # template-name prefixes never warmed
+    TEMPLATE_BYTECODE_CACHE = str_to_bool(os.getenv("TEMPLATE_BYTECODE_CACHE", "True"))
+    TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR")  # default instance/jinja_cache
+
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SECURE = False
     SESSION_COOKIE_SAMESITE = "Lax"
@@ -59,7 +235,13 @@ class Config:
 
     LOGGING_LEVEL = logging.INFO
     LOG_FORMAT = "%(asctime)s — %(name)s — %(levelname)s — %(message)s"
-    LOG_DIR = os.path.join(basedir, "logs")
+    LOG_JSON = str_to_bool(os.getenv("LOG_JSON", "False"))  # one JSON object per line instead of LOG_FORMAT
+    REQUEST_ID_HEADER = "X-Request-ID"
+    REQUEST_LOG_ENABLED = str_to_bool(os.getenv("REQUEST_LOG_ENABLED", "True"))  # one access line per request
+    LOG_DIR = os.getenv("LOG_DIR", os.path.join(basedir, "logs"))
     LOG_FILE = os.path.join(LOG_DIR, "app.log")
-    MAX_LOG_SIZE = 100000  # 100 KB
-    BACKUP_COUNT = 1
\ No newline at end of file
+    MAX_LOG_SIZE = int(os.getenv("MAX_LOG_SIZE", 10_000_000))  # 10 MB
+    BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
+    # Request threads only enqueue records; one listener thread per process writes them
+    LOG_QUEUE_ENABLED = str_to_bool(os.getenv("LOG_QUEUE_ENABLED", "True"))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10_000))  # records; overflow is dropped + counted
\ No newline at end of file
@@ -0,0 +1,44 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the Procfile (``gunicorn -c gunicorn.conf.py wsgi:app``).
+Gunicorn also picks them up for the ASGI entry point (``asgi:app`` with a
+uvicorn worker class); the hooks unwrap its bridge to reach the Flask app.
+
+Preload is on by default: the master builds and warms the app once and the
+workers are forked from it, sharing that memory copy-on-write and starting
+without re-importing anything. Set GUNICORN_PRELOAD=false to have every
+worker import ``wsgi.py`` itself (needed for ``--reload``-style code swaps
+on HUP, which preload does not pick up).
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))  # config.py sizes the DB pool from this
+timeout = 60
+graceful_timeout = 30
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _flask_app(server):
+    # Under ``-k uvicorn.workers.UvicornWorker asgi:app`` the loaded object is
+    # the WSGIBridge from resume_site.asgi; the hooks need the Flask app inside
+    app = server.app.wsgi()
+    return getattr(app, "app", app)
+
+
+def on_starting(server):
+    # With preload the app is already built; clear the previous run's metrics
+    if server.cfg.preload_app:
+        from resume_site.lifecycle import on_server_start
+
+        on_server_start(_flask_app(server))
+
+
+def post_fork(server, worker):
+    # Without preload the worker has not loaded the app yet; nothing to reset
+    if server.cfg.preload_app:
+        from resume_site.lifecycle import after_fork
+
+        after_fork(_flask_app(server))
@@ -1,32 +1,61 @@
 # resume_site/__init__.py
+import time
+
+_import_started = time.perf_counter()
 
 import logging
-from logging.handlers import RotatingFileHandler
 from pathlib import Path
 import smtplib
 
 from flask import Flask, render_template
+from werkzeug.middleware.proxy_fix import ProxyFix
 
-from config import Config
+from config import Config, build_binds, build_engine_options
+from .attachments import attachment_cache
 from .extensions import db, mail
-from .routes import main_bp  # <-- single blueprint to register
-from dotenv import load_dotenv
+from .log_queue import SafeRotatingFileHandler, start_log_queue
+from .request_log import init_request_logging, make_formatter
+from .routes import RESUME_FILES, main_bp  # <-- single blueprint to register
+from .startup import StartupTimer, config_defaults, create_all_once
+
+IMPORT_MS = (time.perf_counter() - _import_started) * 1000  # package + Flask/SQLAlchemy imports
+
+# .env is loaded once, by config.py, before Config is evaluated
 
 # Disable smtplib verbose output globally (can override with APP_SMTP_DEBUG if you add it later)
 smtplib.SMTP.debuglevel = 0
-load_dotenv()
+
+_first_factory = True
 
 
 def create_app(config_object: dict | None = None) -> Flask:
     """Application factory for the resume site."""
+    timer = StartupTimer()
     app = Flask(
         __name__,
         static_folder=Config.STATIC_FOLDER,
         instance_relative_config=True,
     )
-    app.config.from_object(Config)
+    app.config.update(config_defaults(Config))  # same result as from_object(Config), resolved once
     if config_object:
         app.config.update(config_object)
+        # A different database URL needs options for its own backend
+        if (
+            "SQLALCHEMY_DATABASE_URI" in config_object
+            and "SQLALCHEMY_ENGINE_OPTIONS" not in config_object
+        ):
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = build_engine_options(
+                app.config["SQLALCHEMY_DATABASE_URI"]
+            )
+        if "DATABASE_REPLICA_URL" in config_object and "SQLALCHEMY_BINDS" not in config_object:
+            app.config["SQLALCHEMY_BINDS"] = build_binds(app.config["DATABASE_REPLICA_URL"])
+
+    # Behind a router: take the client address/scheme from its X-Forwarded-* headers
+    proxies = int(app.config.get("TRUSTED_PROXIES") or 0)
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+
+    timer.lap("config")
 
     # --- Extensions ---
     db.init_app(app)
@@ -36,27 +65,85 @@ def create_app(config_object: dict | None = None) -> Flask:
         # Optional if mail extension may be absent in some environments
         pass
 
+    # --- SQLite: WAL/mmap/busy_timeout on connect + in-process write queue ---
+    from .sqlite_tuning import init_sqlite_tuning
+    init_sqlite_tuning(app)
+    timer.lap("extensions")
+
     # --- Logging ---
     _configure_logging(app)
+    # Request id / access log hooks go first so every later hook's logs carry the id
+    init_request_logging(app)
+    timer.lap("logging")
+
+    # --- Metrics: request/DB/SMTP timings, scraped at /metrics ---
+    from .metrics import init_metrics
+    init_metrics(app)
+
+    # --- Opt-in cProfile of single requests (no hooks, no cProfile import unless enabled) ---
+    if app.config.get("PROFILING_ENABLED"):
+        from .profiling import init_profiling
+        init_profiling(app)
+
+    # --- Outbound mail queue (dispatcher threads start on first request) ---
+    from .mail_queue import init_mail_queue
+    init_mail_queue(app)
+
+    # --- Résumé download events (writer thread starts on first download) ---
+    from .downloads import init_download_recorder
+    init_download_recorder(app)
+    timer.lap("background")
 
     # Safe summary (avoid printing full DATABASE_URL with creds)
     uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
     backend = uri.split(":", 1)[0] if ":" in uri else uri
     app.logger.info("App initialized. DB backend=%s ENV=%s", backend, app.config.get("FLASK_ENV"))
+    _log_db_pool(app)
+
+    # --- Optional read replica for the admin listing (see replica.py) ---
+    from .replica import init_replica
+    init_replica(app)
+    timer.lap("db_pool")
 
     # --- Asset checks (optional) ---
     photo_path = Path(app.static_folder) / "images" / "don.jpg"
     if not photo_path.exists():
         app.logger.warning("Home photo not found at: %s", photo_path)
 
-    for name in ("Resume.v3.4.pdf", "Resume.v3.4.docx"):
+    for name in RESUME_FILES.values():
         resume_path = Path(app.static_folder) / "files" / name
-        if not resume_path.exists():
+        # Warming pre-encodes the attachment (and its download ETag) so the first send skips disk + base64
+        if not attachment_cache.warm(resume_path):
             app.logger.warning("Missing resume file: %s", resume_path)
+    timer.lap("assets")
+
+    # --- Rate limits: registered first so rejected requests do no DB/SMTP work ---
+    from .rate_limit import init_rate_limits
+    init_rate_limits(app)
 
     # --- Blueprints ---
     app.register_blueprint(main_bp)
 
+    # --- Fingerprinted / precompressed static assets (if built) ---
+    from .static_assets import init_static_assets
+    init_static_assets(app)
+
+    # --- Responsive WebP/AVIF image variants + picture() template helper ---
+    from .images import init_images
+    init_images(app)
+
+    # --- HTTP caching: validators/304 first, so they short-circuit before the page cache ---
+    from .conditional import init_conditional_requests
+    from .page_cache import init_page_cache
+    init_conditional_requests(app)
+    init_page_cache(app)
+    timer.lap("routes_and_hooks")
+
+    # --- Templates: compile all now (bytecode cached on disk) instead of on first hit ---
+    from .template_cache import init_template_cache
+    init_template_cache(app)
+    timer.lap("templates")
+
     # --- Error handlers ---
     @app.errorhandler(404)
     def handle_404_error(e):
@@ -73,35 +160,78 @@ def create_app(config_object: dict | None = None) -> Flask:
     except Exception as exc:
         app.logger.warning("validate_config skipped or failed: %s", exc)
 
-    # Only auto-create tables in testing or development
+    # Only auto-create tables in testing or development (once per database per process)
     if app.testing or app.debug:
-        with app.app_context():
-            try:
-                db.create_all()
+        try:
+            if create_all_once(app, db):
                 app.logger.info("✅ Database tables created or verified (dev/test).")
-            except Exception as e:
-                app.logger.exception("❌ Failed to create database tables")
+        except Exception as e:
+            app.logger.exception("❌ Failed to create database tables")
+    else:
+        # Production schema comes from `dev_db.py migrate` (Procfile release phase)
+        from .mail_queue import require_queue_table
+        require_queue_table(app)
+    timer.lap("schema")
 
+    _log_startup(app, timer)
     return app
 
 
+def _log_startup(app: Flask, timer: StartupTimer) -> None:
+    """Log per-phase factory timings (plus package import time on the first call)."""
+    global _first_factory
+    app.extensions["startup_timings"] = dict(timer.phases, total=timer.total_ms)
+    if _first_factory:
+        _first_factory = False
+        app.logger.info("Startup: import=%.1fms %s", IMPORT_MS, timer.report())
+    else:
+        app.logger.info("Startup: %s", timer.report())
+
+
+def _log_db_pool(app: Flask) -> None:
+    """Log the effective pool settings of the engine Flask-SQLAlchemy built."""
+    try:
+        with app.app_context():
+            pool = db.engine.pool
+    except Exception as exc:
+        app.logger.warning("DB pool check skipped: %s", exc)
+        return
+    app.logger.info(
+        "DB pool: %s size=%s max_overflow=%s timeout=%s pre_ping=%s recycle=%s",
+        type(pool).__name__,
+        pool.size() if hasattr(pool, "size") else "n/a",
+        getattr(pool, "_max_overflow", "n/a"),
+        getattr(pool, "_timeout", "n/a"),
+        getattr(pool, "_pre_ping", False),
+        getattr(pool, "_recycle", -1),
+    )
+
+
 def _configure_logging(app: Flask) -> None:
-    """Attach console + rotating file handlers based on Config; avoid duplicates."""
+    """Attach console + rotating file handlers based on Config; avoid duplicates.
+
+    With LOG_QUEUE_ENABLED (outside tests) the handlers sit behind a bounded
+    queue drained by one listener thread, so request threads never do log I/O.
+    """
     # Clear any pre-existing handlers (reloader / repeated factories)
+    for handler in list(app.logger.handlers):
+        previous = getattr(handler, "log_queue", None)
+        if previous is not None:
+            previous.stop()
     if app.logger.handlers:
         app.logger.handlers.clear()
 
     level = app.config.get("LOGGING_LEVEL", logging.INFO)
-    fmt = app.config.get("LOG_FORMAT", "%(asctime)s — %(name)s — %(levelname)s — %(message)s")
-    formatter = logging.Formatter(fmt)
+    formatter = make_formatter(app)  # LOG_FORMAT text, or JSON lines with LOG_JSON
+    handlers = []
 
     # Console handler (always)
     console = logging.StreamHandler()
     console.setLevel(level)
     console.setFormatter(formatter)
-    app.logger.addHandler(console)
+    handlers.append(console)
 
-    # File handler (skip in tests)
+    # File handler (skip in tests); safe for several workers sharing one file
     if not app.testing:
         log_dir = Path(app.config.get("LOG_DIR", "logs"))
         log_dir.mkdir(parents=True, exist_ok=True)
@@ -110,12 +240,20 @@ def _configure_logging(app: Flask) -> None:
         if not log_file.is_absolute():
             log_file = log_dir / log_file.name
 
-        max_bytes = int(app.config.get("MAX_LOG_SIZE", 100_000))
-        backups = int(app.config.get("BACKUP_COUNT", 1))
-        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups)
+        max_bytes = int(app.config.get("MAX_LOG_SIZE", 10_000_000))
+        backups = int(app.config.get("BACKUP_COUNT", 5))
+        file_handler = SafeRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        app.logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if app.config.get("LOG_QUEUE_ENABLED") and not app.testing:
+        log_queue = start_log_queue(handlers, int(app.config.get("LOG_QUEUE_SIZE", 10_000)))
+        app.extensions["log_queue"] = log_queue
+        app.logger.addHandler(log_queue.handler)
+    else:
+        for handler in handlers:
+            app.logger.addHandler(handler)
 
     app.logger.setLevel(level)
     app.logger.propagate = False
@@ -0,0 +1,134 @@
+# resume_site/admin_queries.py
+"""
+Query helpers for the admin email-request listing.
+
+Listing uses keyset (cursor) pagination on ``(timestamp, id)`` so every page is
+an index range scan regardless of depth, and exports stream rows with
+``yield_per`` so memory stays flat however large the table grows. ``timestamp``
+is NOT NULL (backfilled by the migration), so the ``(timestamp, id)`` index
+scanned backwards yields exactly the listing order and the cursor is a plain
+row-value range on it.
+"""
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from typing import Iterator, Mapping, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.sql import Select
+
+from .extensions import db
+from .models import EmailRequest
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id", "name", "email", "ip_address", "timestamp", "request_count", "last_requested_at",
+)
+
+
+class InvalidQuery(ValueError):
+    """Raised for malformed cursor/filter/limit parameters."""
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidQuery("Invalid cursor") from exc
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError as exc:
+        raise InvalidQuery(f"Invalid date: {value!r} (expected YYYY-MM-DD)") from exc
+
+
+def filtered_select(args: Mapping[str, str]) -> Select:
+    """Columns of EmailRequest narrowed by ``since``/``until`` dates and ``email`` prefix."""
+    cols = [getattr(EmailRequest, name) for name in EXPORT_COLUMNS]
+    stmt = select(*cols)
+
+    if args.get("since"):
+        stmt = stmt.where(EmailRequest.timestamp >= _parse_date(args["since"]))
+    if args.get("until"):
+        # Inclusive of the whole 'until' day
+        stmt = stmt.where(EmailRequest.timestamp < _parse_date(args["until"]) + timedelta(days=1))
+    prefix = (args.get("email") or "").strip().lower()
+    if prefix:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(EmailRequest.email.like(f"{escaped}%", escape="\\"))
+    return stmt.order_by(EmailRequest.timestamp.desc(), EmailRequest.id.desc())
+
+
+def _page_limit(args: Mapping[str, str]) -> int:
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError as exc:
+        raise InvalidQuery("Invalid limit") from exc
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def page_select(args: Mapping[str, str], limit: int) -> Select:
+    """``filtered_select`` resumed after ``cursor``, fetching one row past ``limit``."""
+    stmt = filtered_select(args)
+    if args.get("cursor"):
+        ts, row_id = decode_cursor(args["cursor"])
+        # Row-value comparison: one index range, where the OR form may not be
+        stmt = stmt.where(tuple_(EmailRequest.timestamp, EmailRequest.id) < tuple_(ts, row_id))
+    return stmt.limit(limit + 1)
+
+
+def page_email_requests(
+    args: Mapping[str, str],
+) -> tuple[list, Optional[str]]:
+    """Return one page of rows (newest first) and the cursor for the next page."""
+    limit = _page_limit(args)
+    rows = db.session.execute(page_select(args, limit)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return rows, next_cursor
+
+
+def _iter_rows(args: Mapping[str, str]) -> Iterator:
+    stmt = filtered_select(args).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    yield from db.session.execute(stmt)
+
+
+def iter_csv(args: Mapping[str, str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for n, row in enumerate(_iter_rows(args), 1):
+        writer.writerow(row)
+        if n % EXPORT_BATCH_SIZE == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def iter_ndjson(args: Mapping[str, str]) -> Iterator[str]:
+    lines = []
+    for row in _iter_rows(args):
+        lines.append(json.dumps(dict(row._mapping), default=str))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
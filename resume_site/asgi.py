@@ -0,0 +1,290 @@
+# resume_site/asgi.py
+"""
+Optional ASGI serving mode (``asgi.py`` at the repo root).
+
+The Flask app stays a WSGI app: ``WSGIBridge`` runs each request in a
+bounded thread pool (ASGI_THREADS) and streams the response back to the
+event loop, so requests waiting for a thread cost a coroutine, not an OS
+thread. The DB work in a view runs on that pool, as it would under gthread.
+
+What changes is mail sent inline by ``resume()`` (MAIL_QUEUE_ENABLED off):
+instead of holding its request thread for the whole SMTP conversation, the
+view hands the message to ``AsyncMailer`` and returns. The mailer sends it
+on the event loop with aiosmtplib when that is installed, so thousands of
+slow sends need no threads at all, and otherwise on a small executor of its
+own (ASYNC_MAIL_THREADS) through the usual pooled ``send_email()``.
+Concurrent sends are capped by ASYNC_MAIL_CONCURRENCY either way.
+
+``wsgi.py`` and gunicorn's gthread workers are unchanged; without the ASGI
+entry point no mailer is attached and ``resume()`` sends synchronously.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from flask import Flask
+
+from .metrics import timed
+
+try:  # optional: lets mail go out on the event loop instead of a thread
+    import aiosmtplib
+except ImportError:  # pragma: no cover - depends on installed extras
+    aiosmtplib = None
+
+
+class AsyncMailer:
+    """Sends ``resume()`` mail off the request thread, bound to one event loop."""
+
+    def __init__(self, app: Flask) -> None:
+        cfg = app.config
+        self.app = app
+        self.concurrency = int(cfg.get("ASYNC_MAIL_CONCURRENCY", 200))
+        backend = cfg.get("ASYNC_MAIL_BACKEND", "auto")
+        self.use_aiosmtplib = aiosmtplib is not None and backend in ("auto", "aiosmtplib")
+        if backend == "aiosmtplib" and aiosmtplib is None:
+            app.logger.warning("ASYNC_MAIL_BACKEND=aiosmtplib but aiosmtplib is not installed")
+        self.executor: Optional[ThreadPoolExecutor] = None
+        if not self.use_aiosmtplib:
+            self.executor = ThreadPoolExecutor(
+                int(cfg.get("ASYNC_MAIL_THREADS", 4)), thread_name_prefix="async-mail"
+            )
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: set = set()
+        self.stats = {"submitted": 0, "sent": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None and not self.loop.is_closed()
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._slots = asyncio.Semaphore(self.concurrency)
+
+    def submit(self, to_email: str, subject: str, body: str, attachment_path: Optional[str] = None):
+        """Schedule a send from a request thread; returns a concurrent Future."""
+        self.stats["submitted"] += 1
+        return asyncio.run_coroutine_threadsafe(
+            self._send(to_email, subject, body, attachment_path), self.loop
+        )
+
+    async def _send(self, to_email, subject, body, attachment_path) -> bool:
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            async with self._slots:
+                if self.use_aiosmtplib:
+                    ok, message = await self._send_aiosmtplib(to_email, subject, body, attachment_path)
+                else:
+                    ok, message = await self.loop.run_in_executor(
+                        self.executor, self._send_pooled, to_email, subject, body, attachment_path
+                    )
+        finally:
+            self._tasks.discard(task)
+        self.stats["sent" if ok else "failed"] += 1
+        if not ok:
+            self.app.logger.error("Async mail to %s failed: %s", to_email, message)
+        return ok
+
+    def _send_pooled(self, to_email, subject, body, attachment_path):
+        from .utils import send_email
+
+        with self.app.app_context():
+            return send_email(self.app.extensions.get("mail"), to_email, subject, body, attachment_path)
+
+    async def _send_aiosmtplib(self, to_email, subject, body, attachment_path):
+        from .utils import build_message
+
+        cfg = self.app.config
+        with self.app.app_context():
+            sender = cfg.get("MAIL_DEFAULT_SENDER")
+            if not sender:
+                return False, "MAIL_DEFAULT_SENDER is not configured"
+            msg = build_message(sender, to_email, subject, body, attachment_path)
+            try:
+                with timed("smtp_send_seconds"):
+                    await aiosmtplib.send(
+                        msg.as_bytes(),
+                        sender=sender,
+                        recipients=list(msg.send_to),
+                        hostname=cfg.get("MAIL_SERVER"),
+                        port=cfg.get("MAIL_PORT"),
+                        username=cfg.get("MAIL_USERNAME"),
+                        password=cfg.get("MAIL_PASSWORD"),
+                        use_tls=bool(cfg.get("MAIL_USE_SSL")),
+                        start_tls=bool(cfg.get("MAIL_USE_TLS")),
+                        timeout=cfg.get("MAIL_TIMEOUT", 30),
+                    )
+            except Exception as e:
+                return False, f"Error sending email: {e}"
+        return True, "OK"
+
+    async def drain(self, timeout: float = 30.0) -> None:
+        """Wait for in-flight sends (at shutdown)."""
+        tasks = list(self._tasks)
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        self.loop = None
+
+
+class WSGIBridge:
+    """ASGI callable that runs a WSGI app on a bounded thread pool."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.max_body = int(app.config.get("ASGI_MAX_BODY", 10_000_000))
+        self.threads = int(app.config.get("ASGI_THREADS", 32))
+        self.executor = ThreadPoolExecutor(self.threads, thread_name_prefix="asgi-wsgi")
+        self.mailer = AsyncMailer(app)
+        self._bind_lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            self._ensure_bound()
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+
+    def _ensure_bound(self) -> None:
+        # Servers without lifespan support: bind the mailer on the first request
+        if not self.mailer.running:
+            with self._bind_lock:
+                if not self.mailer.running:
+                    self.mailer.bind(asyncio.get_running_loop())
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._ensure_bound()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.mailer.drain()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send) -> None:
+        body = await self._read_body(receive)
+        if body is None:
+            await send({"type": "http.response.start", "status": 413, "headers": [(b"content-length", b"0")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        loop = asyncio.get_running_loop()
+        environ = build_environ(scope, body)
+        await loop.run_in_executor(self.executor, self._run_wsgi, environ, send, loop)
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        return b"".join(chunks)
+
+    def _run_wsgi(self, environ, send, loop) -> None:
+        """Runs on a pool thread; each ASGI send is handed back to the loop."""
+        state = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and state.get("started"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            state["status"] = int(status.split(" ", 1)[0])
+            state["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+            return lambda data: None  # the legacy write() callable is not supported
+
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def start():
+            if not state.get("started"):
+                state["started"] = True
+                emit({"type": "http.response.start", "status": state["status"], "headers": state["headers"]})
+
+        result = self.app.wsgi_app(environ, start_response)  # Flask's own middleware stack
+        try:
+            for chunk in result:
+                if chunk:
+                    start()
+                    emit({"type": "http.response.body", "body": chunk, "more_body": True})
+            start()
+            emit({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+
+
+def build_environ(scope: dict, body: bytes) -> dict:
+    """PEP 3333 environ for an ASGI http scope."""
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[name] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    if body and "CONTENT_LENGTH" not in environ:
+        environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+def wrap_app(app: Flask) -> WSGIBridge:
+    """ASGI callable for an existing app; ``resume()`` mail goes through its mailer."""
+    bridge = WSGIBridge(app)
+    app.extensions["async_mail"] = bridge.mailer
+    app.logger.info(
+        "ASGI mode: threads=%s mail backend=%s concurrency=%s",
+        bridge.threads,
+        "aiosmtplib" if bridge.mailer.use_aiosmtplib else "executor",
+        bridge.mailer.concurrency,
+    )
+    return bridge
+
+
+def create_asgi_app(config_object: dict | None = None) -> WSGIBridge:
+    """Build the Flask app and wrap it for an ASGI server (uvicorn, hypercorn)."""
+    from . import create_app
+
+    return wrap_app(create_app(config_object))
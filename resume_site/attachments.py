@@ -0,0 +1,117 @@
+# resume_site/attachments.py
+"""
+In-memory cache of ready-to-send MIME attachment payloads.
+
+The résumé files change only on deploy, yet every send used to re-read them,
+re-guess the MIME type and have Flask-Mail base64-encode ~175 KB again. The
+cache keeps the encoded payload keyed by path and revalidates it with a single
+``stat()`` (mtime + size), so editing a file on disk invalidates it. The same
+entry carries a content ETag for the direct-download route.
+"""
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import threading
+from email.encoders import encode_base64
+from email.mime.base import MIMEBase
+from pathlib import Path
+from typing import Optional
+
+from flask_mail import Message
+
+CACHE_KEY_HEADER = "X-Resume-Site-Attachment"
+
+
+def _guess_mimetype(path: Path) -> str:
+    typ, _ = mimetypes.guess_type(str(path))
+    return typ or "application/octet-stream"
+
+
+class CachedAttachment:
+    """A file's MIME type and its base64 body, as Flask-Mail would have encoded it."""
+
+    __slots__ = ("path", "filename", "content_type", "encoded", "etag", "mtime_ns", "size")
+
+    def __init__(self, path: Path, st: os.stat_result) -> None:
+        self.path = str(path)
+        self.filename = path.name
+        self.content_type = _guess_mimetype(path)
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+
+        data = path.read_bytes()
+        self.etag = hashlib.sha256(data).hexdigest()[:32]
+        part = MIMEBase(*self.content_type.split("/"))
+        part.set_payload(data)
+        encode_base64(part)
+        self.encoded: str = part.get_payload()
+
+    def is_current(self, st: os.stat_result) -> bool:
+        return st.st_mtime_ns == self.mtime_ns and st.st_size == self.size
+
+
+class AttachmentCache:
+    def __init__(self) -> None:
+        self._entries: dict[str, CachedAttachment] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str | os.PathLike) -> Optional[CachedAttachment]:
+        """Return the cached payload for ``path`` (None if it is not a readable file)."""
+        p = Path(path)
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        if not p.is_file():
+            return None
+
+        key = str(p.resolve())
+        entry = self._entries.get(key)
+        if entry is not None and entry.is_current(st):
+            return entry
+
+        entry = CachedAttachment(p, st)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def warm(self, path: str | os.PathLike) -> bool:
+        return self.get(path) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+attachment_cache = AttachmentCache()
+
+
+class CachedAttachmentMessage(Message):
+    """Message that splices pre-encoded attachment bodies into the MIME tree.
+
+    Flask-Mail still builds the part (headers, filename, disposition) from an
+    empty placeholder; only the base64 body is swapped for the cached one.
+    """
+
+    def attach_cached(self, entry: CachedAttachment) -> None:
+        self._cached = getattr(self, "_cached", {})
+        self._cached[entry.path] = entry
+        self.attach(
+            filename=entry.filename,
+            content_type=entry.content_type,
+            data=b"",
+            headers={CACHE_KEY_HEADER: entry.path},
+        )
+
+    def _message(self):
+        msg = super()._message()
+        cached = getattr(self, "_cached", None)
+        if cached and msg.is_multipart():
+            for part in msg.get_payload():
+                key = part.get(CACHE_KEY_HEADER)
+                if key is not None:
+                    del part[CACHE_KEY_HEADER]
+                    part.set_payload(cached[key].encoded)
+        return msg
@@ -0,0 +1,129 @@
+# resume_site/conditional.py
+"""
+HTTP validators (ETag / Last-Modified), 304 handling and Cache-Control for
+GET routes of the ``main`` blueprint.
+
+* Every cacheable GET response gets a strong ETag: a hash of the rendered body,
+  remembered per (template version, path) so it is computed once per deploy.
+  These views ignore query strings, so the path alone is the key; the
+  registry is a bounded LRU so odd URLs cannot grow it without limit.
+* Template-only pages (CONDITIONAL_ENDPOINTS) also get Last-Modified from the
+  newest template mtime, and a matching If-None-Match / If-Modified-Since is
+  answered with 304 *before* the view renders anything.
+* Cache-Control comes from CACHE_CONTROL_POLICIES by endpoint, falling back
+  to CACHE_CONTROL_DEFAULT. ``no-store`` endpoints get no validators at all.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from flask import Flask, Response, request, session
+
+from .page_cache import template_watcher
+
+
+class ETagRegistry:
+    """Remembers the ETag of each rendered path for the current template version (LRU)."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._version = None
+        self._etags: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: int, path: str) -> Optional[str]:
+        with self._lock:
+            if version != self._version:
+                return None
+            etag = self._etags.get(path)
+            if etag is not None:
+                self._etags.move_to_end(path)
+            return etag
+
+    def set(self, version: int, path: str, etag: str) -> None:
+        with self._lock:
+            if version != self._version:
+                self._etags = OrderedDict()
+                self._version = version
+            self._etags[path] = etag
+            self._etags.move_to_end(path)
+            while len(self._etags) > self.max_entries:
+                self._etags.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._etags)
+
+
+def body_etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def init_conditional_requests(app: Flask) -> None:
+    policies = dict(app.config.get("CACHE_CONTROL_POLICIES", {}))
+    default_policy = app.config.get("CACHE_CONTROL_DEFAULT", "no-cache")
+    template_only = frozenset(app.config.get("CONDITIONAL_ENDPOINTS", ()))
+    watcher = template_watcher(app)
+    etags = ETagRegistry(int(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 256)))
+    app.extensions["etag_registry"] = etags
+
+    def _applies() -> bool:
+        return request.method in ("GET", "HEAD") and request.blueprint == "main"
+
+    def _last_modified() -> datetime:
+        seconds = watcher.version() // 1_000_000_000
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+    def _decorate(resp: Response, endpoint: str, etag: Optional[str]) -> Response:
+        resp.headers.setdefault("Cache-Control", policies.get(endpoint, default_policy))
+        if etag:
+            resp.set_etag(etag)
+        if endpoint in template_only:
+            resp.last_modified = _last_modified()
+        return resp
+
+    @app.before_request
+    def _short_circuit_not_modified():
+        endpoint = request.endpoint
+        if not _applies() or endpoint not in template_only or session:
+            return None
+        path = request.path  # query args don't change these pages
+        etag = etags.get(watcher.version(), path)
+
+        if request.if_none_match:
+            if etag and request.if_none_match.contains(etag):
+                return _decorate(Response(status=304), endpoint, etag)
+            return None  # If-None-Match takes precedence over If-Modified-Since
+        if request.if_modified_since and request.if_modified_since >= _last_modified():
+            return _decorate(Response(status=304), endpoint, etag)
+        return None
+
+    @app.after_request
+    def _add_validators(resp: Response):
+        endpoint = request.endpoint
+        if not _applies() or resp.status_code != 200:
+            return resp
+        if resp.is_streamed or resp.direct_passthrough:
+            return resp
+
+        policy = policies.get(endpoint, default_policy)
+        if "no-store" in policy:
+            resp.headers.setdefault("Cache-Control", policy)
+            return resp
+        if session or session.modified:  # body carries per-user state (e.g. flashes)
+            resp.headers.setdefault("Cache-Control", "private, no-cache")
+            return resp
+
+        version = watcher.version()
+        path = request.path  # query args don't change these pages
+        etag = etags.get(version, path) if endpoint in template_only else None
+        if etag is None:
+            etag = body_etag(resp.get_data())
+            if endpoint in template_only:
+                etags.set(version, path, etag)
+
+        _decorate(resp, endpoint, etag)
+        return resp.make_conditional(request)
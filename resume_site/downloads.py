@@ -0,0 +1,122 @@
+# resume_site/downloads.py
+"""
+Fire-and-forget recording of direct résumé downloads.
+
+The download view hands the file to ``wsgi.file_wrapper`` (sendfile under
+gunicorn), which bypasses Werkzeug's ``call_on_close`` hooks, and a commit on
+the request thread would delay the transfer. Instead the view drops a small
+event dict on a bounded in-process queue; one writer thread per process
+batches them into ``ResumeDownload`` rows. When the queue is full the event is
+dropped and counted rather than blocking the request.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+from typing import Optional
+
+from flask import Flask
+
+from .extensions import db
+from .models import ResumeDownload
+
+
+class DownloadRecorder:
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.batch_size = int(app.config.get("RESUME_DOWNLOAD_BATCH_SIZE", 100))
+        self.background = not app.testing  # tests drain explicitly via flush()
+        self._queue: queue.Queue = queue.Queue(int(app.config.get("RESUME_DOWNLOAD_QUEUE_SIZE", 1000)))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0}
+
+    def record(self, **event) -> None:
+        """Queue one download event; never blocks."""
+        if self.background:
+            self.start()
+        try:
+            self._queue.put_nowait(event)
+            self.stats["queued"] += 1
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Threads do not survive fork(); start a fresh writer in this process.
+            self._thread = threading.Thread(target=self._run, name="download-recorder", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write whatever is still queued and stop the writer thread."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            batch = [event]
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is None:
+                    self._write(batch)
+                    return
+                batch.append(event)
+            self._write(batch)
+
+    # --- writing ---
+
+    def flush(self) -> int:
+        """Synchronously write queued events on the calling thread; returns count."""
+        batch = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not None:
+                batch.append(event)
+        if batch:
+            self._write(batch)
+        return len(batch)
+
+    def _write(self, batch: list[dict]) -> None:
+        with self.app.app_context():
+            try:
+                db.session.add_all(ResumeDownload(**event) for event in batch)
+                db.session.commit()
+                self.stats["written"] += len(batch)
+            except Exception as e:
+                db.session.rollback()
+                self.stats["failed"] += len(batch)
+                self.app.logger.error("Failed to record %s resume download(s): %s", len(batch), e)
+            finally:
+                db.session.remove()
+
+
+def init_download_recorder(app: Flask) -> DownloadRecorder:
+    """Attach a recorder; its writer thread starts on the first recorded download."""
+    recorder = DownloadRecorder(app)
+    app.extensions["download_recorder"] = recorder
+    if recorder.background:
+        atexit.register(recorder.stop)
+    return recorder
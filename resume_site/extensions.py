@@ -1,5 +1,77 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
-from flask_mail import Mail
+from flask_mail import Connection, Mail, _Mail
 
-db = SQLAlchemy()
-mail = Mail()
+from .replica import RoutingSession
+from .smtp_pool import SMTPConnectionPool
+
+
+class PooledConnection(Connection):
+    """Flask-Mail connection that borrows its SMTP session from the process pool."""
+
+    def __init__(self, mail: "_PooledMail") -> None:
+        super().__init__(mail)
+        self._lease = None
+
+    def __enter__(self):
+        self.num_emails = 0
+        if self.mail.suppress:
+            self.host = None
+            return self
+        self._lease = self.mail.pool.acquire()
+        self.host = self._lease.host
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        lease, self._lease = self._lease, None
+        if lease is None:
+            return
+        # Connection.send() may have swapped the session after MAIL_MAX_EMAILS
+        lease.host = self.host
+        self.mail.pool.release(lease, discard=exc_type is not None)
+
+    def send(self, message, envelope_from=None):
+        super().send(message, envelope_from)
+        if self._lease is not None:
+            self._lease.messages += 1
+
+
+class _PooledMail(_Mail):
+    """Flask-Mail state (``app.extensions["mail"]``) that hands out pooled connections."""
+
+    pool: SMTPConnectionPool | None = None
+
+    def connect(self) -> Connection:
+        if self.pool is None:
+            return Connection(self)
+        return PooledConnection(self)
+
+
+class PooledMail(Mail):
+    """Drop-in ``Mail`` whose sends reuse authenticated SMTP sessions."""
+
+    def init_mail(self, config, debug=False, testing=False) -> _Mail:
+        base = super().init_mail(config, debug, testing)
+        state = _PooledMail(**vars(base))
+        if config.get("MAIL_POOL_ENABLED", True):
+            state.pool = SMTPConnectionPool(
+                factory=lambda: Connection(state).configure_host(),
+                max_size=config.get("MAIL_POOL_SIZE", 2),
+                max_messages=config.get("MAIL_POOL_MAX_MESSAGES", 50),
+                idle_timeout=config.get("MAIL_POOL_IDLE_TIMEOUT", 30),
+                acquire_timeout=config.get("MAIL_POOL_ACQUIRE_TIMEOUT", 30),
+            )
+        return state
+
+    def connect(self) -> Connection:
+        app = getattr(self, "app", None) or current_app
+        return app.extensions["mail"].connect()
+
+    def pool_stats(self) -> dict:
+        """Counters for the current app's SMTP pool ({} when pooling is off)."""
+        pool = getattr(current_app.extensions.get("mail"), "pool", None)
+        return pool.stats() if pool is not None else {}
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # reads may go to a replica
+mail = PooledMail()
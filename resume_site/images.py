@@ -0,0 +1,256 @@
+# resume_site/images.py
+"""
+Responsive image variants for ``static/images``.
+
+Each source JPEG/PNG is identified by a hash of its *content*, so byte-identical
+files (e.g. the two spellings of the Dave Schultz recommendation) share one set
+of derived images. Variants are resized WebP/AVIF copies at IMAGE_WIDTHS,
+written to IMAGE_CACHE_DIR either ahead of time (``scripts/build_images.py``)
+or on first request to ``/img/<digest>/<width>.<fmt>``.
+
+Templates call ``picture(...)``, which emits a ``<picture>`` element with
+``srcset`` per format and falls back to the original file. When Pillow is not
+installed the helper emits a plain ``<img>`` and no variants are generated.
+
+Pillow is imported and ``static/images`` is scanned on first use, not in
+``create_app()``; probes are cached per process by (mtime, size).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask, abort, send_file, url_for
+from markupsafe import Markup, escape
+
+from .page_cache import template_watcher
+
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+MIME_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+PIL_FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}  # width and height swap once transposed
+
+_pil_modules = None
+
+
+def load_pillow():
+    """``PIL`` (optional dependency) imported on first use; None if not installed."""
+    global _pil_modules
+    if _pil_modules is None:
+        try:
+            import PIL.Image
+            import PIL.ImageOps
+            import PIL.features
+            _pil_modules = PIL
+        except ImportError:  # pragma: no cover - depends on environment
+            _pil_modules = False
+    return _pil_modules or None
+
+
+def supported_formats(wanted) -> list[str]:
+    """Formats from ``wanted`` that the installed Pillow can encode."""
+    PIL = load_pillow()
+    if PIL is None:
+        return []
+    return [fmt for fmt in wanted if fmt in PIL_FORMATS and PIL.features.check(fmt)]
+
+
+# path -> (mtime_ns, size, digest, width, height); survives repeated create_app()
+_probe_cache: dict[str, tuple] = {}
+
+
+def _probe(path: Path) -> tuple[str, Optional[int], Optional[int]]:
+    """Content digest and display size of ``path`` (size None without Pillow)."""
+    st = path.stat()
+    cached = _probe_cache.get(str(path))
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2:]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    width = height = None
+    PIL = load_pillow()
+    if PIL is not None:
+        with PIL.Image.open(path) as img:  # header only; no pixel decode
+            width, height = img.size
+            if img.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+                width, height = height, width
+    _probe_cache[str(path)] = (st.st_mtime_ns, st.st_size, digest, width, height)
+    return digest, width, height
+
+
+class SourceImage:
+    __slots__ = ("path", "digest", "width", "height")
+
+    def __init__(self, path: Path, digest: str, width: Optional[int], height: Optional[int]):
+        self.path = path
+        self.digest = digest
+        self.width = width
+        self.height = height
+
+
+class ImagePipeline:
+    def __init__(self, app: Flask) -> None:
+        cfg = app.config
+        self.app = app
+        self.static_dir = Path(app.static_folder)
+        self.widths = sorted(int(w) for w in cfg.get("IMAGE_WIDTHS", (320, 640, 960, 1280)))
+        self.wanted_formats = tuple(cfg.get("IMAGE_FORMATS", ("avif", "webp")))
+        self._formats: Optional[list[str]] = None
+        self._scanned = False
+        self.quality = dict(cfg.get("IMAGE_QUALITY", {"webp": 80, "avif": 55}))
+        self.cache_dir = Path(
+            cfg.get("IMAGE_CACHE_DIR") or os.path.join(app.instance_path, "image_cache")
+        )
+        self._sources: dict[str, SourceImage] = {}  # static-relative name -> source
+        self._by_digest: dict[str, SourceImage] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def formats(self) -> list[str]:
+        if self._formats is None:
+            self._formats = supported_formats(self.wanted_formats)
+            if not self._formats:
+                self.app.logger.info("Image pipeline disabled (Pillow missing or no supported formats)")
+        return self._formats
+
+    @formats.setter
+    def formats(self, value: list[str]) -> None:
+        self._formats = list(value)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.formats)
+
+    # --- sources ---
+
+    def scan(self) -> int:
+        """Index every source image under static/images by content hash; returns the count."""
+        sources, by_digest = {}, {}
+        for path in sorted((self.static_dir / "images").rglob("*")):
+            if not path.is_file() or path.suffix.lower() not in SOURCE_SUFFIXES:
+                continue
+            digest, width, height = _probe(path)
+            source = by_digest.get(digest)
+            if source is None:  # first file with this content wins; duplicates alias it
+                source = by_digest[digest] = SourceImage(path, digest, width, height)
+            sources[path.relative_to(self.static_dir).as_posix()] = source
+        with self._lock:
+            self._sources, self._by_digest = sources, by_digest
+            if not self._scanned:
+                # Pages embed content digests, so a replaced image must invalidate them
+                watcher = template_watcher(self.app)
+                for source in sources.values():
+                    watcher.watch_file(str(source.path))
+            self._scanned = True
+        return len(sources)
+
+    def _ensure_scanned(self) -> None:
+        if not self._scanned:
+            self.scan()
+
+    def source(self, filename: str) -> Optional[SourceImage]:
+        self._ensure_scanned()
+        return self._sources.get(filename)
+
+    def widths_for(self, source: SourceImage) -> list[int]:
+        if not source.width:
+            return []
+        widths = [w for w in self.widths if w < source.width]
+        return widths + [source.width]
+
+    # --- variants ---
+
+    def variant_path(self, digest: str, width: int, fmt: str) -> Path:
+        return self.cache_dir / digest / f"{width}.{fmt}"
+
+    def ensure_variant(self, digest: str, width: int, fmt: str) -> Optional[Path]:
+        """Return the cached variant, generating it first if needed (None if not allowed)."""
+        self._ensure_scanned()
+        source = self._by_digest.get(digest)
+        if source is None or fmt not in self.formats or width not in self.widths_for(source):
+            return None
+        target = self.variant_path(digest, width, fmt)
+        if target.exists():
+            return target
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}")
+        PIL = load_pillow()
+        with PIL.Image.open(source.path) as img:
+            img = PIL.ImageOps.exif_transpose(img)
+            if width < img.width:
+                height = round(img.height * width / img.width)
+                img = img.resize((width, height), PIL.Image.LANCZOS)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGB")
+            img.save(tmp, PIL_FORMATS[fmt], quality=int(self.quality.get(fmt, 75)))
+        os.replace(tmp, target)
+        return target
+
+    def build_all(self) -> int:
+        """Generate every variant for every (deduplicated) source; returns count written."""
+        self._ensure_scanned()
+        written = 0
+        for source in list(self._by_digest.values()):
+            for width in self.widths_for(source):
+                for fmt in self.formats:
+                    if not self.variant_path(source.digest, width, fmt).exists():
+                        self.ensure_variant(source.digest, width, fmt)
+                        written += 1
+        return written
+
+    # --- markup ---
+
+    def picture(self, filename: str, alt: str = "", sizes: str = "100vw", **attrs) -> Markup:
+        """``<picture>`` with AVIF/WebP srcsets, falling back to the original file."""
+        if "class_" in attrs:
+            attrs["class"] = attrs.pop("class_")
+        attrs.setdefault("loading", "lazy")
+        attrs.setdefault("decoding", "async")
+
+        source = self.source(filename) if self.enabled else None
+        if source is not None and source.width:
+            attrs.setdefault("width", source.width)
+            attrs.setdefault("height", source.height)
+        img_attrs = "".join(f' {k}="{escape(v)}"' for k, v in attrs.items())
+        img = Markup(
+            f'<img src="{escape(url_for("static", filename=filename))}" '
+            f'alt="{escape(alt)}"{img_attrs}>'
+        )
+        if source is None or not self.widths_for(source):
+            return img
+
+        sources = []
+        for fmt in self.formats:
+            srcset = ", ".join(
+                f"{url_for('image_variant', digest=source.digest, width=w, fmt=fmt)} {w}w"
+                for w in self.widths_for(source)
+            )
+            sources.append(Markup(
+                f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(srcset)}" sizes="{escape(sizes)}">'
+            ))
+        return Markup("<picture>{}{}</picture>").format(Markup("").join(sources), img)
+
+
+def init_images(app: Flask) -> ImagePipeline:
+    """Index source images, register the variant route and the ``picture`` helper."""
+    pipeline = ImagePipeline(app)  # Pillow import + scan are deferred to first use
+    app.extensions["images"] = pipeline
+
+    def image_variant(digest: str, width: int, fmt: str):
+        path = pipeline.ensure_variant(digest, width, fmt) if pipeline.enabled else None
+        if path is None:
+            abort(404)
+        resp = send_file(path, mimetype=MIME_TYPES[fmt], max_age=31536000, conditional=True)
+        resp.cache_control.public = True
+        resp.cache_control.immutable = True  # URL embeds the content digest
+        return resp
+
+    app.add_url_rule(
+        "/img/<digest>/<int:width>.<fmt>", endpoint="image_variant", view_func=image_variant
+    )
+    app.add_template_global(pipeline.picture, name="picture")
+    return pipeline
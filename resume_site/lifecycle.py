@@ -0,0 +1,103 @@
+# resume_site/lifecycle.py
+"""
+Process lifecycle for gunicorn's preload mode.
+
+With ``preload_app`` the master imports ``wsgi.py`` once: ``create_app()``
+runs there and ``warm_app()`` does the remaining shareable work (compiling
+every template, scanning image sources) before the workers are forked, so
+they start with those pages already in memory, shared copy-on-write.
+
+What must not be shared is reset by ``after_fork()`` in each worker: pooled
+DB connections and SMTP sessions (a socket used by two processes corrupts
+both), background threads (which do not survive fork) and metrics recorded
+by the master (which would otherwise be counted once per worker).
+
+Both are idempotent and also safe without preload, where ``wsgi.py`` simply
+runs in every worker.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import time
+
+from flask import Flask
+
+from .extensions import db
+from .template_cache import warm_templates
+
+
+def warm_app(app: Flask, freeze: bool = True) -> dict:
+    """Do the shareable start-up work now, in the process that will fork.
+
+    The static manifest, résumé attachments and (with TEMPLATE_WARMUP)
+    compiled templates are already loaded by ``create_app()``; this makes
+    sure of the templates, scans image sources, closes any DB
+    connection the master opened and, with ``freeze``, moves everything
+    allocated so far out of the garbage collector's reach so collections in
+    the workers don't touch (and un-share) those pages.
+    """
+    started = time.perf_counter()
+    warmed = app.extensions.get("template_cache", {}).get("templates")
+    summary = {"templates": warmed or warm_templates(app)}
+
+    pipeline = app.extensions.get("images")
+    if pipeline is not None and pipeline.enabled:  # also imports Pillow in the master
+        summary["images"] = pipeline.scan()
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()  # workers open their own connections
+
+    if freeze and hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+        summary["frozen_objects"] = gc.get_freeze_count()
+
+    summary["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    app.extensions["warm_summary"] = summary
+    app.logger.info(
+        "App warmed in %.1fms: templates=%s images=%s frozen=%s",
+        summary["ms"], summary["templates"], summary.get("images", 0), summary.get("frozen_objects", 0),
+    )
+    return summary
+
+
+def after_fork(app: Flask) -> None:
+    """Per-worker reset, for gunicorn's ``post_fork`` hook."""
+    # Connections inherited from the master belong to it: forget them without
+    # closing (close=False), which would send a disconnect on its socket.
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    pool = getattr(app.extensions.get("mail"), "pool", None)
+    if pool is not None:
+        pool.reset_after_fork()
+
+    metrics = app.extensions.get("metrics")
+    if metrics is not None:
+        metrics.after_fork()
+
+    # Log listener threads restart on their own (os.register_at_fork); start
+    # the other background workers now instead of on the first request.
+    dispatcher = app.extensions.get("mail_queue")
+    if dispatcher is not None and app.config.get("MAIL_QUEUE_ENABLED") and not app.testing:
+        dispatcher.start()
+    recorder = app.extensions.get("download_recorder")
+    if recorder is not None and recorder.background:
+        recorder.start()
+    tuning = app.extensions.get("sqlite_tuning")
+    if tuning is not None and tuning.maintenance is not None and not app.testing:
+        tuning.maintenance.start()
+
+    app.logger.info("Worker initialized after fork: pid=%s", os.getpid())
+
+
+def on_server_start(app: Flask) -> None:
+    """Once per server start, in the gunicorn master."""
+    metrics = app.extensions.get("metrics")
+    if metrics is not None:
+        removed = metrics.clear_files()
+        if removed:
+            app.logger.info("Cleared %s metrics snapshot(s) of a previous run", removed)
@@ -0,0 +1,198 @@
+# resume_site/log_queue.py
+"""
+Non-blocking logging for the app logger.
+
+Request threads only put records on a bounded in-memory queue
+(``DroppingQueueHandler``); one ``QueueListener`` thread per process formats
+them and does the console/file I/O. When the queue is full the record is
+dropped and counted instead of stalling the request.
+
+``SafeRotatingFileHandler`` lets several gunicorn workers share one log file:
+writes and rollovers happen under an ``fcntl`` lock on a sidecar ``.lock``
+file, and a worker that finds the file rotated underneath it (inode changed)
+reopens it rather than writing into the renamed backup.
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+try:  # POSIX only; elsewhere the file handler simply runs unlocked
+    import fcntl
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: a full queue drops the record and counts it."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render any traceback here (they may not outlive the
+        # caller), but leave full formatting to the listener thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SafeRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that coordinates writes and rollover across processes."""
+
+    def __init__(self, filename, *args, **kwargs) -> None:
+        super().__init__(filename, *args, **kwargs)
+        self._lock_path = self.baseFilename + ".lock"
+        self._lock_fd: Optional[int] = None
+        self._lock_pid: Optional[int] = None
+
+    def _process_lock(self) -> None:
+        if fcntl is None:
+            return
+        if self._lock_pid != os.getpid():
+            # flock() locks belong to the open file description, which a forked
+            # child shares with its parent: each process needs its own.
+            self._lock_fd = os.open(self._lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+
+    def _process_unlock(self) -> None:
+        if fcntl is not None and self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _reopen_if_rotated(self) -> None:
+        """Another process may have rolled the file over; follow the new one."""
+        if self.stream is None:
+            return
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(self.stream.fileno())
+        if current is None or (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev):
+            self.stream.close()
+            self.stream = self._open()
+
+    def _would_overflow(self, length: int) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        # Size of the shared file, not just what this process has written
+        size = os.fstat(self.stream.fileno()).st_size
+        return size + length >= self.maxBytes
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        return self._would_overflow(len(self.format(record)) + len(self.terminator))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator  # formatted once, measured and written
+            self._process_lock()
+            try:
+                self._reopen_if_rotated()
+                if self._would_overflow(len(line)):
+                    self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(line)
+                self.flush()
+            finally:
+                self._process_unlock()
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        super().close()
+        if self._lock_fd is not None and self._lock_pid == os.getpid():
+            os.close(self._lock_fd)
+        self._lock_fd = self._lock_pid = None
+
+
+class LogQueue:
+    """Owns the queue, the enqueueing handler and the listener thread for one logger."""
+
+    def __init__(self, handlers: list[logging.Handler], maxsize: int = 10_000) -> None:
+        self.handlers = handlers
+        self.maxsize = maxsize
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize))
+        self.handler.log_queue = self  # lets _configure_logging stop a replaced instance
+        self.listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def start(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.listener = QueueListener(
+                self.handler.queue, *self.handlers, respect_handler_level=True
+            )
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """Flush everything still queued, then stop the listener thread."""
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._pid = None
+        _live_queues.discard(self)
+        for handler in self.handlers:
+            handler.flush()
+
+    def after_fork(self) -> None:
+        """In a forked child: the listener thread is gone and the queue's lock
+        may have been copied mid-operation, so start over with fresh ones."""
+        if self._pid is None:
+            return
+        self._lock = threading.Lock()
+        self.handler.queue = queue.Queue(self.maxsize)
+        self.listener = None
+        self._pid = None
+        self.start()
+
+
+_live_queues: set[LogQueue] = set()
+
+
+def _restart_in_child() -> None:
+    for log_queue in list(_live_queues):
+        log_queue.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def start_log_queue(handlers: list[logging.Handler], maxsize: int = 10_000) -> LogQueue:
+    """Start a listener for ``handlers``; returns the LogQueue whose ``handler``
+    should be attached to the logger. Restarts itself in forked children and
+    flushes at interpreter exit."""
+    log_queue = LogQueue(handlers, maxsize)
+    log_queue.start()
+    _live_queues.add(log_queue)
+    atexit.register(log_queue.stop)
+    return log_queue
@@ -0,0 +1,257 @@
+# resume_site/mail_queue.py
+"""
+Durable outbound mail queue.
+
+POST /resume writes an ``OutboundEmail`` row and returns immediately; a small
+pool of dispatcher threads (one pool per process) drains the table, calling
+``send_email()`` and rescheduling failures with exponential backoff.
+
+Rows move through ``pending -> sending -> sent`` (or ``failed`` once
+MAIL_QUEUE_MAX_ATTEMPTS is exhausted). Claiming a row is a conditional UPDATE,
+so several gunicorn workers can drain the same table without double-sending.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import random
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from flask import Flask, current_app
+from sqlalchemy import inspect, update
+
+from .extensions import db
+from .models import OutboundEmail, utcnow_naive
+from .utils import send_email
+
+
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    body: str,
+    attachment_path: Optional[str] = None,
+) -> OutboundEmail:
+    """Persist a message for background delivery and nudge the dispatcher."""
+    job = OutboundEmail(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        attachment_path=attachment_path,
+        status=OutboundEmail.STATUS_PENDING,
+        next_attempt_at=utcnow_naive(),
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    dispatcher = current_app.extensions.get("mail_queue")
+    if dispatcher is not None:
+        dispatcher.wake()
+    return job
+
+
+class MailDispatcher:
+    """Background thread pool that drains the ``OutboundEmail`` table."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        cfg = app.config
+        self.workers = int(cfg.get("MAIL_QUEUE_WORKERS", 2))
+        self.poll_interval = float(cfg.get("MAIL_QUEUE_POLL_INTERVAL", 5))
+        self.max_attempts = int(cfg.get("MAIL_QUEUE_MAX_ATTEMPTS", 5))
+        self.backoff_base = float(cfg.get("MAIL_QUEUE_BACKOFF_BASE", 30))
+        self.backoff_max = float(cfg.get("MAIL_QUEUE_BACKOFF_MAX", 3600))
+        self.stale_after = float(cfg.get("MAIL_QUEUE_STALE_AFTER", 300))
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        """Start the worker threads once per process (safe to call repeatedly)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Threads do not survive fork(); start a fresh pool in this process.
+            self._stop.clear()
+            self._threads = []
+            for i in range(self.workers):
+                t = threading.Thread(
+                    target=self._run, name=f"mail-dispatcher-{i}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+            self._pid = os.getpid()
+        self.app.logger.info(
+            "Mail dispatcher started: workers=%s pid=%s", self.workers, self._pid
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask workers to finish their current message and exit."""
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        self._pid = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.process_once()
+            except Exception:
+                self.app.logger.exception("Mail dispatcher loop error")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    # --- queue processing ---
+
+    def process_once(self) -> int:
+        """Claim and deliver at most one due message. Returns how many were handled."""
+        with self.app.app_context():
+            try:
+                self._release_stale()
+                job_id = self._claim_next()
+                if job_id is None:
+                    return 0
+                self._deliver(job_id)
+                return 1
+            finally:
+                db.session.remove()
+
+    def _release_stale(self) -> None:
+        """Return rows stuck in 'sending' (crashed worker) to the pending state."""
+        cutoff = utcnow_naive() - timedelta(seconds=self.stale_after)
+        db.session.execute(
+            update(OutboundEmail)
+            .where(
+                OutboundEmail.status == OutboundEmail.STATUS_SENDING,
+                OutboundEmail.locked_at < cutoff,
+            )
+            .values(status=OutboundEmail.STATUS_PENDING, locked_at=None)
+        )
+        db.session.commit()
+
+    def _claim_next(self) -> Optional[int]:
+        now = utcnow_naive()
+        candidates = (
+            db.session.query(OutboundEmail.id)
+            .filter(
+                OutboundEmail.status == OutboundEmail.STATUS_PENDING,
+                OutboundEmail.next_attempt_at <= now,
+            )
+            .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+            .limit(self.workers + 1)
+            .all()
+        )
+        for (job_id,) in candidates:
+            result = db.session.execute(
+                update(OutboundEmail)
+                .where(
+                    OutboundEmail.id == job_id,
+                    OutboundEmail.status == OutboundEmail.STATUS_PENDING,
+                )
+                .values(
+                    status=OutboundEmail.STATUS_SENDING,
+                    locked_at=now,
+                    attempts=OutboundEmail.attempts + 1,
+                )
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return job_id
+        return None
+
+    def _deliver(self, job_id: int) -> None:
+        job = db.session.get(OutboundEmail, job_id)
+        mail = self.app.extensions.get("mail")
+        ok, message = send_email(
+            mail, job.to_email, job.subject, job.body, job.attachment_path
+        )
+
+        job.locked_at = None
+        if ok:
+            job.status = OutboundEmail.STATUS_SENT
+            job.sent_at = utcnow_naive()
+            job.last_error = None
+            self.app.logger.info("Queued email %s delivered to %s", job.id, job.to_email)
+        elif job.attempts >= self.max_attempts:
+            job.status = OutboundEmail.STATUS_FAILED
+            job.last_error = message
+            self.app.logger.error(
+                "Queued email %s failed permanently after %s attempts: %s",
+                job.id, job.attempts, message,
+            )
+        else:
+            delay = self._backoff(job.attempts)
+            job.status = OutboundEmail.STATUS_PENDING
+            job.next_attempt_at = utcnow_naive() + timedelta(seconds=delay)
+            job.last_error = message
+            self.app.logger.warning(
+                "Queued email %s attempt %s failed (%s); retrying in %.0fs",
+                job.id, job.attempts, message, delay,
+            )
+        db.session.commit()
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with +/-20% jitter, capped at MAIL_QUEUE_BACKOFF_MAX."""
+        delay = min(self.backoff_base * (2 ** max(attempts - 1, 0)), self.backoff_max)
+        return delay * random.uniform(0.8, 1.2)
+
+
+def require_queue_table(app: Flask) -> bool:
+    """Turn the queue off (mail is sent inline) if its table hasn't been created yet.
+
+    Outside dev/test nothing runs ``create_all()``; the table comes from
+    ``scripts/dev_db.py migrate`` at deploy. Without it every queued POST
+    /resume would fail, so degrade to inline sending and say so loudly.
+    """
+    if not app.config.get("MAIL_QUEUE_ENABLED"):
+        return True
+    try:
+        with app.app_context():
+            present = inspect(db.engine).has_table(OutboundEmail.__tablename__)
+    except Exception as e:
+        app.logger.warning("Mail queue table check skipped: %s", e)
+        return True
+    if not present:
+        app.config["MAIL_QUEUE_ENABLED"] = False
+        app.logger.error(
+            "❌ Table %s is missing: mail queue disabled, sending inline. "
+            "Run `python scripts/dev_db.py migrate` to create it.",
+            OutboundEmail.__tablename__,
+        )
+    return present
+
+
+def init_mail_queue(app: Flask) -> MailDispatcher:
+    """Attach a dispatcher to the app; threads start lazily on the first request.
+
+    Starting on first request (rather than in the factory) keeps CLI scripts
+    thread-free and means each forked gunicorn worker gets its own pool.
+    """
+    dispatcher = MailDispatcher(app)
+    app.extensions["mail_queue"] = dispatcher
+
+    if app.config.get("MAIL_QUEUE_ENABLED") and not app.testing:
+
+        @app.before_request
+        def _ensure_mail_dispatcher():
+            if app.config["MAIL_QUEUE_ENABLED"]:  # cleared by require_queue_table()
+                dispatcher.start()
+
+        atexit.register(dispatcher.stop)
+
+    return dispatcher
@@ -0,0 +1,419 @@
+# resume_site/metrics.py
+"""
+In-process request metrics, exported in Prometheus text format.
+
+Recorded per endpoint: request counts by method/status and a fixed-bucket
+latency histogram; per request, the time spent in the database (SQLAlchemy
+cursor events) and, in ``send_email()``, the time spent talking SMTP.
+
+Each thread writes only to its own shard (no lock on the hot path); readers
+merge all shards. The shard of a thread that has exited is folded into one
+"retired" shard, so thread-per-request servers don't grow the list forever. Every worker process periodically writes its merged
+snapshot to ``METRICS_DIR/<pid>.json``, and the scrape endpoint sums the
+files so one scrape covers every gunicorn worker. Point-in-time gauges
+(DB/SMTP pool usage) are reported per live pid instead of summed.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db, mail
+
+PREFIX = "resume_site_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+HELP = {
+    "http_requests_total": ("counter", "Requests handled, by endpoint, method and status."),
+    "http_request_duration_seconds": ("histogram", "Request latency by endpoint."),
+    "db_seconds": ("histogram", "Database time per request (or background job), by endpoint."),
+    "smtp_send_seconds": ("histogram", "Time spent in a single SMTP send, by outcome."),
+    "rate_limited_total": ("counter", "Requests rejected by the rate limiter."),
+    "log_records_dropped_total": ("counter", "Log records dropped because the log queue was full."),
+    "download_events_dropped_total": ("counter", "Download events dropped because the queue was full."),
+    "db_pool_connections": ("gauge", "SQLAlchemy pool connections by state."),
+    "smtp_pool_connections": ("gauge", "SMTP pool sessions by state."),
+}
+
+
+def _key(labels: dict) -> str:
+    return json.dumps(sorted(labels.items()), separators=(",", ":"))
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, str], float] = {}
+        self.histograms: dict[tuple[str, str], list[float]] = {}  # bucket counts..., sum
+
+    def absorb(self, other: "_Shard") -> None:
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, row in other.histograms.items():
+            merged = self.histograms.get(key)
+            if merged is None:
+                self.histograms[key] = list(row)
+            else:
+                for i, value in enumerate(row):
+                    merged[i] += value
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every shard. A forked worker calls this so counts recorded in
+        the master before fork are not reported again under the worker's pid."""
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, _Shard]] = []
+        self._retired = _Shard()  # merged shards of threads that have exited
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead_shards(self) -> None:
+        # Caller holds _shards_lock. A dead thread never writes its shard
+        # again, so folding it into _retired loses nothing.
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._retired.absorb(shard)
+        self._shards = live
+
+    # --- recording (lock-free: only the owning thread writes a shard) ---
+
+    def inc(self, name: str, labels: dict, value: float = 1) -> None:
+        counters = self._shard().counters
+        key = (name, _key(labels))
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, seconds: float) -> None:
+        histograms = self._shard().histograms
+        key = (name, _key(labels))
+        row = histograms.get(key)
+        if row is None:
+            row = histograms[key] = [0] * (len(self.buckets) + 1)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                row[i] += 1
+                break
+        row[-1] += seconds
+
+    # --- reading ---
+
+    def snapshot(self) -> dict:
+        """Merge every shard: {"counters": {name: {labels: v}}, "histograms": {...}}."""
+        counters: dict = {}
+        histograms: dict = {}
+        with self._shards_lock:
+            self._retire_dead_shards()
+            shards = [self._retired] + [shard for _, shard in self._shards]
+        for shard in shards:
+            for (name, labels), value in list(shard.counters.items()):
+                bucket = counters.setdefault(name, {})
+                bucket[labels] = bucket.get(labels, 0) + value
+            for (name, labels), row in list(shard.histograms.items()):
+                merged = histograms.setdefault(name, {}).get(labels)
+                if merged is None:
+                    histograms[name][labels] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        merged[i] += value
+        return {"counters": counters, "histograms": histograms}
+
+
+class Metrics:
+    """Registry + per-process file export for one app."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.registry = MetricsRegistry()
+        self.dir = Path(app.config.get("METRICS_DIR") or os.path.join(app.instance_path, "metrics"))
+        self.flush_interval = float(app.config.get("METRICS_FLUSH_INTERVAL", 5))
+        self._last_flush = 0.0
+
+    # --- external counters and gauges, sampled at snapshot time ---
+
+    def _sampled(self) -> tuple[dict, dict]:
+        counters: dict = {}
+        gauges: dict = {}
+        ext = self.app.extensions
+
+        limiter = ext.get("rate_limiter")
+        if limiter is not None:
+            counters["rate_limited_total"] = {
+                _key({"endpoint": endpoint, "dimension": dim}): n
+                for (endpoint, dim), n in limiter.shed.items()
+            }
+        log_queue = ext.get("log_queue")
+        if log_queue is not None:
+            counters["log_records_dropped_total"] = {_key({}): log_queue.dropped}
+        recorder = ext.get("download_recorder")
+        if recorder is not None:
+            counters["download_events_dropped_total"] = {_key({}): recorder.stats["dropped"]}
+
+        pid = str(os.getpid())
+        try:
+            with self.app.app_context():
+                engines = dict(db.engines)
+                smtp = mail.pool_stats()
+        except Exception:
+            engines, smtp = {}, {}
+        for bind, engine in engines.items():
+            pool = engine.pool
+            if hasattr(pool, "checkedout"):
+                for state, value in (("checked_out", pool.checkedout()), ("idle", pool.checkedin())):
+                    gauges.setdefault("db_pool_connections", {})[
+                        _key({"pid": pid, "bind": bind or "default", "state": state})
+                    ] = value
+        for state in ("in_use", "idle", "max_size"):
+            if state in smtp:
+                gauges.setdefault("smtp_pool_connections", {})[
+                    _key({"pid": pid, "state": state})
+                ] = smtp[state]
+        return counters, gauges
+
+    def process_snapshot(self) -> dict:
+        snap = self.registry.snapshot()
+        counters, gauges = self._sampled()
+        snap["counters"].update(counters)
+        snap["gauges"] = gauges
+        snap["pid"] = os.getpid()
+        return snap
+
+    # --- multiprocess export ---
+
+    def flush(self) -> Optional[dict]:
+        """Write this process's snapshot to METRICS_DIR/<pid>.json (atomically)."""
+        snap = self.process_snapshot()
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            path = self.dir / f"{os.getpid()}.json"
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(snap))
+            os.replace(tmp, path)
+        except OSError as exc:
+            self.app.logger.warning("Metrics flush failed: %s", exc)
+        self._last_flush = time.monotonic()
+        return snap
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def collect(self) -> dict:
+        """Sum every worker's snapshot (this process's is taken fresh)."""
+        own = self.flush()
+        snapshots = [own]
+        for path in self.dir.glob("*.json"):
+            if path.stem == str(os.getpid()):
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+
+        merged: dict = {"counters": {}, "histograms": {}, "gauges": {}}
+        for snap in snapshots:
+            for name, series in snap.get("counters", {}).items():
+                target = merged["counters"].setdefault(name, {})
+                for labels, value in series.items():
+                    target[labels] = target.get(labels, 0) + value
+            for name, series in snap.get("histograms", {}).items():
+                target = merged["histograms"].setdefault(name, {})
+                for labels, row in series.items():
+                    if labels in target:
+                        target[labels] = [a + b for a, b in zip(target[labels], row)]
+                    else:
+                        target[labels] = list(row)
+            if _pid_alive(snap.get("pid")):  # gauges of exited workers are meaningless
+                for name, series in snap.get("gauges", {}).items():
+                    merged["gauges"].setdefault(name, {}).update(series)
+        return merged
+
+    def render(self) -> str:
+        return render_prometheus(self.collect(), self.registry.buckets)
+
+    def clear_files(self) -> int:
+        """Remove every worker snapshot; called once when a server (re)starts so
+        counters of a previous run are not summed into the new one."""
+        removed = 0
+        for path in self.dir.glob("*.json"):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def after_fork(self) -> None:
+        self.registry.reset()
+        self._last_flush = 0.0
+
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _labels(labels_key: str, extra: Optional[tuple] = None) -> str:
+    pairs = [tuple(p) for p in json.loads(labels_key)]
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _le(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def _num(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+KINDS = {"counters": "counter", "gauges": "gauge", "histograms": "histogram"}
+
+
+def render_prometheus(merged: dict, buckets=LATENCY_BUCKETS) -> str:
+    lines = []
+    for kind in ("counters", "gauges", "histograms"):
+        for name in sorted(merged.get(kind, {})):
+            series = merged[kind][name]
+            typ, help_text = HELP.get(name, (KINDS[kind], name))
+            full = PREFIX + name
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {typ}")
+            for labels in sorted(series):
+                if kind != "histograms":
+                    lines.append(f"{full}{_labels(labels)} {_num(series[labels])}")
+                    continue
+                row = series[labels]
+                cumulative = 0
+                for bound, count in zip(buckets, row[:-1]):
+                    cumulative += count
+                    lines.append(f"{full}_bucket{_labels(labels, ('le', _le(bound)))} {_num(cumulative)}")
+                lines.append(f"{full}_sum{_labels(labels)} {_num(row[-1])}")
+                lines.append(f"{full}_count{_labels(labels)} {_num(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+# --- instrumentation helpers ---
+
+def _current_metrics() -> Optional[Metrics]:
+    return current_app.extensions.get("metrics") if has_app_context() else None
+
+
+def _endpoint_label() -> str:
+    if has_request_context():
+        return request.endpoint or "unmatched"
+    return "background"
+
+
+@contextmanager
+def timed(name: str, **labels):
+    """Observe the block's duration into histogram ``name``; adds outcome=ok|error."""
+    metrics = _current_metrics()
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        if metrics is not None:
+            metrics.registry.observe(name, {**labels, "outcome": outcome}, time.perf_counter() - start)
+
+
+def _instrument_engine(engine, metrics: Metrics) -> None:
+    if getattr(engine, "_resume_site_metrics", False):
+        return
+    engine._resume_site_metrics = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if has_request_context():
+            g.metrics_db_seconds = g.get("metrics_db_seconds", 0.0) + elapsed
+        else:
+            metrics.registry.observe("db_seconds", {"endpoint": "background"}, elapsed)
+
+
+def init_metrics(app: Flask) -> Optional[Metrics]:
+    """Attach the registry, request hooks and DB cursor timing."""
+    if not app.config.get("METRICS_ENABLED"):
+        return None
+
+    metrics = Metrics(app)
+    app.extensions["metrics"] = metrics
+    registry = metrics.registry
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _instrument_engine(engine, metrics)
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(resp):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return resp
+        endpoint = _endpoint_label()
+        registry.inc(
+            "http_requests_total",
+            {"endpoint": endpoint, "method": request.method, "status": str(resp.status_code)},
+        )
+        registry.observe(
+            "http_request_duration_seconds", {"endpoint": endpoint}, time.perf_counter() - start
+        )
+        db_seconds = g.pop("metrics_db_seconds", None)
+        if db_seconds is not None:
+            registry.observe("db_seconds", {"endpoint": endpoint}, db_seconds)
+        metrics.maybe_flush()
+        return resp
+
+    if not app.testing:
+        atexit.register(metrics.flush)  # last counts of an exiting worker
+    return metrics
@@ -0,0 +1,119 @@
+# resume_site/migrations.py
+"""
+Hand-written schema migrations for databases created before a model change.
+
+The project has no Alembic; ``db.create_all()`` only creates missing tables,
+so columns and indexes added to existing tables are applied here. Each step is
+idempotent and safe to re-run.
+"""
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from .models import EmailRequest, normalize_email
+
+logger = logging.getLogger(__name__)
+
+
+def _recency(row) -> tuple:
+    """Sort key: rows with a request time after those without, then by time, then id."""
+    when = row["last_requested_at"] or row["timestamp"]
+    return (when is not None, when or 0, row["id"])
+
+
+def _timestamp_not_null(conn: Connection) -> None:
+    """Make ``EmailRequest.timestamp`` NOT NULL (SQLite can't alter a column: rebuild)."""
+    if conn.dialect.name != "sqlite":
+        conn.execute(text('ALTER TABLE "EmailRequest" ALTER COLUMN timestamp SET NOT NULL'))
+        return
+    table = EmailRequest.__table__.to_metadata(MetaData(), name="EmailRequest_new")
+    conn.execute(CreateTable(table))  # no indexes; recreated by the caller
+    cols = ", ".join(f'"{c.name}"' for c in table.columns)
+    conn.execute(text(f'INSERT INTO "EmailRequest_new" ({cols}) SELECT {cols} FROM "EmailRequest"'))
+    conn.execute(text('DROP TABLE "EmailRequest"'))
+    conn.execute(text('ALTER TABLE "EmailRequest_new" RENAME TO "EmailRequest"'))
+
+
+def migrate_email_request_dedupe(engine: Engine) -> int:
+    """Bring an old ``EmailRequest`` table up to the one-row-per-address schema.
+
+    Adds ``request_count``/``last_requested_at``, folds rows whose emails match
+    after normalization into the oldest row (summing counts, keeping the latest
+    request time, name and IP), lower-cases the surviving emails, backfills a
+    missing ``timestamp`` and makes it NOT NULL, and creates the unique email
+    index and the ``(timestamp, id)`` index used by admin paging.
+    Returns the number of duplicate rows removed.
+    """
+    insp = inspect(engine)
+    if not insp.has_table("EmailRequest"):
+        return 0
+    nullable = {c["name"]: c["nullable"] for c in insp.get_columns("EmailRequest")}
+    columns = set(nullable)
+
+    removed = 0
+    with engine.begin() as conn:
+        if "request_count" not in columns:
+            conn.execute(text(
+                'ALTER TABLE "EmailRequest" ADD COLUMN request_count INTEGER NOT NULL DEFAULT 1'
+            ))
+        if "last_requested_at" not in columns:
+            conn.execute(text('ALTER TABLE "EmailRequest" ADD COLUMN last_requested_at TIMESTAMP'))
+            conn.execute(text('UPDATE "EmailRequest" SET last_requested_at = timestamp'))
+
+        rows = conn.execute(text(
+            'SELECT id, name, email, ip_address, timestamp, request_count, last_requested_at '
+            'FROM "EmailRequest" WHERE email IS NOT NULL ORDER BY id'
+        )).mappings().all()
+
+        groups: dict[str, list] = {}
+        for row in rows:
+            groups.setdefault(normalize_email(row["email"]), []).append(row)
+
+        for email, group in groups.items():
+            keeper, dupes = group[0], group[1:]
+            latest = max(group, key=_recency)
+            if not dupes and keeper["email"] == email:
+                continue
+            conn.execute(
+                text(
+                    'UPDATE "EmailRequest" SET email = :email, name = :name, ip_address = :ip, '
+                    "request_count = :count, last_requested_at = :last WHERE id = :id"
+                ),
+                {
+                    "email": email,
+                    "name": latest["name"],
+                    "ip": latest["ip_address"],
+                    "count": sum(r["request_count"] or 1 for r in group),
+                    "last": latest["last_requested_at"] or latest["timestamp"],
+                    "id": keeper["id"],
+                },
+            )
+            for dupe in dupes:
+                conn.execute(text('DELETE FROM "EmailRequest" WHERE id = :id'), {"id": dupe["id"]})
+            removed += len(dupes)
+
+        if nullable["timestamp"]:
+            # Unknown first-request time: use the last one, else the epoch so the
+            # row stays at the end of the newest-first admin listing
+            conn.execute(text(
+                'UPDATE "EmailRequest" SET timestamp = COALESCE(last_requested_at, '
+                "'1970-01-01 00:00:00') WHERE timestamp IS NULL"
+            ))
+            _timestamp_not_null(conn)
+
+        existing = {ix["name"] for ix in inspect(conn).get_indexes("EmailRequest")}
+        if "ux_EmailRequest_email" not in existing:
+            conn.execute(text(
+                'CREATE UNIQUE INDEX "ux_EmailRequest_email" ON "EmailRequest" (email)'
+            ))
+        if "ix_EmailRequest_timestamp_id" not in existing:
+            conn.execute(text(
+                'CREATE INDEX "ix_EmailRequest_timestamp_id" ON "EmailRequest" (timestamp, id)'
+            ))
+
+    logger.info("EmailRequest migration complete: %s duplicate rows merged", removed)
+    return removed
@@ -5,17 +5,80 @@ from datetime import datetime, timezone
 from .extensions import db
 
 
-# Model for tracking resume requests
+def utcnow_naive():
+    """Current UTC time without tzinfo, for columns compared in SQL (queue scheduling)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form used for the unique email index (trimmed, lower-cased)."""
+    return email.strip().lower()
+
+
+# Model for tracking resume requests (one row per normalized address)
 class EmailRequest(db.Model):
     __tablename__ = "EmailRequest"
+    __table_args__ = (
+        db.Index("ux_EmailRequest_email", "email", unique=True),
+        db.Index("ix_EmailRequest_timestamp_id", "timestamp", "id"),  # admin keyset paging
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), nullable=False)
-    email = db.Column(db.String(128))
+    email = db.Column(db.String(128))  # Stored normalized; see normalize_email()
     ip_address = db.Column(db.String(64))
     timestamp = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )  # First request, recorded in UTC
+    request_count = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    last_requested_at = db.Column(
         db.DateTime, default=lambda: datetime.now(timezone.utc)
-    )  # Timestamp recorded in UTC
+    )  # Most recent request, recorded in UTC
+
+    @classmethod
+    def record(cls, name: str, email: str, ip_address: str | None) -> int:
+        """Insert or bump the row for ``email`` in one statement; returns request_count.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE on Postgres and SQLite, so concurrent
+        requests for the same address cannot race. Caller commits.
+        """
+        email = normalize_email(email)
+        now = datetime.now(timezone.utc)
+        dialect = db.session.get_bind(mapper=cls.__mapper__).dialect.name
+
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            stmt = insert(cls).values(
+                name=name, email=email, ip_address=ip_address, timestamp=now,
+                last_requested_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[cls.email],
+                set_={
+                    "name": stmt.excluded.name,
+                    "ip_address": stmt.excluded.ip_address,
+                    "last_requested_at": stmt.excluded.last_requested_at,
+                    "request_count": cls.request_count + 1,
+                },
+            ).returning(cls.request_count)
+            return db.session.execute(stmt).scalar_one()
+
+        # Other backends: portable (racy) read-then-write fallback
+        existing = cls.query.filter_by(email=email).first()
+        if existing is None:
+            db.session.add(cls(
+                name=name, email=email, ip_address=ip_address, timestamp=now, last_requested_at=now
+            ))
+            return 1
+        existing.name = name
+        existing.ip_address = ip_address
+        existing.last_requested_at = now
+        existing.request_count = (existing.request_count or 1) + 1
+        return existing.request_count
 
     def __repr__(self):
         return f"<EmailRequest {self.name}, {self.email}>"
@@ -36,3 +99,50 @@ class UserMessage(db.Model):
 
     def __repr__(self):
         return f"<UserMessage from {self.name}>"
+
+
+# Model for the durable outbound mail queue drained by the background dispatcher
+class OutboundEmail(db.Model):
+    __tablename__ = "OutboundEmail"
+    __table_args__ = (
+        db.Index("ix_OutboundEmail_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(128), nullable=False)
+    subject = db.Column(db.String(256), nullable=False)
+    body = db.Column(db.Text)
+    attachment_path = db.Column(db.String(512))  # Filesystem path, resolved at send time
+    status = db.Column(db.String(16), nullable=False, default=STATUS_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, default=utcnow_naive)  # UTC, naive
+    locked_at = db.Column(db.DateTime)  # Set while a dispatcher thread owns the row
+    created_at = db.Column(db.DateTime, default=utcnow_naive)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<OutboundEmail {self.id} to {self.to_email} [{self.status}]>"
+
+
+# Model for direct résumé downloads (written after the response has been sent)
+class ResumeDownload(db.Model):
+    __tablename__ = "ResumeDownload"
+
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(128), nullable=False)
+    ip_address = db.Column(db.String(64))
+    user_agent = db.Column(db.String(256))
+    status_code = db.Column(db.Integer)  # 200 full body, 206 partial (Range)
+    byte_range = db.Column(db.String(64))  # Raw Range header for partial transfers
+    timestamp = db.Column(
+        db.DateTime, default=lambda: datetime.now(timezone.utc)
+    )  # Timestamp recorded in UTC
+
+    def __repr__(self):
+        return f"<ResumeDownload {self.filename} [{self.status_code}]>"
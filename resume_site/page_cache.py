@@ -0,0 +1,372 @@
+# resume_site/page_cache.py
+"""
+Full-page response cache for the content pages of the ``main`` blueprint.
+
+Home, résumé, books and references only change on deploy, so their rendered
+HTML is kept in a per-process LRU (bounded by entry count and total bytes),
+optionally backed by a shared store (filesystem directory or Redis) so both
+gunicorn workers benefit from one render.
+
+Keys include a template *version* (newest mtime under the templates folder),
+so editing a template invalidates every page without explicit purging.
+Requests that carry session data (flashed messages, etc.) bypass the cache
+entirely, as do non-GET requests and non-200 responses.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask, Response, request, session
+
+logger = logging.getLogger(__name__)
+
+# (status, headers, body)
+CachedPage = tuple[int, list, bytes]
+
+# Shared-store record: 4-byte big-endian length, JSON {"status", "headers"}, raw body.
+# Deliberately not pickle: whoever can write the cache directory or reach Redis
+# could otherwise run code in every worker.
+_HEADER_LEN = struct.Struct(">I")
+
+
+def encode_page(entry: CachedPage) -> bytes:
+    status, headers, body = entry
+    meta = json.dumps({"status": status, "headers": [list(h) for h in headers]}).encode()
+    return _HEADER_LEN.pack(len(meta)) + meta + body
+
+
+def decode_page(raw: bytes) -> CachedPage:
+    """Inverse of ``encode_page``; raises ValueError on anything malformed."""
+    try:
+        (size,) = _HEADER_LEN.unpack_from(raw)
+        end = _HEADER_LEN.size + size
+        if end > len(raw):
+            raise ValueError("truncated page record")
+        meta = json.loads(raw[_HEADER_LEN.size:end])
+        status = int(meta["status"])
+        headers = [(str(k), str(v)) for k, v in meta["headers"]]
+    except (struct.error, KeyError, TypeError) as exc:
+        raise ValueError(f"malformed page record: {exc}") from exc
+    return status, headers, bytes(raw[end:])
+
+
+class MemoryLRU:
+    """Thread-safe LRU bounded by entry count and total body bytes."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 8_000_000) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, CachedPage] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        size = len(entry[2])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._data[key] = entry
+            self._bytes += size
+            while self._data and (
+                len(self._data) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted[2])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FilesystemStore:
+    """Shared store: one ``encode_page`` file per key in a directory all workers can read.
+
+    Bounded like the memory LRU: every ``sweep_every`` writes, expired files
+    are deleted and then the oldest ones until the entry/byte limits hold.
+    """
+
+    sweep_every = 32
+
+    def __init__(self, directory: str, ttl: float, max_entries: int = 256,
+                 max_bytes: int = 8_000_000) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self.sweep()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / (hashlib.sha256(key.encode()).hexdigest() + ".page")
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        path = self._path(key)
+        try:
+            if self.ttl and time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return decode_page(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(encode_page(entry))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Page cache write failed: %s", exc)
+        self._writes += 1
+        if self._writes % self.sweep_every == 0:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete expired files, then the oldest beyond the limits; returns how many."""
+        files = []
+        for path in self.dir.glob("*.page"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        files.sort(key=lambda f: f[0], reverse=True)  # newest first
+
+        now = time.time()
+        kept, kept_bytes, removed = 0, 0, 0
+        for mtime, size, path in files:
+            expired = self.ttl and now - mtime > self.ttl
+            if expired or kept >= self.max_entries or kept_bytes + size > self.max_bytes:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                kept, kept_bytes = kept + 1, kept_bytes + size
+        return removed
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.dir.glob("*.page"))
+
+
+class RedisStore:
+    """Shared store backed by Redis (requires the optional ``redis`` package)."""
+
+    def __init__(self, url: str, ttl: float) -> None:
+        import redis  # optional dependency
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = int(ttl) or None
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        try:
+            raw = self.client.get("page:" + key)
+        except Exception as exc:
+            logger.warning("Page cache redis get failed: %s", exc)
+            return None
+        if not raw:
+            return None
+        try:
+            return decode_page(raw)
+        except ValueError as exc:
+            logger.warning("Ignoring malformed page cache entry: %s", exc)
+            return None
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        try:
+            self.client.set("page:" + key, encode_page(entry), ex=self.ttl)
+        except Exception as exc:
+            logger.warning("Page cache redis set failed: %s", exc)
+
+
+class TemplateWatcher:
+    """Tracks the newest template mtime; rescans at most every ``check_interval`` s.
+
+    Shared (via ``template_watcher(app)``) by the page cache and the
+    conditional-request hooks so both see the same version.
+    """
+
+    def __init__(self, template_dir: Path, check_interval: float) -> None:
+        self.template_dir = template_dir
+        self.check_interval = check_interval
+        self._version = 0
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._listeners: list = []
+        self._extra_files: list[str] = []
+
+    def on_change(self, callback) -> None:
+        self._listeners.append(callback)
+
+    def watch_file(self, path: str) -> None:
+        """Also version on ``path`` (e.g. the static manifest that rendered URLs depend on)."""
+        self._extra_files.append(str(path))
+
+    def version(self) -> int:
+        """Newest template mtime in nanoseconds."""
+        now = time.monotonic()
+        if self._version and now - self._checked < self.check_interval:
+            return self._version
+        with self._lock:
+            newest = 0
+            for root, _, files in os.walk(self.template_dir):
+                for name in files:
+                    try:
+                        newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+                    except OSError:
+                        continue
+            for path in self._extra_files:
+                try:
+                    newest = max(newest, os.stat(path).st_mtime_ns)
+                except OSError:
+                    continue
+            changed = self._version and newest != self._version
+            self._version = newest
+            self._checked = now
+        if changed:
+            logger.info("Templates changed; cached pages invalidated")
+            for callback in self._listeners:
+                callback()
+        return self._version
+
+
+def template_watcher(app: Flask) -> TemplateWatcher:
+    watcher = app.extensions.get("template_watcher")
+    if watcher is None:
+        watcher = TemplateWatcher(
+            Path(app.root_path) / (app.template_folder or "templates"),
+            float(app.config.get("RESPONSE_CACHE_CHECK_INTERVAL", 2)),
+        )
+        app.extensions["template_watcher"] = watcher
+    return watcher
+
+
+class PageCache:
+    def __init__(self, app: Flask) -> None:
+        cfg = app.config
+        self.endpoints = frozenset(cfg.get("RESPONSE_CACHE_ENDPOINTS", ()))
+        self.local = MemoryLRU(
+            int(cfg.get("RESPONSE_CACHE_MAX_ENTRIES", 256)),
+            int(cfg.get("RESPONSE_CACHE_MAX_BYTES", 8_000_000)),
+        )
+        self.shared = _make_shared_store(app)
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0}
+        self.watcher = template_watcher(app)
+        self.watcher.on_change(self.local.clear)
+
+    def template_version(self) -> int:
+        return self.watcher.version()
+
+    # --- request handling ---
+
+    def eligible(self) -> bool:
+        return request.method in ("GET", "HEAD") and request.endpoint in self.endpoints
+
+    def key(self) -> str:
+        accept = request.headers.get("Accept-Encoding", "")
+        encoding = "br" if "br" in accept else "gzip" if "gzip" in accept else "identity"
+        # These views ignore query args: keying on the path keeps ?junk=N from
+        # evicting real pages (and keeps e.g. ?password=... out of the cache)
+        return f"{self.template_version()}|{request.path}|{encoding}"
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.local.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        self.local.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, entry)
+        self.stats["stored"] += 1
+
+
+def _make_shared_store(app: Flask):
+    backend = (app.config.get("RESPONSE_CACHE_BACKEND") or "memory").lower()
+    ttl = float(app.config.get("RESPONSE_CACHE_TTL", 3600))
+    try:
+        if backend == "filesystem":
+            directory = app.config.get("RESPONSE_CACHE_DIR") or os.path.join(
+                app.instance_path, "page_cache"
+            )
+            return FilesystemStore(
+                directory,
+                ttl,
+                int(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 256)),
+                int(app.config.get("RESPONSE_CACHE_MAX_BYTES", 8_000_000)),
+            )
+        if backend == "redis":
+            return RedisStore(app.config.get("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0"), ttl)
+    except Exception as exc:
+        app.logger.warning("Page cache backend %r unavailable (%s); using memory only", backend, exc)
+    return None
+
+
+def init_page_cache(app: Flask) -> Optional[PageCache]:
+    """Register before/after hooks that serve and store cached pages."""
+    if not app.config.get("RESPONSE_CACHE_ENABLED"):
+        return None
+
+    cache = PageCache(app)
+    app.extensions["page_cache"] = cache
+
+    @app.before_request
+    def _serve_cached_page():
+        if not cache.eligible():
+            return None
+        if session:  # flashed messages or other per-user state: render fresh
+            cache.stats["bypassed"] += 1
+            return None
+        entry = cache.get(cache.key())
+        if entry is None:
+            cache.stats["misses"] += 1
+            return None
+        cache.stats["hits"] += 1
+        status, headers, body = entry
+        resp = Response(body, status=status, headers=headers)
+        resp.headers["X-Cache"] = "HIT"
+        return resp
+
+    @app.after_request
+    def _store_page(resp: Response):
+        if (
+            not cache.eligible()
+            or resp.status_code != 200
+            or resp.headers.get("X-Cache") == "HIT"
+            or resp.direct_passthrough
+            or resp.is_streamed
+            or "Set-Cookie" in resp.headers
+            or session
+            or getattr(session, "modified", False)
+        ):
+            return resp
+        headers = [(k, v) for k, v in resp.headers.items() if k.lower() != "content-length"]
+        cache.set(cache.key(), (resp.status_code, headers, resp.get_data()))
+        resp.headers["X-Cache"] = "MISS"
+        return resp
+
+    return cache
@@ -0,0 +1,151 @@
+# resume_site/profiling.py
+"""
+Opt-in cProfile capture of individual requests.
+
+With PROFILING_ENABLED, a request carrying ``?profile=1`` (or the
+``X-Profile: 1`` header) *and* the admin password (``?password=`` or
+``X-Admin-Password``) runs under cProfile. The stats are written to a
+bounded ring of ``.prof`` files in PROFILE_DIR and the response carries an
+``X-Profile-Id`` header; admins list and download them under
+``/admin/profiles``.
+
+When PROFILING_ENABLED is off no hooks are registered at all, so ordinary
+requests pay nothing. Only one request is profiled at a time per process.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask, g, request
+
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class ProfileStore:
+    """``.prof`` files plus a ``.json`` summary each; oldest removed past ``keep``."""
+
+    def __init__(self, directory: str | os.PathLike, keep: int = 20) -> None:
+        self.dir = Path(directory)
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def save(self, profiler: cProfile.Profile, meta: dict) -> str:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = _SAFE.sub("_", f"{stamp}-{meta.get('endpoint') or 'unmatched'}-{meta['request_id']}")
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(self.dir / f"{name}.prof"))
+            (self.dir / f"{name}.json").write_text(json.dumps({**meta, "name": name}))
+            self._prune()
+        return name
+
+    def _prune(self) -> None:
+        profiles = sorted(self.dir.glob("*.prof"))
+        for path in profiles[: max(0, len(profiles) - self.keep)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        """Summaries, newest first."""
+        entries = []
+        for path in sorted(self.dir.glob("*.json"), reverse=True):
+            try:
+                entries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def path(self, name: str) -> Optional[Path]:
+        if _SAFE.sub("_", name) != name:
+            return None
+        path = self.dir / f"{name}.prof"
+        return path if path.is_file() else None
+
+    def summary(self, name: str, limit: int = 40) -> Optional[str]:
+        """Top functions by cumulative time, as pstats prints them."""
+        path = self.path(name)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(str(path), stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+def _requested() -> bool:
+    from .routes import check_auth  # the same password gate as requires_auth
+
+    flag = request.args.get("profile") or request.headers.get("X-Profile")
+    if flag not in ("1", "true", "yes"):
+        return False
+    password = request.args.get("password") or request.headers.get("X-Admin-Password")
+    return bool(password) and check_auth(password)
+
+
+def init_profiling(app: Flask) -> Optional[ProfileStore]:
+    """Register the profiling hooks, only when PROFILING_ENABLED."""
+    if not app.config.get("PROFILING_ENABLED"):
+        return None
+
+    store = ProfileStore(
+        app.config.get("PROFILE_DIR") or os.path.join(app.instance_path, "profiles"),
+        int(app.config.get("PROFILE_KEEP", 20)),
+    )
+    app.extensions["profile_store"] = store
+    busy = threading.Lock()
+
+    @app.before_request
+    def _start_profile():
+        if not _requested():
+            return
+        if not busy.acquire(blocking=False):
+            g.profile_busy = True
+            return
+        g.profiler = cProfile.Profile()
+        g.profile_started = time.perf_counter()
+        g.profiler.enable()
+
+    @app.after_request
+    def _finish_profile(resp):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            if g.pop("profile_busy", False):
+                resp.headers["X-Profile"] = "busy"
+            return resp
+        profiler.disable()
+        try:
+            name = store.save(profiler, {
+                "request_id": g.get("request_id", "-"),
+                "endpoint": request.endpoint,
+                "method": request.method,
+                "path": request.path,
+                "status": resp.status_code,
+                "duration_ms": round((time.perf_counter() - g.profile_started) * 1000, 2),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            })
+            resp.headers["X-Profile-Id"] = name
+        except OSError as exc:
+            app.logger.warning("Saving request profile failed: %s", exc)
+        finally:
+            busy.release()
+        return resp
+
+    @app.teardown_request
+    def _abandon_profile(exc):
+        # after_request does not run when the view raised; don't leave the profiler on
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            busy.release()
+
+    app.logger.info("Request profiling enabled; profiles kept in %s", store.dir)
+    return store
@@ -0,0 +1,241 @@
+# resume_site/rate_limit.py
+"""
+Token-bucket rate limiting for the endpoints that trigger email.
+
+Limits are configured per endpoint in ``RATE_LIMITS`` as ``"N/period"``
+strings, keyed by what they count (``ip`` and/or ``email``)::
+
+    "main.resume": {"methods": ("POST",), "ip": "5/minute", "email": "3/hour"}
+
+Each key gets a bucket holding up to N tokens that refills at N per period.
+The check runs in a ``before_request`` hook, so an over-limit request is
+answered with 429 before the view touches the database or SMTP. All of a
+request's buckets are checked together and a token is taken from each only
+if every one has one, so a request rejected by one limit costs nothing in
+the others.
+
+Client addresses come from ``request.remote_addr``; behind a proxy set
+TRUSTED_PROXIES so ``create_app`` applies ProxyFix and that is the visitor's
+address rather than the router's.
+
+With ``RATE_LIMIT_BACKEND = "memory"`` buckets live in a per-process dict;
+with ``"sqlite"`` (the Config default) they live in a small SQLite file shared
+by every gunicorn worker, so the limit holds across processes. If the shared store fails the request is let
+through (and counted) rather than taking the form down with it.
+"""
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from flask import Flask, Response, request
+
+from .models import normalize_email
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(spec: str) -> tuple[float, float]:
+    """``"5/minute"`` -> (capacity 5, refill 5/60 tokens per second)."""
+    count, _, period = spec.partition("/")
+    capacity = float(count)
+    seconds = PERIODS.get(period.strip().rstrip("s"))
+    if capacity <= 0 or seconds is None:
+        raise ValueError(f"Invalid rate limit {spec!r}")
+    return capacity, capacity / seconds
+
+
+def _refill(tokens: float, updated: float, capacity: float, rate: float, now: float) -> float:
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+def _full_at(tokens: float, capacity: float, rate: float, now: float) -> float:
+    """When an untouched bucket will be full again (its state is then disposable)."""
+    return now + (capacity - tokens) / rate
+
+
+class MemoryBucketStore:
+    """Per-process buckets; buckets that have refilled are pruned when the map grows."""
+
+    def __init__(self, max_keys: int = 10_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float, float]] = {}  # tokens, updated, full_at
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Consume one token; return 0 if allowed, else seconds until one is available."""
+        return self.take_all([(key, capacity, rate)], now)[0]
+
+    def take_all(self, buckets: list[tuple[str, float, float]], now: float) -> list[float]:
+        """Take one token from every bucket, or from none if any is empty.
+
+        Returns the wait per bucket (all 0 when the tokens were taken)."""
+        with self._lock:
+            states = [
+                _refill(*self._buckets.get(key, (capacity, now, now))[:2], capacity, rate, now)
+                for key, capacity, rate in buckets
+            ]
+            waits = _waits(states, buckets)
+            if not any(waits):
+                for (key, capacity, rate), tokens in zip(buckets, states):
+                    tokens -= 1
+                    self._buckets[key] = (tokens, now, _full_at(tokens, capacity, rate, now))
+            if len(self._buckets) > self.max_keys:
+                self._buckets = {k: v for k, v in self._buckets.items() if v[2] > now}
+            return waits
+
+
+def _waits(states: list[float], buckets: list[tuple[str, float, float]]) -> list[float]:
+    return [0.0 if tokens >= 1 else (1 - tokens) / rate for tokens, (_, _, rate) in zip(states, buckets)]
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file so every worker process shares the same limits."""
+
+    PRUNE_EVERY = 500  # takes between sweeps of refilled buckets
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._takes = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, "
+            "tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        return self.take_all([(key, capacity, rate)], now)[0]
+
+    def take_all(self, buckets: list[tuple[str, float, float]], now: float) -> list[float]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")  # serialize read-modify-write across processes
+        try:
+            states = []
+            for key, capacity, rate in buckets:
+                row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                states.append(_refill(*(row or (capacity, now)), capacity, rate, now))
+            waits = _waits(states, buckets)
+            if not any(waits):
+                conn.executemany(
+                    "INSERT INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, "
+                    "updated = excluded.updated, full_at = excluded.full_at",
+                    [
+                        (key, tokens - 1, now, _full_at(tokens - 1, capacity, rate, now))
+                        for (key, capacity, rate), tokens in zip(buckets, states)
+                    ],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._takes += 1
+        if self._takes % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+        return waits
+
+
+class RateLimiter:
+    def __init__(self, app: Flask) -> None:
+        self.rules: dict[str, dict] = {}
+        for endpoint, rule in (app.config.get("RATE_LIMITS") or {}).items():
+            self.rules[endpoint] = {
+                "methods": frozenset(m.upper() for m in rule.get("methods", ("POST",))),
+                "limits": {
+                    dim: parse_rate(rule[dim]) for dim in ("ip", "email") if rule.get(dim)
+                },
+            }
+        self.store = _make_store(app)
+        self.shed: Counter = Counter()  # (endpoint, dimension) -> rejected requests
+        self.errors = 0
+        self.logger = app.logger
+
+    def _keys(self, endpoint: str, dims) -> list[tuple[str, str]]:
+        keys = []
+        if "ip" in dims:
+            keys.append(("ip", f"{endpoint}|ip|{request.remote_addr or '-'}"))
+        if "email" in dims:
+            email = request.form.get("email") or request.args.get("email")
+            if email:
+                keys.append(("email", f"{endpoint}|email|{normalize_email(email)}"))
+        return keys
+
+    def check(self) -> Optional[Response]:
+        """Return a 429 response if the current request is over any of its limits."""
+        endpoint = request.endpoint
+        rule = self.rules.get(endpoint)
+        if rule is None or request.method not in rule["methods"]:
+            return None
+
+        now = time.time()
+        limits = rule["limits"]
+        keys = self._keys(endpoint, limits)
+        if not keys:
+            return None
+        try:
+            waits = self.store.take_all([(key, *limits[dim]) for dim, key in keys], now)
+        except Exception as e:  # shared store trouble: fail open
+            self.errors += 1
+            self.logger.error("Rate limit store error: %s", e)
+            return None
+        rejected = [(dim, wait) for (dim, _), wait in zip(keys, waits) if wait]
+        if not rejected:
+            return None
+        for dim, _ in rejected:
+            self.shed[(endpoint, dim)] += 1
+        wait = max(w for _, w in rejected)
+        self.logger.warning(
+            "Rate limit exceeded on %s by %s (%s); retry in %.0fs",
+            endpoint, "+".join(dim for dim, _ in rejected), request.remote_addr, wait,
+        )
+        return Response(
+            "Too many requests. Please try again later.",
+            429,
+            {"Retry-After": str(math.ceil(wait))},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "shed": {f"{endpoint}:{dim}": n for (endpoint, dim), n in self.shed.items()},
+            "shed_total": sum(self.shed.values()),
+            "store_errors": self.errors,
+        }
+
+
+def _make_store(app: Flask):
+    backend = (app.config.get("RATE_LIMIT_BACKEND") or "memory").lower()
+    if backend == "sqlite":
+        path = app.config.get("RATE_LIMIT_SQLITE_PATH") or os.path.join(
+            app.instance_path, "rate_limits.sqlite3"
+        )
+        try:
+            return SQLiteBucketStore(path)
+        except (OSError, sqlite3.Error) as exc:
+            app.logger.warning("Rate limit backend sqlite unavailable (%s); using memory", exc)
+    return MemoryBucketStore()
+
+
+def init_rate_limits(app: Flask) -> Optional[RateLimiter]:
+    """Register the before_request check; must run before any hook that does real work."""
+    if not app.config.get("RATE_LIMIT_ENABLED"):
+        return None
+
+    limiter = RateLimiter(app)
+    app.extensions["rate_limiter"] = limiter
+    app.before_request(limiter.check)
+    return limiter
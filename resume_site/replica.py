@@ -0,0 +1,175 @@
+# resume_site/replica.py
+"""
+Optional read replica (``DATABASE_REPLICA_URL``).
+
+The replica is an extra Flask-SQLAlchemy bind named ``replica`` that no
+model is mapped to, so ``create_all()`` and migrations never touch it.
+``db.session`` is a ``RoutingSession`` that sends a read there only when
+all of these hold:
+
+- the read was asked for: the endpoint is in REPLICA_READ_ENDPOINTS (the
+  admin listing and its exports), or the code runs inside ``use_replica()``;
+- the session has not written yet: a flush, an INSERT/UPDATE/DELETE or
+  pending changes pin it to the primary until it is closed at the end of
+  the request, so a request reads its own writes;
+- ``ReplicaMonitor`` thinks the replica is usable: it answered ``SELECT 1``
+  and its lag (REPLICA_LAG_QUERY; built in for Postgres) is at most
+  REPLICA_MAX_LAG seconds. The result is cached for REPLICA_CHECK_INTERVAL
+  seconds; a failed check or a failed replica read takes it out of
+  rotation for REPLICA_RETRY_AFTER seconds, and the failed read is retried
+  on the primary.
+
+Everything else goes to the primary, as it does with no replica configured.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import sqlalchemy as sa
+from flask import Flask, current_app, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"
+
+# Seconds the standby is behind; 0 when it has replayed everything it received
+POSTGRES_LAG_QUERY = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaMonitor:
+    """Cached answer to "may reads go to the replica right now?"."""
+
+    def __init__(self, app: Flask) -> None:
+        cfg = app.config
+        self.max_lag = float(cfg.get("REPLICA_MAX_LAG", 5))
+        self.check_interval = float(cfg.get("REPLICA_CHECK_INTERVAL", 5))
+        self.retry_after = float(cfg.get("REPLICA_RETRY_AFTER", 30))
+        self.lag_query = cfg.get("REPLICA_LAG_QUERY")
+        if self.lag_query is None and cfg["DATABASE_REPLICA_URL"].startswith(("postgres://", "postgresql")):
+            self.lag_query = POSTGRES_LAG_QUERY
+        self.lag: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._usable = False
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"checks": 0, "replica_reads": 0, "fallbacks": 0}
+
+    def available(self, engine: sa.engine.Engine) -> bool:
+        if time.monotonic() >= self._next_check and self._lock.acquire(blocking=False):
+            # One thread re-checks; the others keep using the previous answer
+            try:
+                self._check(engine)
+            finally:
+                self._lock.release()
+        return self._usable
+
+    def _check(self, engine: sa.engine.Engine) -> None:
+        self.stats["checks"] += 1
+        try:
+            with engine.connect() as conn:
+                conn.execute(sa.text("SELECT 1"))
+                lag = float(conn.execute(sa.text(self.lag_query)).scalar() or 0) if self.lag_query else 0.0
+        except Exception as e:
+            self.mark_down(e)
+            return
+        self.lag, self.last_error = lag, None
+        self._usable = lag <= self.max_lag
+        self._next_check = time.monotonic() + self.check_interval
+        if not self._usable:
+            logger.warning("Replica %.1fs behind (max %.1fs); reading from the primary", lag, self.max_lag)
+
+    def mark_down(self, error: Exception) -> None:
+        """Take the replica out of rotation for REPLICA_RETRY_AFTER seconds."""
+        if self._usable or self.last_error is None:
+            logger.warning("Replica unavailable, reading from the primary: %s", error)
+        self._usable = False
+        self.last_error = str(error)
+        self._next_check = time.monotonic() + self.retry_after
+
+
+class RoutingSession(Session):
+    """``db.session`` class: replica for eligible reads, primary for the rest."""
+
+    def _replica_engine(self, clause) -> Optional[sa.engine.Engine]:
+        if self._flushing or isinstance(clause, sa.UpdateBase):
+            self.info["wrote"] = True
+            return None
+        if not self.info.get("use_replica") or self.info.get("wrote"):
+            return None
+        if self.new or self.dirty or self.deleted or not has_app_context():
+            return None
+        monitor = current_app.extensions.get("db_replica")
+        engine = self._db.engines.get(REPLICA_BIND) if monitor is not None else None
+        if engine is None or not monitor.available(engine):
+            return None
+        return engine
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is None and primary is self._db.engines.get(None):
+            replica = self._replica_engine(clause)
+            if replica is not None:
+                return replica
+        return primary
+
+    def execute(self, statement, *args, **kwargs):
+        replica = self._replica_engine(statement)
+        if replica is None:
+            return super().execute(statement, *args, **kwargs)
+        monitor = current_app.extensions["db_replica"]
+        try:
+            result = super().execute(statement, *args, **kwargs)
+        except OperationalError as e:
+            # Nothing was written (see _replica_engine), so the rollback loses nothing
+            monitor.mark_down(e)
+            monitor.stats["fallbacks"] += 1
+            self.rollback()
+            return super().execute(statement, *args, **kwargs)
+        monitor.stats["replica_reads"] += 1
+        return result
+
+    def close(self) -> None:
+        self.info.pop("use_replica", None)
+        self.info.pop("wrote", None)
+        super().close()
+
+
+@contextmanager
+def use_replica():
+    """Let reads in this block go to the replica (no-op without one)."""
+    from .extensions import db
+
+    info = db.session.info
+    previous = info.get("use_replica", False)
+    info["use_replica"] = True
+    try:
+        yield
+    finally:
+        info["use_replica"] = previous
+
+
+def init_replica(app: Flask) -> Optional[ReplicaMonitor]:
+    """Route REPLICA_READ_ENDPOINTS to the ``replica`` bind when one is configured."""
+    if not app.config.get("DATABASE_REPLICA_URL"):
+        return None
+    from .extensions import db
+
+    monitor = ReplicaMonitor(app)
+    app.extensions["db_replica"] = monitor
+    endpoints = frozenset(app.config.get("REPLICA_READ_ENDPOINTS", ()))
+
+    @app.before_request
+    def _route_reads_to_replica():
+        if request.endpoint in endpoints and request.method in ("GET", "HEAD"):
+            db.session.info["use_replica"] = True
+
+    return monitor
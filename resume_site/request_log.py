@@ -0,0 +1,118 @@
+# resume_site/request_log.py
+"""
+Request-scoped logging context and an optional JSON formatter.
+
+Every request gets an id (the incoming ``X-Request-ID`` if it looks sane,
+otherwise a fresh one) that is echoed back in the response header and
+attached to every record logged while the request is active, together with
+the route, method and client IP. When the response is ready one access line
+records status and latency.
+
+``RequestContextFilter`` sits on the app logger's handlers rather than the
+logger, so records from ``resume_site.*`` module loggers (which propagate to
+those handlers but skip the parent's own filters) carry the fields too. The
+filter runs on the request thread, before the log queue hands the record to
+the listener.
+With ``LOG_JSON`` the handlers emit one JSON object per line instead of the
+human-readable ``LOG_FORMAT``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+
+from flask import Flask, g, has_request_context, request
+
+CONTEXT_FIELDS = ("request_id", "route", "method", "client_ip", "status", "latency_ms")
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the current request's context onto each record (``-`` outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if has_request_context() and "request_id" in g:
+            record.request_id = g.request_id
+            record.route = request.url_rule.rule if request.url_rule else request.path
+            record.method = request.method
+            record.client_ip = request.remote_addr
+            record.status = g.get("response_status", "-")
+            record.latency_ms = g.get("latency_ms", "-")
+        else:
+            for field in CONTEXT_FIELDS:
+                if not hasattr(record, field):
+                    setattr(record, field, "-")
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message + request context."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, "-")
+            if value != "-":
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def make_formatter(app: Flask) -> logging.Formatter:
+    if app.config.get("LOG_JSON"):
+        return JsonFormatter()
+    return logging.Formatter(
+        app.config.get("LOG_FORMAT", "%(asctime)s — %(name)s — %(levelname)s — %(message)s")
+    )
+
+
+def init_request_logging(app: Flask) -> None:
+    """Attach the context filter to the app logger's handlers and add the
+    request-id / access-log hooks.
+
+    Call once the handlers are configured and before any other
+    ``before_request`` hook is registered, so that records logged by those
+    hooks already carry the request id.
+    """
+    header = app.config.get("REQUEST_ID_HEADER", "X-Request-ID")
+    access_log = app.config.get("REQUEST_LOG_ENABLED", True)
+
+    context_filter = RequestContextFilter()
+    for target in [app.logger, *app.logger.handlers]:
+        for existing in list(target.filters):
+            if isinstance(existing, RequestContextFilter):
+                target.removeFilter(existing)
+        if target is not app.logger:
+            target.addFilter(context_filter)
+
+    @app.before_request
+    def _start_request_context():
+        incoming = request.headers.get(header, "")
+        g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _finish_request_context(resp):
+        # Registered first, so it runs after every other after_request hook
+        if "request_id" not in g:
+            return resp
+        resp.headers[header] = g.request_id
+        g.response_status = resp.status_code
+        g.latency_ms = round((time.perf_counter() - g.request_started) * 1000, 2)
+        if access_log:
+            app.logger.info(
+                "%s %s %s %.2fms", request.method, request.path, resp.status_code, g.latency_ms
+            )
+        return resp
@@ -2,6 +2,7 @@
 
 import os
 import logging
+from datetime import datetime, timezone
 from flask import Response
 from functools import wraps
 from flask import current_app
@@ -15,15 +16,32 @@ from flask import (
     request,
     flash,
     current_app,
+    abort,
+    stream_with_context,
+    send_file,
 )
-from sqlalchemy import text
 
+from .attachments import attachment_cache
 from .models import db, EmailRequest, UserMessage
+from .admin_queries import (
+    InvalidQuery,
+    filtered_select,
+    iter_csv,
+    iter_ndjson,
+    page_email_requests,
+)
 from .utils import send_email, validate_email
+from .mail_queue import enqueue_email
 
 logger = logging.getLogger(__name__)
 main_bp = Blueprint("main", __name__)
 
+# Résumé files under static/files, by format
+RESUME_FILES = {
+    "pdf": "Resume.v3.4.pdf",
+    "docx": "Resume.v3.4.docx",
+}
+
 # Home page route
 @main_bp.route("/")
 def index():
@@ -40,33 +58,28 @@ def resume():
         ip_address = request.remote_addr
 
         current_app.logger.info(
-            f"Received resume request from {user_name} ({user_email}) at {ip_address}"
+            "Received resume request from %s (%s) at %s", user_name, user_email, ip_address
         )
 
         if not user_email or not validate_email(user_email):
             flash("Please provide a valid email address.", "danger")
-            current_app.logger.warning(f"Invalid email address provided: {user_email}")
+            current_app.logger.warning("Invalid email address provided: %s", user_email)
             return redirect(url_for("main.resume"))
 
         try:
-            db.session.execute(text("SELECT 1"))
-            existing_request = EmailRequest.query.filter_by(email=user_email).first()
+            request_count = EmailRequest.record(user_name, user_email, ip_address)
+            db.session.commit()
 
-            if existing_request:
+            if request_count > 1:
                 flash(
                     "You've already requested a resume. Sending another copy!", "info"
                 )
             else:
-                new_request = EmailRequest(
-                    name=user_name, email=user_email, ip_address=ip_address
-                )
-                db.session.add(new_request)
-                db.session.commit()
-                current_app.logger.info(f"New resume request recorded: {user_name}, {user_email}")
+                current_app.logger.info("New resume request recorded: %s, %s", user_name, user_email)
 
         except Exception as e:
             db.session.rollback()
-            current_app.logger.error(f"Database error while saving resume request: {e}")
+            current_app.logger.error("Database error while saving resume request: %s", e)
             flash("An error occurred. Please try again.", "danger")
             return redirect(url_for("main.resume"))
 
@@ -76,26 +89,74 @@ def resume():
             "Attached is the resume you requested."
         )
 
-        filename = "Resume.v3.4.pdf" if resume_format == "pdf" else "Resume.v3.4.docx"
+        filename = RESUME_FILES["pdf"] if resume_format == "pdf" else RESUME_FILES["docx"]
         attachment_path = os.path.join(current_app.static_folder, "files", filename)
 
-        mail = current_app.extensions.get("mail")
-        if not mail:
-            current_app.logger.error("Mail extension not initialized!")
+        if current_app.config.get("MAIL_QUEUE_ENABLED"):
+            # Hand off to the background dispatcher; SMTP latency stays off this thread
+            try:
+                job = enqueue_email(user_email, subject, body, attachment_path)
+                current_app.logger.info("Resume email queued (id=%s) for %s", job.id, user_email)
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error("Failed to queue resume email: %s", e)
+                flash("An error occurred. Please try again.", "danger")
+                return redirect(url_for("main.resume"))
+        elif current_app.extensions.get("async_mail") and current_app.extensions["async_mail"].running:
+            # ASGI mode: the send runs on the event loop; this thread is free again now
+            current_app.extensions["async_mail"].submit(user_email, subject, body, attachment_path)
+            current_app.logger.info("Resume email handed to the async mailer for %s", user_email)
         else:
-            current_app.logger.info("Mail extension loaded successfully")        
-
-        success, message = send_email(
-            mail,
-            user_email,
-            subject,
-            body,
-            attachment_path
-        )
+            mail = current_app.extensions.get("mail")
+            if not mail:
+                current_app.logger.error("Mail extension not initialized!")
+            else:
+                current_app.logger.info("Mail extension loaded successfully")
+
+            success, message = send_email(
+                mail,
+                user_email,
+                subject,
+                body,
+                attachment_path
+            )
 
     return render_template("resume.html")
 
 
+# Direct download: the file goes out via wsgi.file_wrapper (sendfile under
+# gunicorn), with Range/If-Range handled by send_file's conditional mode.
+@main_bp.route("/resume/download/<fmt>")
+def download_resume(fmt):
+    filename = RESUME_FILES.get(fmt)
+    if filename is None:
+        abort(404)
+    path = os.path.join(current_app.static_folder, "files", filename)
+    entry = attachment_cache.get(path)  # ETag precomputed at startup
+    if entry is None:
+        abort(404)
+
+    response = send_file(
+        entry.path,
+        mimetype=entry.content_type,
+        as_attachment=True,
+        download_name=filename,
+        etag=entry.etag,
+        conditional=True,
+        max_age=current_app.config.get("RESUME_DOWNLOAD_MAX_AGE", 3600),
+    )
+    if response.status_code in (200, 206) and request.method == "GET":
+        # Queued for a background writer: the transfer never waits on the DB
+        current_app.extensions["download_recorder"].record(
+            filename=filename,
+            ip_address=request.remote_addr,
+            user_agent=(request.user_agent.string or "")[:256],
+            status_code=response.status_code,
+            byte_range=request.headers.get("Range", "")[:64] or None,
+        )
+    return response
+
+
 @main_bp.route("/books")
 def books():
     return render_template("books.html")
@@ -121,18 +182,85 @@ def requires_auth(f):
         return f(*args, **kwargs)
     return decorated
 
+# Admin listing: filters carried between pages, streamed export formats
+FILTER_ARGS = ("since", "until", "email", "limit")
+EXPORTERS = {
+    "csv": ("text/csv", iter_csv),
+    "ndjson": ("application/x-ndjson", iter_ndjson),
+}
+
 @main_bp.route("/secret-email-view-98347")
 @requires_auth
 def email_requests():
+    export = request.args.get("export")
+    if export in EXPORTERS:
+        mimetype, generate = EXPORTERS[export]
+        try:
+            filtered_select(request.args)  # validate filters before streaming starts
+        except InvalidQuery as e:
+            abort(400, description=str(e))
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+        return Response(
+            stream_with_context(generate(request.args)),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": f"attachment; filename=email_requests_{stamp}.{export}"
+            },
+        )
+
     try:
-        requests = EmailRequest.query.all()
-        return render_template("email_requests.html", email_requests=requests)
+        rows, next_cursor = page_email_requests(request.args)
+    except InvalidQuery as e:
+        abort(400, description=str(e))
+
+    try:
+        filters = {k: request.args[k] for k in FILTER_ARGS if request.args.get(k)}
+        return render_template(
+            "email_requests.html",
+            email_requests=rows,
+            next_cursor=next_cursor,
+            filters=filters,
+            password=request.args.get("password"),
+        )
     except Exception as e:
-        current_app.logger.error(f"Failed to retrieve email requests: {e}")
+        current_app.logger.error("Failed to retrieve email requests: %s", e)
         flash("An error occurred while retrieving data.", "danger")
         return redirect(url_for("main.index"))
 
 
+@main_bp.route("/metrics")
+@requires_auth
+def metrics():
+    collector = current_app.extensions.get("metrics")
+    if collector is None:
+        abort(404)
+    return Response(collector.render(), mimetype="text/plain; version=0.0.4")
+
+
+@main_bp.route("/admin/profiles")
+@requires_auth
+def profiles():
+    store = current_app.extensions.get("profile_store")
+    if store is None:
+        abort(404)
+    return render_template(
+        "profiles.html", profiles=store.list(), password=request.args.get("password")
+    )
+
+
+@main_bp.route("/admin/profiles/<name>")
+@requires_auth
+def profile_download(name):
+    store = current_app.extensions.get("profile_store")
+    path = store.path(name) if store is not None else None
+    if path is None:
+        abort(404)
+    if request.args.get("format") == "text":
+        return Response(store.summary(name), mimetype="text/plain")
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True,
+                     download_name=path.name, max_age=0)
+
+
 @main_bp.route("/test_email")
 def test_email():
     from flask_mail import Message
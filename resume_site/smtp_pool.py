@@ -0,0 +1,172 @@
+# resume_site/smtp_pool.py
+"""
+Bounded pool of authenticated SMTP sessions, shared by the threads of one process.
+
+Opening a Brevo session costs a TCP connect, STARTTLS and AUTH; the pool pays
+that once and reuses the session for later messages. Idle sessions are
+NOOP-checked before reuse and recycled after ``max_messages`` sends or
+``idle_timeout`` seconds without use.
+"""
+from __future__ import annotations
+
+import os
+import smtplib
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class SMTPPoolTimeout(smtplib.SMTPException):
+    """Raised when no pooled session frees up within the acquire timeout."""
+
+
+class _Lease:
+    """A pooled SMTP session plus the bookkeeping used for recycling."""
+
+    __slots__ = ("host", "created_at", "last_used", "messages")
+
+    def __init__(self, host: smtplib.SMTP) -> None:
+        now = time.monotonic()
+        self.host = host
+        self.created_at = now
+        self.last_used = now
+        self.messages = 0
+
+
+class SMTPConnectionPool:
+    def __init__(
+        self,
+        factory: Callable[[], smtplib.SMTP],
+        max_size: int = 2,
+        max_messages: int = 50,
+        idle_timeout: float = 30.0,
+        acquire_timeout: float = 30.0,
+    ) -> None:
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.max_messages = int(max_messages)
+        self.idle_timeout = float(idle_timeout)
+        self.acquire_timeout = float(acquire_timeout)
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._idle: deque[_Lease] = deque()
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "health_check_failures": 0,
+            "acquire_timeouts": 0,
+        }
+
+    # --- checkout / checkin ---
+
+    def acquire(self) -> _Lease:
+        self._check_fork()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self._counters["acquire_timeouts"] += 1
+            raise SMTPPoolTimeout(
+                f"No SMTP session available within {self.acquire_timeout}s"
+            )
+        try:
+            lease = self._checkout_idle() or self._create()
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use += 1
+        return lease
+
+    def release(self, lease: _Lease, discard: bool = False) -> None:
+        lease.last_used = time.monotonic()
+        with self._lock:
+            self._in_use -= 1
+            if discard:
+                self._counters["discarded"] += 1
+            elif lease.messages >= self.max_messages:
+                self._counters["recycled"] += 1
+                discard = True
+            else:
+                self._idle.append(lease)
+        if discard:
+            self._close(lease)
+        self._slots.release()
+
+    def _checkout_idle(self) -> Optional[_Lease]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                lease = self._idle.pop()  # LIFO: most recently used is most likely alive
+            if time.monotonic() - lease.last_used > self.idle_timeout:
+                with self._lock:
+                    self._counters["recycled"] += 1
+                self._close(lease)
+                continue
+            if not self._healthy(lease):
+                with self._lock:
+                    self._counters["health_check_failures"] += 1
+                self._close(lease)
+                continue
+            with self._lock:
+                self._counters["reused"] += 1
+            return lease
+
+    def _create(self) -> _Lease:
+        host = self._factory()
+        with self._lock:
+            self._counters["created"] += 1
+        return _Lease(host)
+
+    @staticmethod
+    def _healthy(lease: _Lease) -> bool:
+        try:
+            code, _ = lease.host.noop()
+            return code == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(lease: _Lease) -> None:
+        try:
+            lease.host.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                lease.host.close()
+            except OSError:
+                pass
+
+    # --- maintenance ---
+
+    def close_all(self) -> None:
+        """QUIT every idle session (leased sessions are closed when released)."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for lease in idle:
+            self._close(lease)
+
+    def reset_after_fork(self) -> None:
+        """Forget sessions inherited from a parent process without touching their sockets."""
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._idle = deque()
+        self._in_use = 0
+        self._pid = os.getpid()
+
+    def _check_fork(self) -> None:
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                **self._counters,
+            }
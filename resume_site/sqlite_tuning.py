@@ -0,0 +1,260 @@
+# resume_site/sqlite_tuning.py
+"""
+SQLite performance profile for small deployments (SQLITE_TUNING).
+
+Applied to every new connection of a file-backed SQLite engine:
+
+- ``journal_mode=WAL``: readers and the writer stop blocking each other,
+  and a commit appends to the WAL instead of rewriting a rollback journal;
+- ``synchronous=NORMAL``: with WAL, fsync happens at checkpoints rather
+  than on every commit (a power cut may lose the last commits, but cannot
+  corrupt the file);
+- ``mmap_size`` / ``cache_size``: reads are served from mapped pages and a
+  larger per-connection page cache;
+- ``busy_timeout``: a writer blocked by another process waits for the lock
+  instead of failing at once with "database is locked".
+
+SQLite admits one writer at a time. Within a process, sessions queue for
+that slot in ``WriteQueue`` (FIFO) just before their first write and hold
+it until the transaction ends. Without the queue, 16 request threads would
+contend in SQLite's busy handler, which polls with sleeps and gives up with
+"database is locked" once the timeout runs out. Separate processes
+(gunicorn workers) are still arbitrated by busy_timeout.
+
+``SQLiteMaintenance`` is a background thread, started once per process on
+the first request. It periodically checkpoints the WAL so the file stays
+small, and runs ``PRAGMA optimize`` to refresh the query planner statistics.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from collections import deque
+from typing import Optional
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event
+
+from .extensions import db
+from .metrics import timed
+from .replica import RoutingSession
+
+JOURNAL_MODES = {"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"}
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+CHECKPOINT_MODES = {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}
+
+
+def is_file_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and "mode=memory" not in url
+
+
+def _choice(app: Flask, key: str, allowed: set, default: str) -> str:
+    value = str(app.config.get(key, default)).upper()
+    if value not in allowed:
+        app.logger.warning("Ignoring %s=%r (expected one of %s)", key, value, ", ".join(sorted(allowed)))
+        return default
+    return value
+
+
+def connection_pragmas(app: Flask) -> list[str]:
+    """PRAGMA statements run on every new connection, in order."""
+    cfg = app.config
+    return [
+        f"PRAGMA journal_mode={_choice(app, 'SQLITE_JOURNAL_MODE', JOURNAL_MODES, 'WAL')}",
+        f"PRAGMA synchronous={_choice(app, 'SQLITE_SYNCHRONOUS', SYNCHRONOUS_LEVELS, 'NORMAL')}",
+        f"PRAGMA mmap_size={int(cfg.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+        f"PRAGMA cache_size={-int(cfg.get('SQLITE_CACHE_SIZE_KB', 16384))}",  # negative = KiB
+        f"PRAGMA busy_timeout={int(cfg.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+    ]
+
+
+class WriteQueue:
+    """FIFO lock for the database's single write slot, reentrant per thread."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._waiting: deque[object] = deque()
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self.stats = {"acquired": 0, "waited": 0, "timeouts": 0}
+
+    def acquire(self) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                return True
+            if self._owner is None and not self._waiting:
+                self._take(me)
+                return True
+            ticket = object()
+            self._waiting.append(ticket)
+            self.stats["waited"] += 1
+            with timed("db_write_queue_wait_seconds"):
+                ok = self._cond.wait_for(
+                    lambda: self._owner is None and self._waiting[0] is ticket, self.timeout
+                )
+            self._waiting.remove(ticket)
+            if not ok:
+                # Fall through to SQLite's own busy handling; let the next waiter check
+                self.stats["timeouts"] += 1
+                self._cond.notify_all()
+                return False
+            self._take(me)
+            return True
+
+    def _take(self, owner: int) -> None:
+        self._owner, self._depth = owner, 1
+        self.stats["acquired"] += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._depth -= 1
+            if self._depth <= 0:
+                self._owner, self._depth = None, 0
+                self._cond.notify_all()
+
+
+def _write_queue() -> Optional[WriteQueue]:
+    if not has_app_context():
+        return None
+    tuning = current_app.extensions.get("sqlite_tuning")
+    return tuning.write_queue if tuning is not None else None
+
+
+def _enter_write(session) -> None:
+    if "write_slot" in session.info:
+        return
+    queue = _write_queue()
+    if queue is None:
+        return
+    session.info["write_slot"] = queue if queue.acquire() else None
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _before_flush(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        _enter_write(session)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _before_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _enter_write(orm_execute_state.session)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        queue = session.info.pop("write_slot", None)
+        if queue is not None:
+            queue.release()
+
+
+class SQLiteMaintenance:
+    """Background WAL checkpoint + ``PRAGMA optimize``, one thread per process."""
+
+    def __init__(self, app: Flask, interval: float, checkpoint_mode: str) -> None:
+        self.app = app
+        self.interval = interval
+        self.checkpoint_mode = checkpoint_mode
+        self.stats = {"runs": 0, "failed": 0, "last_checkpoint": None}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    def start(self) -> None:
+        """Start the thread once per process (safe to call repeatedly)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sqlite-maintenance", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def run_once(self) -> Optional[tuple]:
+        """Checkpoint the WAL and optimize; returns (busy, wal_pages, checkpointed)."""
+        try:
+            with self.app.app_context(), db.engine.connect() as conn:
+                result = conn.exec_driver_sql(f"PRAGMA wal_checkpoint({self.checkpoint_mode})").fetchone()
+                conn.exec_driver_sql("PRAGMA optimize")
+        except Exception as e:
+            self.stats["failed"] += 1
+            self.app.logger.warning("SQLite maintenance failed: %s", e)
+            return None
+        self.stats["runs"] += 1
+        self.stats["last_checkpoint"] = tuple(result) if result is not None else None
+        return self.stats["last_checkpoint"]
+
+
+class SQLiteTuning:
+    """What ``init_sqlite_tuning`` attached: ``app.extensions["sqlite_tuning"]``."""
+
+    def __init__(self, pragmas: list[str], write_queue: Optional[WriteQueue],
+                 maintenance: Optional[SQLiteMaintenance]) -> None:
+        self.pragmas = pragmas
+        self.write_queue = write_queue
+        self.maintenance = maintenance
+
+
+def init_sqlite_tuning(app: Flask) -> Optional[SQLiteTuning]:
+    """Apply the SQLite profile to the app's file-backed SQLite engines."""
+    if not app.config.get("SQLITE_TUNING", True):
+        return None
+    if not is_file_sqlite(app.config.get("SQLALCHEMY_DATABASE_URI", "")):
+        return None
+
+    pragmas = connection_pragmas(app)
+    with app.app_context():
+        engines = [e for e in db.engines.values() if is_file_sqlite(str(e.url))]
+    for engine in engines:
+        _apply_on_connect(engine, pragmas)
+
+    write_queue = None
+    if app.config.get("SQLITE_WRITE_QUEUE", True):
+        write_queue = WriteQueue(int(app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000)
+
+    maintenance = None
+    interval = float(app.config.get("SQLITE_MAINTENANCE_INTERVAL", 300))
+    if interval > 0:
+        mode = _choice(app, "SQLITE_CHECKPOINT_MODE", CHECKPOINT_MODES, "PASSIVE")
+        maintenance = SQLiteMaintenance(app, interval, mode)
+        if not app.testing:
+
+            @app.before_request
+            def _ensure_sqlite_maintenance():
+                maintenance.start()
+
+            atexit.register(maintenance.stop)
+
+    tuning = SQLiteTuning(pragmas, write_queue, maintenance)
+    app.extensions["sqlite_tuning"] = tuning
+    return tuning
+
+
+def _apply_on_connect(engine, pragmas: list[str]) -> None:
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
@@ -0,0 +1,83 @@
+# resume_site/startup.py
+"""
+Startup budget for ``create_app()``.
+
+The factory runs once per gunicorn worker (or once in the master with
+``--preload``), once per test and once per CLI script, so its cost is
+tracked per phase: ``StartupTimer.lap(name)`` closes the phase that ended
+at that point, and ``report()`` is logged at the end of the factory and
+kept in ``app.extensions["startup_timings"]``.
+
+Also here: the per-process memo of Config defaults and of which databases
+already had ``create_all()`` run, so repeated factories skip that work.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from functools import lru_cache
+
+
+class StartupTimer:
+    def __init__(self) -> None:
+        self.started = self._last = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def lap(self, name: str) -> float:
+        """Record the time since the previous lap as phase ``name`` (ms)."""
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.started) * 1000
+
+    def report(self) -> str:
+        parts = " ".join(f"{name}={ms:.1f}" for name, ms in self.phases.items())
+        return f"total={self.total_ms:.1f}ms {parts}"
+
+
+@lru_cache(maxsize=None)
+def config_defaults(config_class) -> dict:
+    """Uppercase attributes of a Config class, resolved once per process."""
+    return {key: getattr(config_class, key) for key in dir(config_class) if key.isupper()}
+
+
+_schema_ready: set = set()
+_schema_lock = threading.Lock()
+
+
+def _schema_key(uri: str):
+    """Identity of the database behind ``uri``; None when it can't be trusted
+    across factories (in-memory SQLite, or a file that doesn't exist yet)."""
+    if not uri.startswith("sqlite"):
+        return uri
+    path = uri.split("///", 1)[1] if "///" in uri else ""
+    if not path or path == ":memory:" or "mode=memory" in uri:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (uri, st.st_dev, st.st_ino)
+
+
+def create_all_once(app, db) -> bool:
+    """Run ``db.create_all()`` unless this process already did for the same
+    database; returns True if it ran."""
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    binds = repr(sorted((app.config.get("SQLALCHEMY_BINDS") or {}).items(), key=str))
+    key = _schema_key(uri)
+    with _schema_lock:
+        if key is not None and (key, binds) in _schema_ready:
+            return False
+        with app.app_context():
+            db.create_all()
+        key = _schema_key(uri)  # the file exists now
+        if key is not None:
+            _schema_ready.add((key, binds))
+    return True
@@ -0,0 +1,171 @@
+# resume_site/static_assets.py
+"""
+Fingerprinted, precompressed static assets.
+
+Build step (``scripts/build_static.py``) copies every file under ``static/``
+to ``static/dist/`` with a content hash in its name (``style.3f2a9c1e.css``),
+writes ``.gz`` (and ``.br`` when the optional ``brotli`` package is present)
+next to it when compression actually helps, and records everything in
+``static/dist/manifest.json``.
+
+At runtime, when the manifest exists:
+  * ``url_for('static', filename='style.css')`` emits the hashed URL, so no
+    more hand-bumped ``?v=`` query strings;
+  * hashed files are served with ``Cache-Control: immutable`` and the best
+    precompressed variant for the request's Accept-Encoding.
+Without a manifest (plain dev checkout) everything behaves as before.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask, request, send_from_directory
+
+from .page_cache import template_watcher
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_MAX_AGE = 31536000  # one year
+COMPRESSIBLE_TYPES = (
+    "text/", "application/javascript", "application/json", "application/xml",
+    "image/svg+xml", "application/pdf",
+)
+MIN_SAVINGS = 0.9  # keep a compressed variant only if it is <90% of the original
+
+
+def _hash_name(rel: Path, digest: str) -> Path:
+    return rel.with_name(f"{rel.stem}.{digest[:8]}{rel.suffix}")
+
+
+def _compressible(path: Path) -> bool:
+    typ, _ = mimetypes.guess_type(str(path))
+    return bool(typ) and typ.startswith(COMPRESSIBLE_TYPES)
+
+
+def build_static_assets(static_dir: str | os.PathLike) -> dict:
+    """Fingerprint and precompress everything under ``static_dir``; return the manifest."""
+    static_dir = Path(static_dir)
+    dist = static_dir / DIST_DIR
+    if dist.exists():
+        shutil.rmtree(dist)
+    dist.mkdir(parents=True)
+
+    files = {}
+    for src in sorted(static_dir.rglob("*")):
+        if not src.is_file() or dist in src.parents or src.name.startswith("."):
+            continue
+        rel = src.relative_to(static_dir)
+        data = src.read_bytes()
+        hashed = _hash_name(rel, hashlib.sha256(data).hexdigest())
+        target = dist / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+        encodings = []
+        if _compressible(src):
+            variants = {"gzip": (".gz", gzip.compress(data, compresslevel=9, mtime=0))}
+            if brotli is not None:
+                variants["br"] = (".br", brotli.compress(data, quality=11))
+            for encoding, (suffix, payload) in variants.items():
+                if len(payload) < len(data) * MIN_SAVINGS:
+                    target.with_name(target.name + suffix).write_bytes(payload)
+                    encodings.append(encoding)
+
+        files[rel.as_posix()] = {
+            "path": f"{DIST_DIR}/{hashed.as_posix()}",
+            "size": len(data),
+            "encodings": sorted(encodings, key=("br", "gzip").index),
+        }
+
+    manifest = {"files": files}
+    (dist / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+class StaticManifest:
+    def __init__(self, files: dict) -> None:
+        self.files = files
+        self.by_hashed = {entry["path"]: entry for entry in files.values()}
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Optional["StaticManifest"]:
+        try:
+            return cls(json.loads(Path(path).read_text())["files"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def hashed(self, filename: str) -> Optional[str]:
+        entry = self.files.get(filename)
+        return entry["path"] if entry else None
+
+
+def _pick_encoding(entry: dict) -> Optional[str]:
+    accepted = request.accept_encodings
+    for encoding in entry["encodings"]:  # ordered by preference: br, gzip
+        if accepted[encoding]:
+            return encoding
+    return None
+
+
+def init_static_assets(app: Flask) -> Optional[StaticManifest]:
+    """Load the build manifest (if any) and hook url_for + the static view."""
+    manifest_path = app.config.get("STATIC_MANIFEST") or os.path.join(
+        app.static_folder, DIST_DIR, MANIFEST_NAME
+    )
+    manifest = StaticManifest.load(manifest_path)
+    app.extensions["static_manifest"] = manifest
+    # Rendered pages embed hashed URLs, so a rebuilt manifest must invalidate them
+    template_watcher(app).watch_file(manifest_path)
+    if manifest is None:
+        return None
+    app.logger.info("Static manifest loaded: %s assets", len(manifest.files))
+
+    if not app.extensions.get("static_assets_hooked"):
+        app.extensions["static_assets_hooked"] = True
+        default_static_view = app.view_functions["static"]
+
+        @app.url_defaults
+        def _hashed_static_url(endpoint, values):
+            current = app.extensions.get("static_manifest")
+            if endpoint == "static" and current is not None:
+                hashed = current.hashed(values.get("filename", ""))
+                if hashed:
+                    values["filename"] = hashed
+                    values.pop("v", None)  # legacy manual cache-buster
+
+        def static_view(filename):
+            current = app.extensions.get("static_manifest")
+            entry = current.by_hashed.get(filename) if current else None
+            if entry is None:
+                return default_static_view(filename=filename)
+
+            encoding = _pick_encoding(entry)
+            suffix = {"br": ".br", "gzip": ".gz"}.get(encoding, "")
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            resp = send_from_directory(
+                app.static_folder, filename + suffix, mimetype=mimetype,
+                max_age=IMMUTABLE_MAX_AGE, conditional=True,
+            )
+            if encoding:
+                resp.headers["Content-Encoding"] = encoding
+            if entry["encodings"]:
+                resp.vary.add("Accept-Encoding")
+            resp.cache_control.public = True
+            resp.cache_control.immutable = True
+            return resp
+
+        app.view_functions["static"] = static_view
+
+    return manifest
@@ -0,0 +1,76 @@
+# resume_site/template_cache.py
+"""
+Eager template compilation and an on-disk Jinja bytecode cache.
+
+Jinja compiles a template the first time it is rendered, so without help
+every worker pays for ``base.html`` and the ``components/`` partials on
+its first few requests after a deploy. ``init_template_cache()`` compiles
+every template at start-up instead (names under TEMPLATE_WARMUP_EXCLUDE,
+i.e. ``_drafts/``, are skipped), and with TEMPLATE_BYTECODE_CACHE the
+compiled code is kept in TEMPLATE_CACHE_DIR, where other workers, later
+restarts and ``scripts/build_templates.py`` share it.
+
+Cache entries are keyed by template name and checked against a hash of the
+source (and the Python/Jinja version), so an edited template is recompiled
+rather than served stale; writes are atomic renames, safe across processes.
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+
+CACHE_PATTERN = "%s.jinja"
+
+
+def cache_dir(app: Flask) -> Path:
+    return Path(app.config.get("TEMPLATE_CACHE_DIR") or os.path.join(app.instance_path, "jinja_cache"))
+
+
+def warmable_templates(app: Flask) -> list[str]:
+    """Every template name except those under an excluded prefix."""
+    excluded = tuple(app.config.get("TEMPLATE_WARMUP_EXCLUDE", ("_drafts/",)))
+    return [name for name in app.jinja_env.list_templates() if not name.startswith(excluded)]
+
+
+def warm_templates(app: Flask) -> int:
+    """Compile (or load from the bytecode cache) every warmable template."""
+    compiled = 0
+    for name in warmable_templates(app):
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except Exception as exc:
+            app.logger.warning("Template warm-up skipped %s: %s", name, exc)
+    return compiled
+
+
+def attach_bytecode_cache(app: Flask) -> Optional[FileSystemBytecodeCache]:
+    """Point the app's Jinja environment at the on-disk cache (None if it can't be created)."""
+    directory = cache_dir(app)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        app.logger.warning("Template bytecode cache disabled: %s", exc)
+        return None
+    cache = FileSystemBytecodeCache(str(directory), CACHE_PATTERN)
+    app.jinja_env.bytecode_cache = cache
+    return cache
+
+
+def init_template_cache(app: Flask) -> dict:
+    """Attach the bytecode cache and warm templates, per Config; returns a summary."""
+    summary = {"bytecode_cache": False, "templates": 0}
+    if app.config.get("TEMPLATE_BYTECODE_CACHE"):
+        summary["bytecode_cache"] = attach_bytecode_cache(app) is not None
+    if app.config.get("TEMPLATE_WARMUP"):
+        started = time.perf_counter()
+        summary["templates"] = warm_templates(app)
+        summary["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        app.logger.debug("Templates warmed: %s in %.1fms", summary["templates"], summary["ms"])
+    app.extensions["template_cache"] = summary
+    return summary
@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 import re
-import mimetypes
-from pathlib import Path
 from typing import Optional, Tuple
 
 from flask import current_app
-from flask_mail import Message, Mail
+from flask_mail import Mail
+
+from .attachments import CachedAttachmentMessage, attachment_cache
+from .metrics import timed
 
 # --- Config validation helpers ---
 
@@ -20,7 +21,7 @@ def validate_config(app) -> bool:
     """
     missing = [k for k in REQUIRED_MAIL_CONFIG if not app.config.get(k)]
     if missing:
-        app.logger.warning(f"⚠️ Missing mail config keys: {', '.join(missing)}")
+        app.logger.warning("⚠️ Missing mail config keys: %s", ", ".join(missing))
         return False
     app.logger.info("All required mail configuration keys are present.")
     return True
@@ -33,11 +34,31 @@ def validate_email(email: str) -> bool:
     """Basic email format check using regex."""
     return bool(email and EMAIL_REGEX.match(email))
 
-# --- Helpers for attachments ---
+# --- Message construction ---
 
-def _guess_mimetype(path: Path) -> str:
-    typ, _ = mimetypes.guess_type(str(path))
-    return typ or "application/octet-stream"
+def build_message(
+    sender: str,
+    to_email: str,
+    subject: str,
+    body: str,
+    attachment_path: Optional[str] = None,
+) -> CachedAttachmentMessage:
+    """Build a message whose attachment body comes from the in-memory cache."""
+    msg = CachedAttachmentMessage(
+        subject=subject,
+        sender=sender,
+        recipients=[to_email],
+        body=body,
+    )
+
+    if attachment_path:
+        # Encoded payload comes from the in-memory cache (revalidated by stat)
+        cached = attachment_cache.get(attachment_path)
+        if cached is None:
+            current_app.logger.warning("Attachment not found: %s", attachment_path)
+        else:
+            msg.attach_cached(cached)
+    return msg
 
 # --- Email send wrapper ---
 
@@ -70,28 +91,11 @@ def send_email(
         if not default_sender:
             return False, "MAIL_DEFAULT_SENDER is not configured"
 
-        msg = Message(
-            subject=subject,
-            sender=default_sender,
-            recipients=[to_email],
-            body=body,
-        )
-
-        if attachment_path:
-            p = Path(attachment_path)
-            if not p.exists() or not p.is_file():
-                current_app.logger.warning(f"Attachment not found: {p}")
-            else:
-                mime = _guess_mimetype(p)
-                with p.open("rb") as fh:
-                    msg.attach(
-                        filename=p.name,
-                        content_type=mime,
-                        data=fh.read(),
-                    )
-
-        current_app.logger.info(f"📧 Sending email to: {to_email} from {default_sender}")
-        mail.send(msg)
+        msg = build_message(default_sender, to_email, subject, body, attachment_path)
+
+        current_app.logger.info("📧 Sending email to: %s from %s", to_email, default_sender)
+        with timed("smtp_send_seconds"):
+            mail.send(msg)
         return True, "OK"
 
     except Exception as e:
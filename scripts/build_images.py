@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Pre-generate responsive WebP/AVIF variants for static/images.
+
+Variants are otherwise generated on first request to /img/...; running this
+during deploy keeps that work off the request path. Requires Pillow.
+
+Usage:
+    python scripts/build_images.py
+    IMAGE_CACHE_DIR=/srv/image_cache python scripts/build_images.py
+"""
+
+import argparse
+import logging
+
+from resume_site import create_app
+from resume_site.images import load_pillow
+
+logger = logging.getLogger("build_images")
+
+def _ensure_logging():
+    # If the root logger has no handlers (invoked outside Flask), set a sane default.
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(name)s — %(levelname)s — %(message)s")
+
+def main():
+    _ensure_logging()
+
+    parser = argparse.ArgumentParser(description="Build responsive image variants.")
+    parser.add_argument("--cache-dir", help="Override IMAGE_CACHE_DIR.")
+    args = parser.parse_args()
+
+    if load_pillow() is None:
+        logger.error("Pillow is not installed; pages will fall back to the original images")
+        raise SystemExit(1)
+
+    overrides = {"IMAGE_CACHE_DIR": args.cache_dir} if args.cache_dir else None
+    app = create_app(overrides)
+    pipeline = app.extensions["images"]
+    if not pipeline.enabled:
+        logger.error("No requested image format is supported by this Pillow build")
+        raise SystemExit(1)
+
+    sources = {s.digest: s for s in pipeline._sources.values()}
+    written = pipeline.build_all()
+    logger.info(
+        f"✅ {len(pipeline._sources)} images ({len(sources)} unique), formats {pipeline.formats}: "
+        f"{written} variants written to {pipeline.cache_dir}"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Fingerprint and precompress static assets into static/dist/.
+
+Run during deploy (before the app starts); the app picks up
+static/dist/manifest.json at startup and serves hashed, immutable URLs.
+
+Usage:
+    python scripts/build_static.py
+    python scripts/build_static.py --static-dir path/to/static
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from resume_site.static_assets import DIST_DIR, MANIFEST_NAME, brotli, build_static_assets
+
+logger = logging.getLogger("build_static")
+
+DEFAULT_STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+def _ensure_logging():
+    # If the root logger has no handlers (invoked outside Flask), set a sane default.
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(name)s — %(levelname)s — %(message)s")
+
+def main():
+    _ensure_logging()
+
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed static assets.")
+    parser.add_argument("--static-dir", default=str(DEFAULT_STATIC_DIR), help="Static folder to process.")
+    args = parser.parse_args()
+
+    if brotli is None:
+        logger.info("brotli not installed; writing gzip variants only")
+
+    manifest = build_static_assets(args.static_dir)
+    original = compressed = 0
+    for name, entry in sorted(manifest["files"].items()):
+        original += entry["size"]
+        logger.info(f"  {name} -> {entry['path']} {entry['encodings'] or ''}")
+    for path in Path(args.static_dir, DIST_DIR).rglob("*.gz"):
+        compressed += path.stat().st_size
+    logger.info(
+        f"✅ {len(manifest['files'])} assets ({original:,} bytes) written to "
+        f"{Path(args.static_dir) / DIST_DIR / MANIFEST_NAME}; gzip variants total {compressed:,} bytes"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Prebuild the Jinja bytecode cache for every template (drafts excluded).
+
+Workers load compiled templates from TEMPLATE_CACHE_DIR instead of compiling
+them; running this during deploy means even the first worker skips that.
+
+Usage:
+    python scripts/build_templates.py
+    python scripts/build_templates.py --clear
+    TEMPLATE_CACHE_DIR=/srv/jinja_cache python scripts/build_templates.py
+"""
+
+import argparse
+import logging
+
+from resume_site import create_app
+from resume_site.template_cache import attach_bytecode_cache, warm_templates, warmable_templates
+
+logger = logging.getLogger("build_templates")
+
+def _ensure_logging():
+    # If the root logger has no handlers (invoked outside Flask), set a sane default.
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(name)s — %(levelname)s — %(message)s")
+
+def main():
+    _ensure_logging()
+
+    parser = argparse.ArgumentParser(description="Prebuild the Jinja template bytecode cache.")
+    parser.add_argument("--cache-dir", help="Override TEMPLATE_CACHE_DIR.")
+    parser.add_argument("--clear", action="store_true", help="Remove existing cache entries first.")
+    args = parser.parse_args()
+
+    overrides = {"TEMPLATE_WARMUP": False, "TEMPLATE_BYTECODE_CACHE": False}
+    if args.cache_dir:
+        overrides["TEMPLATE_CACHE_DIR"] = args.cache_dir
+    app = create_app(overrides)
+
+    cache = attach_bytecode_cache(app)
+    if cache is None:
+        raise SystemExit(1)
+    if args.clear:
+        cache.clear()
+
+    names = warmable_templates(app)
+    compiled = warm_templates(app)
+    if compiled != len(names):
+        logger.error("❌ %s of %s templates failed to compile", len(names) - compiled, len(names))
+        raise SystemExit(1)
+    logger.info("✅ %s templates compiled into %s", compiled, cache.directory)
+
+if __name__ == "__main__":
+    main()
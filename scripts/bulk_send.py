@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Re-send the current resume to every address in EmailRequest.
+
+Recipients are streamed from the table in id order, ``--chunk-size`` rows at a
+time, and sent over long-lived SMTP sessions (one per ``--concurrency`` worker)
+instead of a connection per message. Progress is checkpointed after each chunk,
+so an interrupted run picks up where it stopped; delivery is at-least-once for
+the chunk that was in flight.
+
+Usage:
+    python scripts/bulk_send.py --format pdf
+    python scripts/bulk_send.py --format word --rate 2 --concurrency 2
+    python scripts/bulk_send.py --restart          # ignore an existing checkpoint
+    python scripts/bulk_send.py --dry-run          # list recipients, send nothing
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from resume_site import create_app, db
+from resume_site.models import EmailRequest
+from resume_site.utils import build_message
+
+logger = logging.getLogger("bulk_send")
+
+DEFAULT_SUBJECT = "An updated copy of my resume"
+DEFAULT_BODY = (
+    "Hello {name},\n\nYou previously requested my resume. "
+    "Attached is the latest version.\n\nDon Fox"
+)
+RESUME_FILES = {"pdf": "Resume.v3.4.pdf", "word": "Resume.v3.4.docx"}
+
+
+def _ensure_logging():
+    # If the root logger has no handlers (invoked outside Flask), set a sane default.
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(name)s — %(levelname)s — %(message)s")
+
+
+class RateLimiter:
+    """Spaces sends evenly across all workers (``rate`` messages per second)."""
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._clock, self._sleep = clock, sleep
+        self._next = clock()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            self._sleep(delay)
+
+
+class Checkpoint:
+    """JSON progress file, replaced atomically after every completed chunk."""
+
+    def __init__(self, path, restart=False):
+        self.path = Path(path)
+        self.state = {"last_id": 0, "sent": 0, "failed": []}
+        if self.path.exists() and not restart:
+            self.state.update(json.loads(self.path.read_text()))
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2))
+        os.replace(tmp, self.path)
+
+
+def iter_recipient_chunks(after_id, chunk_size):
+    """Yield lists of (id, name, email) ordered by id, using keyset pagination."""
+    last_id = after_id
+    while True:
+        rows = (
+            db.session.query(EmailRequest.id, EmailRequest.name, EmailRequest.email)
+            .filter(EmailRequest.id > last_id, EmailRequest.email.isnot(None))
+            .order_by(EmailRequest.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _worker(app, jobs, results, limiter, stop, sender, subject, body, attachment_path):
+    """Send queued recipients, keeping one SMTP session open between messages.
+
+    A failed send drops the session (it may be half-closed); the next message
+    opens a fresh one. Once ``stop`` is set no further message is sent, so an
+    interrupted run sends nothing the checkpoint doesn't know about beyond the
+    messages already in flight.
+    """
+    with app.app_context():
+        conn = None
+        try:
+            while True:
+                job = jobs.get()
+                if job is None or stop.is_set():
+                    return
+                row_id, name, email = job
+                limiter.wait()
+                if stop.is_set():
+                    return
+                try:
+                    if conn is None:
+                        conn = app.extensions["mail"].connect().__enter__()
+                    msg = build_message(
+                        sender, email, subject, body.format(name=name or "there"), attachment_path
+                    )
+                    conn.send(msg)
+                    results.put((row_id, email, None))
+                except Exception as exc:
+                    results.put((row_id, email, str(exc)))
+                    if conn is not None:
+                        conn.__exit__(type(exc), exc, exc.__traceback__)
+                        conn = None
+        finally:
+            if conn is not None:
+                conn.__exit__(None, None, None)
+
+
+def _shutdown_workers(workers, jobs, stop):
+    """Stop the workers without sending what is still queued."""
+    stop.set()
+    while True:
+        try:
+            jobs.get_nowait()
+        except queue.Empty:
+            break
+    for _ in workers:
+        jobs.put(None)
+    for t in workers:
+        t.join()
+
+
+def bulk_send(args):
+    app = create_app({"MAIL_QUEUE_ENABLED": False, "MAIL_POOL_SIZE": args.concurrency})
+    checkpoint = Checkpoint(args.checkpoint, restart=args.restart)
+    attachment_path = os.path.join(app.static_folder, "files", RESUME_FILES[args.format])
+    sender = app.config.get("MAIL_DEFAULT_SENDER")
+    if not sender and not args.dry_run:
+        raise SystemExit("MAIL_DEFAULT_SENDER is not configured")
+
+    logger.info(
+        "Starting bulk send after id=%s (already sent=%s), rate=%s/s, concurrency=%s",
+        checkpoint.state["last_id"], checkpoint.state["sent"], args.rate, args.concurrency,
+    )
+
+    jobs, results = queue.Queue(maxsize=args.chunk_size), queue.Queue()
+    limiter = RateLimiter(args.rate)
+    stop = threading.Event()
+    workers = []
+    if not args.dry_run:
+        for _ in range(args.concurrency):
+            t = threading.Thread(
+                target=_worker,
+                args=(app, jobs, results, limiter, stop, sender, args.subject, args.body, attachment_path),
+                daemon=True,
+            )
+            t.start()
+            workers.append(t)
+
+    seen = set()
+    sent = failed = 0
+    started = time.monotonic()
+    try:
+        with app.app_context():
+            for chunk in iter_recipient_chunks(checkpoint.state["last_id"], args.chunk_size):
+                pending = 0
+                for row in chunk:
+                    key = row.email.strip().lower()
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if args.dry_run:
+                        print(f"{row.id}\t{row.email}")
+                        continue
+                    jobs.put((row.id, row.name, row.email))
+                    pending += 1
+
+                for _ in range(pending):
+                    row_id, email, error = results.get()
+                    if error:
+                        failed += 1
+                        checkpoint.state["failed"].append({"id": row_id, "email": email, "error": error})
+                        logger.warning("Send to %s failed: %s", email, error)
+                    else:
+                        sent += 1
+                        checkpoint.state["sent"] += 1
+
+                checkpoint.state["last_id"] = chunk[-1].id
+                if not args.dry_run:
+                    checkpoint.save()
+
+                elapsed = time.monotonic() - started
+                logger.info(
+                    "Checkpoint id=%s: sent=%s failed=%s (%.1f msg/s)",
+                    chunk[-1].id, sent, failed, sent / elapsed if elapsed else 0.0,
+                )
+    finally:
+        _shutdown_workers(workers, jobs, stop)
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        "Bulk send finished: sent=%s failed=%s in %.1fs (%.2f msg/s)",
+        sent, failed, elapsed, sent / elapsed if elapsed else 0.0,
+    )
+
+
+def main():
+    _ensure_logging()
+
+    parser = argparse.ArgumentParser(description="Re-send the resume to every EmailRequest address.")
+    parser.add_argument("--format", choices=sorted(RESUME_FILES), default="pdf", help="Resume format to attach.")
+    parser.add_argument("--subject", default=DEFAULT_SUBJECT, help="Subject line.")
+    parser.add_argument("--body", default=DEFAULT_BODY, help="Body template; {name} is substituted.")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Rows fetched (and checkpointed) per chunk.")
+    parser.add_argument("--rate", type=float, default=5.0, help="Max messages per second across all workers (0 = unlimited).")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of parallel SMTP sessions.")
+    parser.add_argument("--checkpoint", default="instance/bulk_send.checkpoint.json", help="Progress file.")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint.")
+    parser.add_argument("--dry-run", action="store_true", help="Print recipients without sending.")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    bulk_send(args)
+
+
+if __name__ == "__main__":
+    main()
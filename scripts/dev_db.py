@@ -5,13 +5,17 @@ Usage:
     python scripts/dev_db.py create
     python scripts/dev_db.py drop
     python scripts/dev_db.py reset
+    python scripts/dev_db.py migrate
+    DATABASE_REPLICA_URL=sqlite:///replica.db python scripts/dev_db.py replicate
 """
 
 import argparse
 import logging
+import sqlite3
 from pathlib import Path
 
 from resume_site import create_app, db
+from resume_site.migrations import migrate_email_request_dedupe
 
 logger = logging.getLogger("dev_db")
 
@@ -20,19 +24,22 @@ def _ensure_logging():
     if not logging.getLogger().handlers:
         logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(name)s — %(levelname)s — %(message)s")
 
+def _sqlite_path(instance_dir, uri):
+    """Filesystem path of a sqlite:/// URI (None for other backends)."""
+    if not uri.startswith("sqlite:///"):
+        return None
+    # sqlite:///relative_or_instance_path.db OR sqlite:////absolute_path.db
+    sqlite_path = Path(uri.replace("sqlite:///", "", 1))
+    if not sqlite_path.is_absolute():
+        # If relative, resolve relative to instance path
+        sqlite_path = instance_dir / sqlite_path
+    return sqlite_path
+
 def _db_paths_from_app(app):
     """Return (instance_dir, sqlite_path_or_none) for visibility/logging."""
     instance_dir = Path(app.instance_path)
     uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
-    sqlite_path = None
-    if uri.startswith("sqlite:///"):
-        # sqlite:///relative_or_instance_path.db OR sqlite:////absolute_path.db
-        raw = uri.replace("sqlite:///", "", 1)
-        sqlite_path = Path(raw)
-        if not sqlite_path.is_absolute():
-            # If relative, resolve relative to instance path
-            sqlite_path = instance_dir / sqlite_path
-    return instance_dir, sqlite_path, uri
+    return instance_dir, _sqlite_path(instance_dir, uri), uri
 
 def create_db():
     app = create_app()
@@ -72,11 +79,37 @@ def reset_db():
         else:
             logger.info(f"🔁 Database reset complete (URI={uri})")
 
+def migrate_db():
+    """Apply in-place schema upgrades (e.g. EmailRequest de-duplication) to an existing DB."""
+    app = create_app()
+    with app.app_context():
+        _, sqlite_path, uri = _db_paths_from_app(app)
+        removed = migrate_email_request_dedupe(db.engine)
+        db.create_all()  # any brand-new tables
+        logger.info(f"🛠️  Migration complete ({removed} duplicate EmailRequest rows merged). URI={uri}")
+
+def replicate_db():
+    """Copy the SQLite primary onto the SQLite replica (a point-in-time "replication"
+    for trying DATABASE_REPLICA_URL locally; rerun it to let the replica catch up)."""
+    app = create_app()
+    instance_dir, sqlite_path, uri = _db_paths_from_app(app)
+    replica_path = _sqlite_path(instance_dir, app.config.get("DATABASE_REPLICA_URL", ""))
+    if not sqlite_path or not replica_path:
+        logger.error("❌ replicate needs SQLite URLs for both DATABASE_URL and DATABASE_REPLICA_URL")
+        raise SystemExit(1)
+    src, dst = sqlite3.connect(sqlite_path), sqlite3.connect(replica_path)
+    try:
+        src.backup(dst)  # consistent snapshot, even while the app is writing
+    finally:
+        src.close()
+        dst.close()
+    logger.info(f"🪞 Replica refreshed: {sqlite_path} → {replica_path}")
+
 def main():
     _ensure_logging()
 
     parser = argparse.ArgumentParser(description="Manage the development database.")
-    parser.add_argument("action", choices=["create", "drop", "reset"], help="Action to perform.")
+    parser.add_argument("action", choices=["create", "drop", "reset", "migrate", "replicate"], help="Action to perform.")
     args = parser.parse_args()
 
     if args.action == "create":
@@ -85,6 +118,10 @@ def main():
         drop_db()
     elif args.action == "reset":
         reset_db()
+    elif args.action == "migrate":
+        migrate_db()
+    elif args.action == "replicate":
+        replicate_db()
 
 if __name__ == "__main__":
     main()
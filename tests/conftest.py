@@ -44,31 +44,60 @@ def test_db_path():
         pass
 
 
+@pytest.fixture(scope="session")
+def instance_dir(tmp_path_factory):
+    """Scratch stand-in for instance/, so caches the app writes don't land in the tree."""
+    return tmp_path_factory.mktemp("instance")
+
+
+@pytest.fixture
+def make_app(test_db_path, instance_dir):
+    """
+    Factory for Flask apps configured for testing; keyword arguments are
+    extra config applied before extensions and hooks are initialized.
+    """
+    def _make(**extra):
+        return _build_app(test_db_path, {
+            "TEMPLATE_CACHE_DIR": str(instance_dir / "jinja_cache"),
+            "METRICS_DIR": str(instance_dir / "metrics"),
+            **extra,
+        })
+    return _make
+
+
 @pytest.fixture
-def app(test_db_path, monkeypatch):
+def app(make_app):
     """
     Provides a Flask app configured for testing.
     """
+    yield make_app()
+
+
+def _build_app(test_db_path, extra):
     config_overrides = {
         "TESTING": True,
         "DEBUG": False,
         "SQLALCHEMY_DATABASE_URI": f"sqlite:///{test_db_path}",
         "SQLALCHEMY_TRACK_MODIFICATIONS": False,
         "MAIL_SUPPRESS_SEND": True,
+        "MAIL_QUEUE_ENABLED": False,  # send inline; queue tests opt in explicitly
+        "RATE_LIMIT_ENABLED": False,  # rate-limit tests opt in explicitly
         "MAIL_SERVER": "localhost",
         "MAIL_PORT": 8025,
         "MAIL_USE_TLS": False,
         "MAIL_USE_SSL": False,
         "MAIL_DEFAULT_SENDER": os.getenv("MAIL_DEFAULT_SENDER", "test@example.com"),
         "LOG_LEVEL": "DEBUG",
+        **extra,
     }
 
     # Build the Flask app
     if _create_app is not None:
         try:
-            flask_app = _create_app(testing=True, config_overrides=config_overrides)  # your create_app has no kwargs
+            flask_app = _create_app(testing=True, config_overrides=config_overrides)
         except TypeError:
-            flask_app = _create_app()
+            # create_app takes a plain dict of overrides, applied before extensions init
+            flask_app = _create_app(config_overrides)
             flask_app.config.update(config_overrides)
     elif _flask_app_instance is not None:
         flask_app = _flask_app_instance
@@ -96,7 +125,36 @@ def app(test_db_path, monkeypatch):
             except Exception:
                 pass
 
-    yield flask_app
+    return flask_app
+
+
+@pytest.fixture
+def smtp_sink():
+    """A local SMTP server (see smtp_sink.py); tune latency/faults per test."""
+    from smtp_sink import SMTPSink
+
+    sink = SMTPSink().start()
+    yield sink
+    sink.stop()
+
+
+@pytest.fixture
+def smtp_app(make_app, smtp_sink):
+    """
+    Factory for apps whose mail really goes over SMTP, to ``smtp_sink``
+    (pooled sessions, AUTH, no TLS) instead of being suppressed.
+    """
+    def _make(**extra):
+        return make_app(
+            MAIL_SUPPRESS_SEND=False,
+            MAIL_SERVER=smtp_sink.host,
+            MAIL_PORT=smtp_sink.port,
+            MAIL_USERNAME="tester",
+            MAIL_PASSWORD="secret",
+            MAIL_POOL_ACQUIRE_TIMEOUT=5,
+            **extra,
+        )
+    return _make
 
 
 @pytest.fixture
@@ -0,0 +1,300 @@
+# tests/smtp_sink.py
+"""
+A local SMTP server that accepts everything and keeps it in memory.
+
+Stands in for Brevo in tests and benchmarks so the real ``send_email()``
+path (smtplib, Flask-Mail, the connection pool) runs without the network.
+It speaks just enough ESMTP for smtplib: EHLO/HELO, AUTH PLAIN/LOGIN
+(any credentials), MAIL, RCPT, DATA, RSET, NOOP and QUIT; no STARTTLS, so
+configure the app with MAIL_USE_TLS=False.
+
+Provider behavior is simulated at end-of-DATA, where a real provider does
+its spam/virus checks and decides:
+
+- ``latency`` (seconds) delays every reply;
+- ``max_rate`` (messages/second, across all connections) throttles
+  acceptance, like a plan's send-rate limit;
+- faults answer ``451`` (``"4xx"``, transient), ``554`` (``"5xx"``,
+  permanent) or close the connection without a reply (``"drop"``). They are
+  scripted with ``inject()`` for deterministic tests, or drawn at random
+  with ``transient_rate`` / ``permanent_rate`` / ``drop_rate`` (``seed``
+  for repeatability);
+- ``drop_connections()`` closes every open session, as a provider's idle
+  timeout would.
+
+    with SMTPSink(latency=0.05) as sink:
+        sink.inject("4xx")  # the first message is deferred
+        ...
+        sink.wait_for(1)
+        assert sink.messages[0].rcpt_tos == ["someone@example.com"]
+
+Python 3.12 removed ``smtpd`` and aiosmtpd is not a dependency, hence
+this small threaded server on ``socketserver``.
+"""
+from __future__ import annotations
+
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+TRANSIENT, PERMANENT, DROP = "4xx", "5xx", "drop"
+FAULT_REPLIES = {
+    TRANSIENT: "451 4.3.0 Temporary failure, try again later",
+    PERMANENT: "554 5.7.1 Message rejected",
+}
+
+
+@dataclass
+class SinkMessage:
+    mail_from: str
+    rcpt_tos: list[str]
+    data: bytes
+    received_at: float = field(default_factory=time.time)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def readline(self) -> Optional[bytes]:
+        line = self.rfile.readline(65536)
+        return line if line else None
+
+    def handle(self) -> None:
+        sink = self.server.sink
+        sink._count("connections")
+        sink._track(self.connection)
+        try:
+            self._session(sink)
+        except OSError:
+            pass  # dropped by drop_connections() or by the client
+        finally:
+            sink._untrack(self.connection)
+
+    def _session(self, sink: "SMTPSink") -> None:
+        self.reply(f"220 {sink.hostname} ESMTP sink")
+        mail_from: Optional[str] = None
+        rcpt_tos: list[str] = []
+        while True:
+            line = self.readline()
+            if line is None:
+                return
+            command, _, arg = line.decode("utf-8", "replace").rstrip("\r\n").partition(" ")
+            verb = command.upper()
+            if verb == "EHLO":
+                self.reply(f"250-{sink.hostname}")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250-8BITMIME")
+                self.reply("250 SIZE 52428800")
+            elif verb == "HELO":
+                self.reply(f"250 {sink.hostname}")
+            elif verb == "AUTH":
+                if not self._auth(arg):
+                    return
+            elif verb == "MAIL":
+                mail_from, rcpt_tos = _address(arg), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                if mail_from is None:
+                    self.reply("503 Need MAIL first")
+                    continue
+                rcpt_tos.append(_address(arg))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                if not rcpt_tos:
+                    self.reply("503 Need RCPT first")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self._read_data()
+                if data is None:
+                    return
+                sink._throttle()
+                if sink.latency:
+                    time.sleep(sink.latency)
+                fault = sink._next_fault()
+                if fault == DROP:
+                    return  # no reply; the server closes the socket
+                if fault is not None:
+                    self.reply(FAULT_REPLIES[fault])
+                else:
+                    sink._accept(SinkMessage(mail_from or "", rcpt_tos, data))
+                    self.reply("250 OK queued")
+                mail_from, rcpt_tos = None, []
+            elif verb == "RSET":
+                mail_from, rcpt_tos = None, []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+    def _auth(self, arg: str) -> bool:
+        mechanism, _, initial = arg.partition(" ")
+        mechanism = mechanism.upper()
+        if mechanism == "PLAIN" and not initial:
+            self.reply("334 ")
+            if self.readline() is None:
+                return False
+        elif mechanism == "LOGIN":
+            prompts = ["334 VXNlcm5hbWU6", "334 UGFzc3dvcmQ6"]  # "Username:", "Password:"
+            for prompt in prompts[1:] if initial else prompts:
+                self.reply(prompt)
+                if self.readline() is None:
+                    return False
+        elif mechanism != "PLAIN":
+            self.reply("504 Unrecognized authentication type")
+            return True
+        self.reply("235 Authentication successful")
+        return True
+
+    def _read_data(self) -> Optional[bytes]:
+        lines = []
+        while True:
+            line = self.rfile.readline(1 << 20)
+            if not line:
+                return None
+            if line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+
+def _address(arg: str) -> str:
+    _, _, rest = arg.partition(":")
+    return rest.strip().split(" ", 1)[0].strip("<>")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, sink: "SMTPSink") -> None:
+        self.sink = sink
+        super().__init__(address, _SMTPHandler)
+
+
+class SMTPSink:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        max_rate: Optional[float] = None,
+        transient_rate: float = 0.0,
+        permanent_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.host = host
+        self.hostname = "smtp-sink.local"
+        self.latency = latency
+        self.max_rate = max_rate
+        self.rates = {TRANSIENT: transient_rate, PERMANENT: permanent_rate, DROP: drop_rate}
+        self.messages: list[SinkMessage] = []
+        self.stats = {"connections": 0, "messages": 0, TRANSIENT: 0, PERMANENT: 0, DROP: 0}
+        self._lock = threading.Condition()
+        self._faults: deque[str] = deque()
+        self._random = random.Random(seed)
+        self._next_slot = 0.0
+        self._open: set[socket.socket] = set()
+        self._server = _Server((host, port), self)
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += n
+
+    def _accept(self, message: SinkMessage) -> None:
+        with self._lock:
+            self.messages.append(message)
+            self.stats["messages"] += 1
+            self._lock.notify_all()
+
+    # --- fault injection ---
+
+    def inject(self, *faults: str) -> None:
+        """Apply ``faults`` ("4xx", "5xx", "drop") to the next messages, in order."""
+        for fault in faults:
+            if fault not in self.rates:
+                raise ValueError(f"unknown fault {fault!r}")
+        with self._lock:
+            self._faults.extend(faults)
+
+    def _next_fault(self) -> Optional[str]:
+        with self._lock:
+            fault = self._faults.popleft() if self._faults else None
+            if fault is None:
+                roll = self._random.random()
+                for kind, rate in self.rates.items():
+                    if roll < rate:
+                        fault = kind
+                        break
+                    roll -= rate
+            if fault is not None:
+                self.stats[fault] += 1
+            return fault
+
+    def _throttle(self) -> None:
+        if not self.max_rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.max_rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _track(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._open.add(sock)
+
+    def _untrack(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._open.discard(sock)
+
+    def drop_connections(self) -> int:
+        """Close every open session from the server side; returns how many."""
+        with self._lock:
+            sockets = list(self._open)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        return len(sockets)
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        """Block until ``count`` messages have arrived; False on timeout."""
+        with self._lock:
+            return self._lock.wait_for(lambda: len(self.messages) >= count, timeout)
+
+    def start(self) -> "SMTPSink":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="smtp-sink", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self.drop_connections()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self) -> "SMTPSink":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+ADMIN_URL = "/secret-email-view-98347"
+
+
+@pytest.fixture
+def seeded(app):
+    """Five 'pager-' rows one day apart, newest last."""
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+
+    with app.app_context():
+        EmailRequest.query.filter(EmailRequest.email.like("pager-%")).delete(
+            synchronize_session=False
+        )
+        base = datetime(2025, 1, 1)
+        for i in range(5):
+            db.session.add(EmailRequest(
+                name=f"Pager {i}", email=f"pager-{i}@example.com",
+                timestamp=base + timedelta(days=i),
+            ))
+        db.session.commit()
+
+
+def _auth(**params):
+    return {"password": os.environ["ADMIN_PASSWORD"], **params}
+
+
+def test_admin_requires_password(client):
+    assert client.get(ADMIN_URL).status_code == 401
+
+
+def test_admin_keyset_pagination_walks_all_rows(client, seeded):
+    from resume_site.admin_queries import page_email_requests
+
+    seen, cursor = [], None
+    with client.application.test_request_context():
+        while True:
+            args = {"email": "pager-", "limit": "2"}
+            if cursor:
+                args["cursor"] = cursor
+            rows, cursor = page_email_requests(args)
+            seen.extend(r.email for r in rows)
+            if not cursor:
+                break
+    assert seen == [f"pager-{i}@example.com" for i in range(4, -1, -1)]
+
+    resp = client.get(ADMIN_URL, query_string=_auth(email="pager-", limit=2))
+    assert resp.status_code == 200
+    assert b"pager-4@example.com" in resp.data and b"pager-2@example.com" not in resp.data
+    assert b"Next page" in resp.data
+
+
+def test_admin_page_query_is_an_index_range(client, seeded):
+    from sqlalchemy import text
+
+    from resume_site.admin_queries import page_email_requests, page_select
+    from resume_site.extensions import db
+
+    with client.application.test_request_context():
+        _, cursor = page_email_requests({"limit": "2"})
+        stmt = page_select({"cursor": cursor}, 2)
+        sql = stmt.compile(db.engine, compile_kwargs={"literal_binds": True})
+        plan = " | ".join(row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "USING INDEX ix_EmailRequest_timestamp_id (timestamp<?)" in plan
+    assert "TEMP B-TREE" not in plan  # rows come out in listing order, no sort
+
+
+def test_admin_date_filter_and_bad_cursor(client, seeded):
+    resp = client.get(
+        ADMIN_URL, query_string=_auth(email="pager-", since="2025-01-02", until="2025-01-03")
+    )
+    assert b"pager-1@example.com" in resp.data and b"pager-2@example.com" in resp.data
+    assert b"pager-0@example.com" not in resp.data and b"pager-3@example.com" not in resp.data
+
+    assert client.get(ADMIN_URL, query_string=_auth(cursor="!!bogus")).status_code == 400
+
+
+def test_admin_streamed_exports(client, seeded):
+    resp = client.get(ADMIN_URL, query_string=_auth(email="pager-", export="csv"))
+    assert resp.is_streamed
+    assert resp.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(resp.get_data(as_text=True))))
+    assert rows[0][:3] == ["id", "name", "email"]
+    assert len(rows) == 6
+
+    resp = client.get(ADMIN_URL, query_string=_auth(email="pager-", export="ndjson"))
+    records = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r["email"] for r in records][0] == "pager-4@example.com"
+    assert len(records) == 5
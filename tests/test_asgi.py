@@ -0,0 +1,147 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from resume_site.asgi import build_environ, wrap_app
+
+
+def _scope(method, path, query=b"", headers=()):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "query_string": query,
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def _request(bridge, method, path, body=b"", query=b"", headers=()):
+    incoming = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0) if incoming else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await bridge(_scope(method, path, query, headers), receive, send)
+    start = sent[0]
+    assert start["type"] == "http.response.start"
+    assert sent[-1]["type"] == "http.response.body" and not sent[-1].get("more_body")
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def _form(email):
+    return (
+        f"name=Async+Reader&email={email}&format=pdf".encode(),
+        [(b"content-type", b"application/x-www-form-urlencoded")],
+    )
+
+
+def test_get_through_the_bridge(app):
+    bridge = wrap_app(app)
+    status, headers, body = asyncio.run(_request(bridge, "GET", "/"))
+    assert status == 200
+    assert headers[b"content-type"].startswith(b"text/html")
+    assert b"<html" in body.lower()
+    assert b"x-request-id" in headers
+
+
+def test_oversized_body_is_rejected(make_app):
+    bridge = wrap_app(make_app(ASGI_MAX_BODY=10))
+    status, _, _ = asyncio.run(_request(bridge, "POST", "/resume", b"x" * 11))
+    assert status == 413
+
+
+def test_resume_post_hands_mail_to_the_event_loop(smtp_app, smtp_sink):
+    smtp_sink.latency = 0.5  # a slow provider
+    bridge = wrap_app(smtp_app(MAIL_QUEUE_ENABLED=False))
+    body, headers = _form("async@example.com")
+
+    async def scenario():
+        started = time.perf_counter()
+        status, _, _ = await _request(bridge, "POST", "/resume", body, headers=headers)
+        elapsed = time.perf_counter() - started
+        await bridge.mailer.drain()
+        return status, elapsed
+
+    status, elapsed = asyncio.run(scenario())
+    assert status == 200
+    assert elapsed < 0.5  # the response did not wait for SMTP
+    assert smtp_sink.wait_for(1)
+    assert smtp_sink.messages[0].rcpt_tos == ["async@example.com"]
+    assert bridge.mailer.stats == {"submitted": 1, "sent": 1, "failed": 0}
+
+
+def test_aiosmtplib_backend_sends_on_the_loop(smtp_app, monkeypatch):
+    import resume_site.asgi as asgi_mod
+
+    calls = []
+
+    async def fake_send(message, **kwargs):
+        calls.append((message, kwargs))
+
+    monkeypatch.setattr(asgi_mod, "aiosmtplib", SimpleNamespace(send=fake_send))
+    bridge = wrap_app(smtp_app(MAIL_QUEUE_ENABLED=False))
+    assert bridge.mailer.use_aiosmtplib and bridge.mailer.executor is None
+    body, headers = _form("aio@example.com")
+
+    async def scenario():
+        await _request(bridge, "POST", "/resume", body, headers=headers)
+        await bridge.mailer.drain()
+
+    asyncio.run(scenario())
+    (message, kwargs), = calls
+    assert kwargs["recipients"] == ["aio@example.com"]
+    assert kwargs["start_tls"] is False and kwargs["username"] == "tester"
+    assert b"Subject: Your Requested Resume" in message
+
+
+def test_lifespan_binds_and_drains_the_mailer(app):
+    bridge = wrap_app(app)
+    incoming = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent, running = [], []
+
+    async def receive():
+        running.append(bridge.mailer.running)
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(bridge({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert running == [False, True]
+    assert not bridge.mailer.running
+
+
+def test_without_the_bridge_resume_sends_synchronously(app, client, monkeypatch):
+    import resume_site.routes as routes_mod
+
+    sent = []
+    monkeypatch.setattr(routes_mod, "send_email", lambda *a: sent.append(a[1]) or (True, "OK"))
+    client.post("/resume", data={"name": "Sync", "email": "sync@example.com", "format": "pdf"})
+    assert "async_mail" not in app.extensions
+    assert sent == ["sync@example.com"]
+
+
+def test_build_environ_maps_scope_to_wsgi():
+    scope = _scope(
+        "POST", "/app/resume", b"a=1",
+        headers=[(b"content-type", b"text/plain"), (b"accept", b"a"), (b"accept", b"b")],
+    )
+    scope["root_path"] = "/app"
+    environ = build_environ(scope, b"hello")
+    assert environ["SCRIPT_NAME"] == "/app" and environ["PATH_INFO"] == "/resume"
+    assert environ["QUERY_STRING"] == "a=1"
+    assert environ["CONTENT_TYPE"] == "text/plain" and environ["CONTENT_LENGTH"] == "5"
+    assert environ["HTTP_ACCEPT"] == "a,b"
+    assert environ["REMOTE_ADDR"] == "127.0.0.1"
+    assert environ["wsgi.input"].read() == b"hello"
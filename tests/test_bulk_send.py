@@ -0,0 +1,115 @@
+import importlib.util
+import queue
+import threading
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "bulk_send.py"
+
+
+@pytest.fixture(scope="module")
+def bulk_send():
+    spec = importlib.util.spec_from_file_location("bulk_send", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_spaces_sends(bulk_send):
+    clock = FakeClock()
+    limiter = bulk_send.RateLimiter(4, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        limiter.wait()
+    assert clock.sleeps == [0.25, 0.25]
+
+    clock.now += 10  # idle time is not banked as a burst
+    limiter.wait()
+    limiter.wait()
+    assert clock.sleeps == [0.25, 0.25, 0.25]
+
+
+def test_rate_limiter_without_rate_never_sleeps(bulk_send):
+    clock = FakeClock()
+    limiter = bulk_send.RateLimiter(0, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.wait()
+    assert clock.sleeps == []
+
+
+def test_checkpoint_resumes_unless_restarted(bulk_send, tmp_path):
+    path = tmp_path / "state" / "bulk.json"
+    checkpoint = bulk_send.Checkpoint(path)
+    assert checkpoint.state == {"last_id": 0, "sent": 0, "failed": []}
+    checkpoint.state.update(last_id=42, sent=40)
+    checkpoint.state["failed"].append({"id": 7, "email": "x@example.com", "error": "550"})
+    checkpoint.save()
+    assert not path.with_suffix(".json.tmp").exists()
+
+    resumed = bulk_send.Checkpoint(path)
+    assert resumed.state["last_id"] == 42 and resumed.state["sent"] == 40
+    assert resumed.state["failed"][0]["id"] == 7
+    assert bulk_send.Checkpoint(path, restart=True).state["last_id"] == 0
+
+
+def test_recipient_chunks_page_by_id(bulk_send, app):
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+
+    with app.app_context():
+        for n in range(5):
+            db.session.add(EmailRequest(name=f"Bulk {n}", email=f"bulk-{n}@example.com"))
+        db.session.add(EmailRequest(name="No address", email=None))
+        db.session.commit()
+        expected = [
+            r.id for r in EmailRequest.query.filter(EmailRequest.email.isnot(None)).order_by(EmailRequest.id)
+        ]
+        after = expected[-5] - 1
+
+        chunks = list(bulk_send.iter_recipient_chunks(after, 2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert [row.id for c in chunks for row in c] == expected[-5:]
+        assert [row.email for row in chunks[0]] == ["bulk-0@example.com", "bulk-1@example.com"]
+        assert list(bulk_send.iter_recipient_chunks(expected[-1], 2)) == []
+
+
+def test_shutdown_drops_queued_jobs(bulk_send, app):
+    entered, release = threading.Event(), threading.Event()
+
+    class BlockingLimiter:
+        def wait(self):
+            entered.set()
+            release.wait(5)
+
+    jobs, results, stop = queue.Queue(), queue.Queue(), threading.Event()
+    for n in range(5):
+        jobs.put((n, "Queued", f"queued-{n}@example.com"))
+    worker = threading.Thread(
+        target=bulk_send._worker,
+        args=(app, jobs, results, BlockingLimiter(), stop, "me@example.com", "s", "b", None),
+    )
+    worker.start()
+    assert entered.wait(5)  # first job taken, waiting for its send slot
+
+    shutdown = threading.Thread(target=bulk_send._shutdown_workers, args=([worker], jobs, stop))
+    shutdown.start()
+    stop.wait(5)
+    release.set()
+    shutdown.join(5)
+
+    assert not worker.is_alive()
+    assert results.empty()  # neither the in-flight job nor the queued ones were sent
+    assert all(job is None for job in list(jobs.queue))  # at most the unused sentinel
@@ -0,0 +1,62 @@
+import os
+
+
+def test_etag_and_last_modified_then_304(client):
+    first = client.get("/books")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    assert first.headers["Cache-Control"] == "public, max-age=3600"
+
+    resp = client.get("/books", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert resp.headers["ETag"] == etag
+
+    resp = client.get("/books", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert resp.status_code == 304
+
+
+def test_304_short_circuits_before_rendering(client, monkeypatch):
+    import resume_site.routes as routes_mod
+
+    etag = client.get("/references").headers["ETag"]
+
+    def boom(*a, **kw):
+        raise AssertionError("view should not render on a validator match")
+
+    monkeypatch.setattr(routes_mod, "render_template", boom)
+    resp = client.get("/references", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+
+def test_stale_etag_gets_full_response(client):
+    resp = client.get("/", headers={"If-None-Match": '"not-the-current-etag"'})
+    assert resp.status_code == 200
+    assert resp.data
+
+
+def test_admin_listing_is_no_store(client):
+    resp = client.get(
+        "/secret-email-view-98347", query_string={"password": os.environ["ADMIN_PASSWORD"]}
+    )
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in resp.headers
+
+
+def test_query_strings_share_one_registry_entry(app, client):
+    registry = app.extensions["etag_registry"]
+    etag = client.get("/books").headers["ETag"]
+    for i in range(5):
+        assert client.get(f"/books?x={i}").headers["ETag"] == etag
+    assert len(registry) == 1
+
+
+def test_etag_registry_is_bounded():
+    from resume_site.conditional import ETagRegistry
+
+    registry = ETagRegistry(max_entries=2)
+    for path in ("/a", "/b", "/c"):
+        registry.set(1, path, path)
+    assert len(registry) == 2 and registry.get(1, "/a") is None
+    assert registry.get(1, "/c") == "/c"
@@ -0,0 +1,37 @@
+def test_engine_options_for_postgres_and_sqlite():
+    from config import build_engine_options
+
+    pg = build_engine_options("postgresql://user:pw@db.example.com/site")
+    assert pg["pool_pre_ping"] is True
+    assert pg["pool_size"] >= 8
+    assert "statement_timeout" in pg["connect_args"]["options"]
+
+    lite = build_engine_options("sqlite:///dev.db")
+    assert lite["pool_pre_ping"] is True
+    assert "options" not in lite["connect_args"]
+
+    assert "pool_size" not in build_engine_options("sqlite:///:memory:")
+
+
+# --- POST /resume no longer pings the database with SELECT 1 ---
+def test_resume_post_skips_select_1(app, client, monkeypatch):
+    from sqlalchemy import event
+    import resume_site.routes as routes_mod
+    from resume_site.extensions import db
+
+    monkeypatch.setattr(routes_mod, "send_email", lambda *a: (True, "OK"))
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement.strip().upper())
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        client.post("/resume", data={"name": "Ping", "email": "ping@example.com"})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements, "expected the request to hit the database"
+    assert "SELECT 1" not in statements
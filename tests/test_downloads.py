@@ -0,0 +1,68 @@
+from resume_site.attachments import attachment_cache
+from resume_site.models import ResumeDownload
+
+
+def _downloads(app, **filters):
+    app.extensions["download_recorder"].flush()
+    with app.app_context():
+        return ResumeDownload.query.filter_by(**filters).count()
+
+
+def test_download_serves_file_with_precomputed_etag(app, client):
+    before = _downloads(app, filename="Resume.v3.4.pdf", status_code=200)
+    resp = client.get("/resume/download/pdf")
+    data = resp.get_data()
+    resp.close()
+
+    entry = attachment_cache.get(f"{app.static_folder}/files/Resume.v3.4.pdf")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/pdf"
+    assert "attachment" in resp.headers["Content-Disposition"]
+    assert resp.headers["Accept-Ranges"] == "bytes"
+    assert resp.get_etag()[0] == entry.etag
+    assert len(data) == entry.size
+    assert _downloads(app, filename="Resume.v3.4.pdf", status_code=200) == before + 1
+
+
+def test_download_supports_range_and_if_range(app, client):
+    entry = attachment_cache.get(f"{app.static_folder}/files/Resume.v3.4.pdf")
+    with open(entry.path, "rb") as fh:
+        head = fh.read(100)
+
+    resp = client.get(
+        "/resume/download/pdf",
+        headers={"Range": "bytes=0-99", "If-Range": f'"{entry.etag}"'},
+    )
+    assert resp.status_code == 206
+    assert resp.get_data() == head
+    assert resp.headers["Content-Range"] == f"bytes 0-99/{entry.size}"
+    resp.close()
+
+    # Stale validator: the whole file is sent again
+    resp = client.get(
+        "/resume/download/pdf", headers={"Range": "bytes=0-99", "If-Range": '"stale"'}
+    )
+    assert resp.status_code == 200
+    resp.close()
+
+
+def test_download_not_modified_is_not_recorded(app, client):
+    entry = attachment_cache.get(f"{app.static_folder}/files/Resume.v3.4.docx")
+    before = _downloads(app, filename="Resume.v3.4.docx")
+    resp = client.get("/resume/download/docx", headers={"If-None-Match": f'"{entry.etag}"'})
+    resp.close()
+    assert resp.status_code == 304
+    assert _downloads(app, filename="Resume.v3.4.docx") == before
+
+
+def test_download_unknown_format_is_404(client):
+    assert client.get("/resume/download/exe").status_code == 404
+
+
+def test_download_events_are_dropped_not_blocking_when_queue_full(app):
+    recorder = app.extensions["download_recorder"]
+    recorder._queue.maxsize = 1
+    recorder.record(filename="a", status_code=200)
+    recorder.record(filename="b", status_code=200)
+    assert recorder.stats["dropped"] == 1
+    assert recorder.flush() == 1
@@ -104,4 +104,47 @@ def test_email_with_pdf_attachment(app, monkeypatch):
     assert "Resume PDF" in m.subject
     assert "donfox1@mac.com" in m.recipients
     filenames = [att.filename for att in getattr(m, "attachments", [])]
-    assert any(name and name.endswith(".pdf") for name in filenames)
\ No newline at end of file
+    assert any(name and name.endswith(".pdf") for name in filenames)
+
+# --- Unit: attachment payloads are cached and revalidated by mtime/size ---
+
+def test_attachment_cache_reuses_and_invalidates(tmp_path):
+    import os
+    from resume_site.attachments import AttachmentCache
+
+    path = tmp_path / "Resume.test.pdf"
+    path.write_bytes(b"%PDF-1.4\n% version one\n")
+    cache = AttachmentCache()
+
+    first = cache.get(path)
+    assert first.content_type == "application/pdf"
+    assert cache.get(path) is first  # unchanged file => same encoded payload
+
+    path.write_bytes(b"%PDF-1.4\n% version two, longer\n")
+    os.utime(path, ns=(first.mtime_ns + 1_000_000, first.mtime_ns + 1_000_000))
+    second = cache.get(path)
+    assert second is not first
+    assert cache.get(tmp_path / "missing.pdf") is None
+
+
+def test_cached_attachment_round_trips_in_message(app, tmp_path):
+    import email
+    from resume_site.attachments import AttachmentCache, CachedAttachmentMessage
+
+    data = bytes(range(256)) * 40
+    path = tmp_path / "Resume.test.pdf"
+    path.write_bytes(data)
+    entry = AttachmentCache().get(path)
+
+    with app.app_context():
+        msg = CachedAttachmentMessage(
+            subject="Resume", sender="me@example.com", recipients=["you@example.com"], body="Hi"
+        )
+        msg.attach_cached(entry)
+        raw = msg.as_bytes()
+
+    parsed = email.message_from_bytes(raw)
+    parts = [p for p in parsed.walk() if p.get_filename() == "Resume.test.pdf"]
+    assert len(parts) == 1
+    assert parts[0].get_payload(decode=True) == data
+    assert "X-Resume-Site-Attachment" not in parts[0]
@@ -0,0 +1,68 @@
+import shutil
+
+import pytest
+
+from resume_site.images import ImagePipeline
+
+
+def test_picture_falls_back_to_plain_img_without_variants(app, monkeypatch):
+    pipeline = app.extensions["images"]
+    monkeypatch.setattr(pipeline, "formats", [])
+    with app.test_request_context():
+        html = pipeline.picture("images/don.jpg", alt="Don <Fox>", class_="home-photo")
+    assert html.startswith("<img ") and "<picture>" not in html
+    assert 'alt="Don &lt;Fox&gt;"' in html
+    assert 'class="home-photo"' in html
+    assert "images/don.jpg" in html
+
+
+def test_pages_render_with_picture_helper(client):
+    assert b"images/don.jpg" in client.get("/").data
+    assert b"Recommendation_Dave_Schultz.jpg" in client.get("/references").data
+
+
+def test_unknown_variant_is_404(client):
+    assert client.get("/img/0000000000000000/320.webp").status_code == 404
+
+
+def test_identical_sources_share_a_digest(app, monkeypatch):
+    pipeline = ImagePipeline(app)
+    monkeypatch.setattr("resume_site.images.load_pillow", lambda: None)  # hashing only, no size probe
+    monkeypatch.setattr("resume_site.images._probe_cache", {})
+    pipeline.scan()
+    a = pipeline.source("images/Recommendation_Dave_Schultz.jpg")
+    b = pipeline.source("images/Recomendation_Dave_Schultz.jpg")
+    assert a is b
+    assert pipeline.source("images/don.jpg").digest != a.digest
+
+
+def test_variants_are_generated_and_cached(app, tmp_path):
+    pytest.importorskip("PIL")
+    app.config["IMAGE_CACHE_DIR"] = str(tmp_path / "cache")
+    app.config["IMAGE_FORMATS"] = ("webp",)
+    static = tmp_path / "static"
+    (static / "images").mkdir(parents=True)
+    shutil.copy(f"{app.static_folder}/images/don.jpg", static / "images" / "don.jpg")
+    shutil.copy(f"{app.static_folder}/images/don.jpg", static / "images" / "copy.jpg")
+    original = app.static_folder
+    app.static_folder = str(static)
+    try:
+        pipeline = ImagePipeline(app)
+        if not pipeline.enabled:
+            pytest.skip("Pillow built without WebP support")
+        pipeline.scan()
+        source = pipeline.source("images/don.jpg")
+        assert pipeline.source("images/copy.jpg") is source
+
+        written = pipeline.build_all()
+        assert written == len(pipeline.widths_for(source))
+        assert pipeline.build_all() == 0  # already cached
+
+        with app.test_request_context():
+            html = pipeline.picture("images/don.jpg", alt="Don")
+        assert html.startswith("<picture>") and 'type="image/webp"' in html
+        # don.jpg is narrower than every configured width: only its own width is offered
+        assert f"/img/{source.digest}/{source.width}.webp {source.width}w" in html
+        assert f'width="{source.width}"' in html
+    finally:
+        app.static_folder = original
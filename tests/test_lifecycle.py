@@ -0,0 +1,85 @@
+import importlib.util
+import json
+import multiprocessing
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+from resume_site.lifecycle import after_fork, on_server_start, warm_app
+
+
+def test_warm_app_reports_summary(app):
+    summary = warm_app(app, freeze=False)
+    assert summary["templates"] > 0
+    assert "frozen_objects" not in summary
+    assert app.extensions["warm_summary"] is summary
+
+
+def test_after_fork_resets_metrics_and_smtp_pool(app, monkeypatch):
+    metrics = app.extensions["metrics"]
+    metrics.registry.inc("http_requests_total", {"endpoint": "main.index"})
+    pool = app.extensions["mail"].pool
+    pool._in_use = 1  # a lease the parent was holding at fork time
+
+    after_fork(app)
+
+    assert metrics.registry.snapshot()["counters"] == {}
+    assert pool.stats()["in_use"] == 0
+
+
+def test_server_start_clears_previous_metrics(app, tmp_path):
+    metrics = app.extensions["metrics"]
+    metrics.dir = tmp_path
+    (tmp_path / "12345.json").write_text(json.dumps({"counters": {}}))
+    on_server_start(app)
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_gunicorn_hooks_accept_the_asgi_bridge(test_db_path, tmp_path):
+    from resume_site.asgi import create_asgi_app
+
+    spec = importlib.util.spec_from_file_location(
+        "gunicorn_conf", Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+    )
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+
+    bridge = create_asgi_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{test_db_path}",
+        "METRICS_DIR": str(tmp_path / "metrics"),
+        "TEMPLATE_CACHE_DIR": str(tmp_path / "jinja_cache"),
+        "RATE_LIMIT_ENABLED": False,
+    })
+    server = SimpleNamespace(
+        cfg=SimpleNamespace(preload_app=True), app=SimpleNamespace(wsgi=lambda: bridge)
+    )
+    metrics = bridge.app.extensions["metrics"]
+    metrics.registry.inc("http_requests_total", {"endpoint": "main.index"})
+
+    conf.on_starting(server)
+    conf.post_fork(server, worker=None)
+
+    assert metrics.registry.snapshot()["counters"] == {}
+
+
+def _child_snapshot(app, conn):
+    after_fork(app)
+    app.extensions["metrics"].registry.inc("http_requests_total", {"endpoint": "child"})
+    conn.send(app.extensions["metrics"].registry.snapshot()["counters"])
+    conn.close()
+
+
+def test_forked_worker_does_not_repeat_parent_counts(app):
+    app.extensions["metrics"].registry.inc("http_requests_total", {"endpoint": "parent"})
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe()
+    child = ctx.Process(target=_child_snapshot, args=(app, child_conn))
+    child.start()
+    counters = parent_conn.recv()
+    child.join(30)
+
+    labels = [json.loads(k) for k in counters["http_requests_total"]]
+    assert labels == [[["endpoint", "child"]]]
+    assert child.exitcode == 0
+    assert os.getpid() != child.pid
@@ -0,0 +1,135 @@
+import logging
+import multiprocessing
+import os
+
+from resume_site.log_queue import DroppingQueueHandler, SafeRotatingFileHandler, start_log_queue
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+
+
+def test_queue_mode_formats_on_listener_and_flushes_on_stop():
+    sink = _ListHandler()
+    sink.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    log_queue = start_log_queue([sink], maxsize=100)
+
+    logger = logging.getLogger("test_log_queue.flush")
+    logger.propagate = False
+    logger.addHandler(log_queue.handler)
+    try:
+        for i in range(20):
+            logger.warning("record %s", i)
+    finally:
+        log_queue.stop()
+        logger.removeHandler(log_queue.handler)
+
+    assert sink.records == [f"WARNING record {i}" for i in range(20)]
+    assert log_queue.dropped == 0
+
+
+def test_full_queue_drops_and_counts():
+    import queue
+
+    handler = DroppingQueueHandler(queue.Queue(2))
+    logger = logging.getLogger("test_log_queue.drop")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.error("record %s", i)  # no listener draining: fills up
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def _write_lines(path, worker, count):
+    handler = SafeRotatingFileHandler(path, maxBytes=2000, backupCount=50)
+    logger = logging.getLogger(f"test_log_queue.worker{worker}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    for i in range(count):
+        logger.warning("worker=%s line=%04d", worker, i)
+    handler.close()
+
+
+def test_rotating_handler_is_safe_across_processes(tmp_path):
+    path = str(tmp_path / "app.log")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_lines, args=(path, w, 200)) for w in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+
+    lines = []
+    for name in os.listdir(tmp_path):
+        if name.startswith("app.log") and not name.endswith(".lock"):
+            with open(tmp_path / name) as fh:
+                lines.extend(fh.read().splitlines())
+            assert os.path.getsize(tmp_path / name) <= 2000
+    # Nothing lost or interleaved despite concurrent rollovers
+    assert len(lines) == 600
+    assert all(line.startswith("worker=") for line in lines)
+
+
+def _log_from_child(log_queue, logger_name):
+    logging.getLogger(logger_name).warning("from child pid=%s", os.getpid())
+    log_queue.stop()
+
+
+def test_rotating_handler_formats_each_record_once(tmp_path):
+    calls = []
+
+    class CountingFormatter(logging.Formatter):
+        def format(self, record):
+            calls.append(record.getMessage())
+            return super().format(record)
+
+    path = tmp_path / "app.log"
+    handler = SafeRotatingFileHandler(str(path), maxBytes=100, backupCount=2)
+    handler.setFormatter(CountingFormatter("%(message)s"))
+    logger = logging.getLogger("test_log_queue.once")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(10):
+            logger.warning("line %02d %s", i, "x" * 20)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    assert len(calls) == 10
+    assert os.path.exists(f"{path}.1")
+    assert os.path.getsize(path) <= 100
+
+
+def test_listener_restarts_in_forked_child(tmp_path):
+    path = str(tmp_path / "app.log")
+    file_handler = SafeRotatingFileHandler(path)
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = start_log_queue([file_handler])
+    logger = logging.getLogger("test_log_queue.fork")
+    logger.propagate = False
+    logger.addHandler(log_queue.handler)
+    try:
+        child = multiprocessing.get_context("fork").Process(
+            target=_log_from_child, args=(log_queue, logger.name)
+        )
+        child.start()
+        child.join(30)
+        logger.warning("from parent")
+    finally:
+        log_queue.stop()
+        logger.removeHandler(log_queue.handler)
+        file_handler.close()
+
+    with open(path) as fh:
+        lines = fh.read().splitlines()
+    assert "from parent" in lines
+    assert f"from child pid={child.pid}" in lines
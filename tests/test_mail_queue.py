@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+
+def _queue_rows(app):
+    from resume_site.models import OutboundEmail
+    with app.app_context():
+        return OutboundEmail.query.order_by(OutboundEmail.id).all()
+
+
+# --- POST /resume enqueues instead of sending inline ---
+def test_resume_post_enqueues_when_queue_enabled(app, client, monkeypatch):
+    import resume_site.routes as routes_mod
+
+    app.config["MAIL_QUEUE_ENABLED"] = True
+
+    def fail_send(*args, **kwargs):
+        raise AssertionError("send_email must not run on the request thread")
+
+    monkeypatch.setattr(routes_mod, "send_email", fail_send, raising=True)
+
+    before = len(_queue_rows(app))
+    payload = {"name": "Queue Tester", "email": "queue@example.com", "format": "pdf"}
+    resp = client.post("/resume", data=payload)
+    assert resp.status_code == 200
+
+    rows = _queue_rows(app)
+    assert len(rows) == before + 1
+    job = rows[-1]
+    assert job.to_email == "queue@example.com"
+    assert job.status == "pending"
+    assert job.attachment_path.endswith("Resume.v3.4.pdf")
+
+
+# --- Dispatcher delivers due rows and marks them sent ---
+def test_dispatcher_delivers_pending_message(app, monkeypatch):
+    import resume_site.mail_queue as mq
+    from resume_site.models import OutboundEmail
+
+    sent = []
+    monkeypatch.setattr(
+        mq, "send_email", lambda mail, to, subj, body, path: sent.append(to) or (True, "OK")
+    )
+
+    with app.test_request_context():
+        job = mq.enqueue_email("deliver@example.com", "Subject", "Body")
+        job_id = job.id
+
+    dispatcher = app.extensions["mail_queue"]
+    while dispatcher.process_once():
+        pass
+
+    assert "deliver@example.com" in sent
+    with app.app_context():
+        job = OutboundEmail.query.get(job_id)
+        assert job.status == "sent"
+        assert job.attempts == 1
+        assert job.sent_at is not None
+
+
+# --- Failures are retried with backoff, then marked failed ---
+def test_dispatcher_retries_then_fails(app, monkeypatch):
+    import resume_site.mail_queue as mq
+    from resume_site.models import OutboundEmail, utcnow_naive
+
+    app.config["MAIL_QUEUE_MAX_ATTEMPTS"] = 2
+    monkeypatch.setattr(mq, "send_email", lambda *a: (False, "relay unavailable"))
+    dispatcher = mq.MailDispatcher(app)
+
+    with app.test_request_context():
+        job_id = mq.enqueue_email("retry@example.com", "Subject", "Body").id
+
+    while dispatcher.process_once():
+        pass
+    with app.app_context():
+        job = OutboundEmail.query.get(job_id)
+        assert job.status == "pending"
+        assert job.last_error == "relay unavailable"
+        assert job.next_attempt_at > utcnow_naive()
+        # Make it due again without waiting out the backoff
+        job.next_attempt_at = utcnow_naive() - timedelta(seconds=1)
+        OutboundEmail.query.session.commit()
+
+    while dispatcher.process_once():
+        pass
+    with app.app_context():
+        job = OutboundEmail.query.get(job_id)
+        assert job.status == "failed"
+        assert job.attempts == 2
+
+
+def test_missing_queue_table_falls_back_to_inline_send(tmp_path, monkeypatch):
+    from resume_site import create_app
+    import resume_site.routes as routes_mod
+
+    # A production-style app (no create_all) on a database without the queue table
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/prod.db",
+        "MAIL_QUEUE_ENABLED": True,
+        "MAIL_SUPPRESS_SEND": True,
+        "RATE_LIMIT_ENABLED": False,
+        "LOG_QUEUE_ENABLED": False,
+        "TEMPLATE_CACHE_DIR": str(tmp_path / "jinja_cache"),
+        "METRICS_DIR": str(tmp_path / "metrics"),
+        "LOG_DIR": str(tmp_path / "logs"),
+        "LOG_FILE": str(tmp_path / "logs" / "app.log"),
+        "DEBUG": False,
+    })
+    assert app.config["MAIL_QUEUE_ENABLED"] is False
+
+    with app.app_context():
+        from resume_site.extensions import db
+        from resume_site.models import EmailRequest
+        EmailRequest.__table__.create(db.engine)  # the pre-queue schema
+    sent = []
+    monkeypatch.setattr(routes_mod, "send_email", lambda *a: sent.append(a[1]) or (True, "OK"))
+    app.test_client().post("/resume", data={"name": "P", "email": "prod@example.com", "format": "pdf"})
+    assert sent == ["prod@example.com"]
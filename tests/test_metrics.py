@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+from resume_site.metrics import MetricsRegistry, render_prometheus
+
+
+@pytest.fixture
+def metrics(app, tmp_path):
+    collector = app.extensions["metrics"]
+    collector.dir = tmp_path / "metrics"
+    return collector
+
+
+def _scrape(client):
+    resp = client.get(f"/metrics?password={os.environ['ADMIN_PASSWORD']}")
+    assert resp.status_code == 200
+    return resp.get_data(as_text=True)
+
+
+def test_registry_merges_thread_shards():
+    import threading
+
+    registry = MetricsRegistry(buckets=(0.1, 1.0, float("inf")))
+
+    def work():
+        for _ in range(100):
+            registry.inc("hits", {"endpoint": "x"})
+            registry.observe("lat", {"endpoint": "x"}, 0.05)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snap = registry.snapshot()
+    assert list(snap["counters"]["hits"].values()) == [400]
+    row = list(snap["histograms"]["lat"].values())[0]
+    assert row[:3] == [400, 0, 0]
+    assert row[-1] == pytest.approx(20.0)
+
+
+def test_shards_of_exited_threads_are_folded():
+    import threading
+
+    registry = MetricsRegistry()
+
+    def request():
+        registry.inc("hits", {"endpoint": "x"})
+        registry.observe("lat", {"endpoint": "x"}, 0.05)
+
+    for _ in range(20):  # like a thread-per-request server
+        batch = [threading.Thread(target=request) for _ in range(10)]
+        for t in batch:
+            t.start()
+        for t in batch:
+            t.join()
+        assert len(registry._shards) <= 11  # this batch (+ the test thread, later)
+
+    registry.inc("hits", {"endpoint": "x"})  # still-live thread keeps its own shard
+    snap = registry.snapshot()
+    assert len(registry._shards) == 1
+    assert list(snap["counters"]["hits"].values()) == [201]
+    assert list(snap["histograms"]["lat"].values())[0][-1] == pytest.approx(10.0)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry(buckets=(0.1, 1.0, float("inf")))
+    registry.observe("lat", {"endpoint": "x"}, 0.05)
+    registry.observe("lat", {"endpoint": "x"}, 0.5)
+    text = render_prometheus({"histograms": registry.snapshot()["histograms"]}, registry.buckets)
+    assert 'resume_site_lat_bucket{endpoint="x",le="0.1"} 1' in text
+    assert 'resume_site_lat_bucket{endpoint="x",le="1.0"} 2' in text
+    assert 'resume_site_lat_bucket{endpoint="x",le="+Inf"} 2' in text
+    assert 'resume_site_lat_count{endpoint="x"} 2' in text
+
+
+def test_metrics_endpoint_requires_auth(client, metrics):
+    assert client.get("/metrics").status_code == 401
+
+
+def test_requests_db_and_smtp_are_recorded(client, metrics, monkeypatch):
+    client.get("/books")
+    client.get("/books")
+    client.post("/resume", data={"name": "M", "email": "metrics@example.com", "format": "pdf"})
+
+    text = _scrape(client)
+    assert 'resume_site_http_requests_total{endpoint="main.books",method="GET",status="200"} 2' in text
+    assert 'resume_site_http_request_duration_seconds_count{endpoint="main.books"} 2' in text
+    assert 'resume_site_db_seconds_count{endpoint="main.resume"} 1' in text
+    assert 'resume_site_smtp_send_seconds_count{outcome="ok"} 1' in text
+    assert 'resume_site_db_pool_connections{bind="default"' in text
+
+
+def test_scrape_sums_other_worker_files(client, metrics):
+    client.get("/books")
+    other = metrics.process_snapshot()
+    other["pid"] = 999999999  # not alive: its gauges are ignored, counters still count
+    metrics.dir.mkdir(parents=True, exist_ok=True)
+    (metrics.dir / "999999999.json").write_text(json.dumps(other))
+
+    text = _scrape(client)
+    assert 'resume_site_http_requests_total{endpoint="main.books",method="GET",status="200"} 2' in text
+    assert 'pid="999999999"' not in text
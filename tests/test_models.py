@@ -0,0 +1,92 @@
+# --- EmailRequest.record: one row per normalized address, counted ---
+def test_record_upserts_by_normalized_email(app):
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+
+    with app.app_context():
+        assert EmailRequest.record("First", "Upsert@Example.com ", "10.0.0.1") == 1
+        db.session.commit()
+        assert EmailRequest.record("Second", "upsert@example.com", "10.0.0.2") == 2
+        db.session.commit()
+
+        rows = EmailRequest.query.filter_by(email="upsert@example.com").all()
+        assert len(rows) == 1
+        assert rows[0].request_count == 2
+        assert rows[0].name == "Second"
+        assert rows[0].ip_address == "10.0.0.2"
+
+
+def test_repeat_resume_post_flashes_already_requested(client, monkeypatch):
+    import resume_site.routes as routes_mod
+    monkeypatch.setattr(routes_mod, "send_email", lambda *a: (True, "OK"))
+
+    payload = {"name": "Repeat", "email": "repeat@example.com", "format": "pdf"}
+    client.post("/resume", data=payload)
+    resp = client.post("/resume", data=payload)
+    assert b"already requested" in resp.data
+
+
+# --- Migration merges pre-existing duplicate rows ---
+def test_migration_merges_duplicates(tmp_path):
+    from sqlalchemy import create_engine, text
+    from resume_site.migrations import migrate_email_request_dedupe
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE "EmailRequest" (id INTEGER PRIMARY KEY, name VARCHAR(128) NOT NULL, '
+            "email VARCHAR(128), ip_address VARCHAR(64), timestamp DATETIME)"
+        ))
+        conn.execute(text(
+            'INSERT INTO "EmailRequest" (name, email, ip_address, timestamp) VALUES '
+            "('A', 'dup@example.com', '1.1.1.1', '2024-01-01 00:00:00'),"
+            "('B', 'Dup@Example.com', '2.2.2.2', '2024-06-01 00:00:00'),"
+            "('C', 'solo@example.com', '3.3.3.3', '2024-02-01 00:00:00')"
+        ))
+
+    assert migrate_email_request_dedupe(engine) == 1
+    assert migrate_email_request_dedupe(engine) == 0  # idempotent
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            'SELECT email, name, request_count FROM "EmailRequest" ORDER BY id'
+        )).all()
+    assert rows == [("dup@example.com", "B", 2), ("solo@example.com", "C", 1)]
+
+
+def test_migration_backfills_timestamp_and_makes_it_not_null(tmp_path):
+    import pytest
+    from sqlalchemy import create_engine, inspect, text
+    from sqlalchemy.exc import IntegrityError
+    from resume_site.migrations import migrate_email_request_dedupe
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE "EmailRequest" (id INTEGER PRIMARY KEY, name VARCHAR(128) NOT NULL, '
+            "email VARCHAR(128), ip_address VARCHAR(64), timestamp DATETIME, "
+            "request_count INTEGER NOT NULL DEFAULT 1, last_requested_at DATETIME)"
+        ))
+        conn.execute(text(
+            'INSERT INTO "EmailRequest" (name, email, timestamp, last_requested_at) VALUES '
+            "('A', 'a@example.com', '2024-01-01 00:00:00', '2024-01-01 00:00:00'),"
+            "('B', 'b@example.com', NULL, '2024-03-01 00:00:00'),"
+            "('C', 'c@example.com', NULL, NULL)"
+        ))
+
+    migrate_email_request_dedupe(engine)
+    migrate_email_request_dedupe(engine)  # idempotent
+
+    insp = inspect(engine)
+    timestamp = next(c for c in insp.get_columns("EmailRequest") if c["name"] == "timestamp")
+    assert timestamp["nullable"] is False
+    assert {ix["name"] for ix in insp.get_indexes("EmailRequest")} == {
+        "ux_EmailRequest_email", "ix_EmailRequest_timestamp_id",
+    }
+    with engine.connect() as conn:
+        rows = conn.execute(text('SELECT name, timestamp FROM "EmailRequest" ORDER BY id')).all()
+        assert [(name, ts[:10]) for name, ts in rows] == [
+            ("A", "2024-01-01"), ("B", "2024-03-01"), ("C", "1970-01-01"),
+        ]
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(text('INSERT INTO "EmailRequest" (name, email) VALUES (\'D\', \'d@example.com\')'))
@@ -0,0 +1,102 @@
+import os
+import time
+
+
+def test_content_page_served_from_cache(client):
+    first = client.get("/books")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+
+    second = client.get("/books")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.data == first.data
+
+
+def test_template_change_invalidates(app, client):
+    app.extensions["template_watcher"].check_interval = 0
+    client.get("/references")
+    assert client.get("/references").headers["X-Cache"] == "HIT"
+
+    template = os.path.join(app.root_path, "templates", "references.html")
+    st = os.stat(template)
+    try:
+        os.utime(template, ns=(st.st_atime_ns, time.time_ns() + 10**9))
+        assert client.get("/references").headers["X-Cache"] == "MISS"
+    finally:
+        os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_session_with_flashes_bypasses_cache(client):
+    client.get("/")
+    assert client.get("/").headers["X-Cache"] == "HIT"
+
+    with client.session_transaction() as sess:
+        sess["_flashes"] = [("info", "Hello from flash")]
+    resp = client.get("/")
+    assert "X-Cache" not in resp.headers
+    assert b"Hello from flash" in resp.data
+
+
+def test_lru_bounded_by_bytes():
+    from resume_site.page_cache import MemoryLRU
+
+    lru = MemoryLRU(max_entries=10, max_bytes=10)
+    lru.set("a", (200, [], b"12345"))
+    lru.set("b", (200, [], b"12345"))
+    lru.get("a")  # a is now most recently used
+    lru.set("c", (200, [], b"123"))
+    assert lru.get("b") is None
+    assert lru.get("a") is not None and lru.get("c") is not None
+
+
+def test_filesystem_store_shared_between_caches(tmp_path):
+    from resume_site.page_cache import FilesystemStore
+
+    writer, reader = FilesystemStore(tmp_path, ttl=60), FilesystemStore(tmp_path, ttl=60)
+    writer.set("k", (200, [("Content-Type", "text/html")], b"<html></html>"))
+    assert reader.get("k") == (200, [("Content-Type", "text/html")], b"<html></html>")
+
+
+def test_query_strings_do_not_add_cache_entries(app, client):
+    cache = app.extensions["page_cache"]
+    client.get("/books")
+    for i in range(5):
+        assert client.get(f"/books?junk={i}").headers["X-Cache"] == "HIT"
+    assert len(cache.local) == 1
+
+
+def test_filesystem_store_sweeps_expired_and_excess_files(tmp_path):
+    import os
+    import time
+
+    from resume_site.page_cache import FilesystemStore
+
+    store = FilesystemStore(tmp_path, ttl=60, max_entries=3)
+    for i in range(5):
+        store.set(f"k{i}", (200, [], b"x"))
+        os.utime(store._path(f"k{i}"), (time.time() - 10 + i,) * 2)
+    old = time.time() - 120
+    os.utime(store._path("k4"), (old, old))  # expired
+
+    assert store.sweep() == 2  # k4 (expired) and k0 (oldest beyond max_entries)
+    assert len(store) == 3
+    assert store.get("k1") and store.get("k3") and not store.get("k0")
+
+
+def test_filesystem_store_never_unpickles(tmp_path):
+    import pickle
+
+    from resume_site.page_cache import FilesystemStore, decode_page, encode_page
+
+    class Exploit:
+        def __reduce__(self):
+            return (os.system, ("touch " + str(tmp_path / "pwned"),))
+
+    store = FilesystemStore(tmp_path, ttl=60)
+    store._path("evil").write_bytes(pickle.dumps(Exploit()))
+    store._path("junk").write_bytes(b"\x00\x00\x00\xffnot json")
+    assert store.get("evil") is None and store.get("junk") is None
+    assert not (tmp_path / "pwned").exists()
+
+    entry = (200, [("Content-Encoding", "gzip"), ("Vary", "Accept-Encoding")], b"\x1f\x8b\x00\xff")
+    assert decode_page(encode_page(entry)) == entry
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def profiling_app(make_app, tmp_path):
+    return make_app(PROFILING_ENABLED=True, PROFILE_DIR=str(tmp_path / "profiles"), PROFILE_KEEP=2)
+
+
+def _password():
+    return os.environ["ADMIN_PASSWORD"]
+
+
+def test_no_hooks_when_disabled(app):
+    assert "profile_store" not in app.extensions
+    resp = app.test_client().get(f"/books?profile=1&password={_password()}")
+    assert "X-Profile-Id" not in resp.headers
+
+
+def test_profile_requires_password(profiling_app):
+    client = profiling_app.test_client()
+    assert "X-Profile-Id" not in client.get("/books?profile=1").headers
+    assert "X-Profile-Id" not in client.get("/books?profile=1&password=wrong").headers
+
+
+def test_profiled_request_is_stored_listed_and_downloadable(profiling_app):
+    client = profiling_app.test_client()
+    resp = client.get("/books", headers={"X-Profile": "1", "X-Admin-Password": _password()})
+    name = resp.headers["X-Profile-Id"]
+
+    listing = client.get(f"/admin/profiles?password={_password()}")
+    assert name.encode() in listing.data
+
+    summary = client.get(f"/admin/profiles/{name}?password={_password()}&format=text")
+    assert b"cumulative" in summary.data
+
+    download = client.get(f"/admin/profiles/{name}?password={_password()}")
+    assert download.status_code == 200
+    assert download.headers["Content-Disposition"].startswith("attachment")
+    download.close()
+
+    assert client.get(f"/admin/profiles/{name}").status_code == 401
+    assert client.get(f"/admin/profiles/..%2Fsecret?password={_password()}").status_code == 404
+
+
+def test_ring_keeps_newest_profiles(profiling_app):
+    client = profiling_app.test_client()
+    names = [
+        client.get(f"/books?profile=1&password={_password()}").headers["X-Profile-Id"]
+        for _ in range(3)
+    ]
+    kept = [p["name"] for p in profiling_app.extensions["profile_store"].list()]
+    assert kept == names[:0:-1]  # newest first, oldest pruned
@@ -0,0 +1,109 @@
+import pytest
+
+from resume_site.rate_limit import MemoryBucketStore, SQLiteBucketStore, parse_rate
+
+
+def test_parse_rate():
+    assert parse_rate("5/minute") == (5.0, 5 / 60)
+    assert parse_rate("3/hours") == (3.0, 3 / 3600)
+    with pytest.raises(ValueError):
+        parse_rate("5/fortnight")
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: MemoryBucketStore(),
+    lambda tmp_path: SQLiteBucketStore(str(tmp_path / "buckets.sqlite3")),
+])
+def test_bucket_allows_burst_then_refills(make_store, tmp_path):
+    store = make_store(tmp_path)
+    capacity, rate = parse_rate("2/minute")
+    assert store.take("k", capacity, rate, 1000.0) == 0
+    assert store.take("k", capacity, rate, 1000.0) == 0
+    assert store.take("k", capacity, rate, 1000.0) == pytest.approx(30.0)
+    assert store.take("k", capacity, rate, 1030.0) == 0  # one token back after 30 s
+    assert store.take("other", capacity, rate, 1030.0) == 0
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "buckets.sqlite3")
+    capacity, rate = parse_rate("1/hour")
+    assert SQLiteBucketStore(path).take("k", capacity, rate, 1000.0) == 0
+    assert SQLiteBucketStore(path).take("k", capacity, rate, 1000.0) > 0
+
+
+@pytest.fixture
+def limited_app(make_app):
+    return make_app(
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMIT_BACKEND="memory",
+        RATE_LIMITS={"main.resume": {"methods": ("POST",), "ip": "3/minute", "email": "1/hour"}},
+    )
+
+
+def test_resume_post_rejected_before_db_and_smtp(limited_app, monkeypatch):
+    import resume_site.routes as routes_mod
+    from resume_site.models import EmailRequest
+
+    sent, recorded = [], []
+    monkeypatch.setattr(routes_mod, "send_email", lambda *a: sent.append(a) or (True, "OK"))
+    original_record = EmailRequest.record.__func__
+    monkeypatch.setattr(
+        EmailRequest, "record",
+        classmethod(lambda cls, *a: recorded.append(a) or original_record(cls, *a)),
+    )
+
+    client = limited_app.test_client()
+    payload = {"name": "Bot", "email": "bot@example.com", "format": "pdf"}
+    assert client.post("/resume", data=payload).status_code == 200
+    resp = client.post("/resume", data={**payload, "email": " BOT@example.com"})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) > 0
+    assert len(sent) == 1 and len(recorded) == 1
+
+    # The rejected request took no IP token; different addresses from the same
+    # IP use up the remaining two, then hit the per-IP bucket
+    assert client.post("/resume", data={**payload, "email": "a@example.com"}).status_code == 200
+    assert client.post("/resume", data={**payload, "email": "b@example.com"}).status_code == 200
+    assert client.post("/resume", data={**payload, "email": "c@example.com"}).status_code == 429
+
+    stats = limited_app.extensions["rate_limiter"].stats()
+    assert stats["shed"] == {"main.resume:email": 1, "main.resume:ip": 1}
+    assert stats["shed_total"] == 2
+
+
+def test_get_resume_is_not_limited(limited_app):
+    client = limited_app.test_client()
+    for _ in range(5):
+        assert client.get("/resume").status_code == 200
+
+
+def test_rejected_request_consumes_no_tokens():
+    store = MemoryBucketStore()
+    one, rate = parse_rate("1/hour")
+    assert store.take_all([("ip", 5, rate), ("email", one, rate)], 1000.0) == [0, 0]
+    waits = store.take_all([("ip", 5, rate), ("email", one, rate)], 1000.0)
+    assert waits[0] == 0 and waits[1] > 0
+    assert store._buckets["ip"][0] == 4  # only the first request's token is gone
+
+
+def _post_via_router(app, visitor, email):
+    return app.test_client().post(
+        "/resume",
+        data={"name": "V", "email": email, "format": "pdf"},
+        headers={"X-Forwarded-For": visitor},
+        environ_base={"REMOTE_ADDR": "10.0.0.1"},  # the router
+    ).status_code
+
+
+@pytest.mark.parametrize("proxies, second_visitor", [(1, 200), (0, 429)])
+def test_forwarded_client_address_with_trusted_proxies(make_app, proxies, second_visitor):
+    app = make_app(
+        TRUSTED_PROXIES=proxies,
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMIT_BACKEND="memory",
+        RATE_LIMITS={"main.resume": {"methods": ("POST",), "ip": "1/minute"}},
+    )
+    assert _post_via_router(app, "203.0.113.5", "v1@example.com") == 200
+    assert _post_via_router(app, "203.0.113.5", "v2@example.com") == 429
+    # Another visitor behind the same router: its own bucket only if the proxy is trusted
+    assert _post_via_router(app, "198.51.100.7", "v3@example.com") == second_visitor
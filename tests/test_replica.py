@@ -0,0 +1,116 @@
+import os
+import sqlite3
+
+import pytest
+
+ADMIN_URL = "/secret-email-view-98347"
+
+
+def _auth():
+    return {"password": os.environ["ADMIN_PASSWORD"], "email": "replica-"}
+
+
+def _replicate(primary_path, replica_path):
+    src, dst = sqlite3.connect(primary_path), sqlite3.connect(replica_path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+
+
+def _add_row(path, email):
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO EmailRequest (name, email, timestamp, request_count) "
+            "VALUES ('Replica', ?, '2025-01-01 00:00:00', 1)",
+            (email,),
+        )
+
+
+@pytest.fixture
+def replica_app(make_app, test_db_path, tmp_path):
+    """Factory for apps whose replica is a copy of the test DB taken at creation."""
+    replica_path = str(tmp_path / "replica.db")
+
+    def _make(**extra):
+        app = make_app(DATABASE_REPLICA_URL=f"sqlite:///{replica_path}", **extra)
+        with sqlite3.connect(test_db_path) as conn:
+            conn.execute("DELETE FROM EmailRequest WHERE email LIKE 'replica-%'")
+        _replicate(test_db_path, replica_path)
+        return app
+
+    _make.replica_path = replica_path
+    return _make
+
+
+def test_admin_listing_reads_from_the_replica(replica_app):
+    app = replica_app()
+    _add_row(replica_app.replica_path, "replica-only@example.com")
+
+    resp = app.test_client().get(ADMIN_URL, query_string=_auth())
+    assert resp.status_code == 200
+    assert b"replica-only@example.com" in resp.data
+    assert app.extensions["db_replica"].stats["replica_reads"] >= 1
+
+
+def test_writes_and_other_endpoints_use_the_primary(replica_app, test_db_path):
+    app = replica_app()
+    resp = app.test_client().post(
+        "/resume", data={"name": "W", "email": "replica-write@example.com", "format": "pdf"}
+    )
+    assert resp.status_code == 200
+    with sqlite3.connect(test_db_path) as conn:
+        assert conn.execute(
+            "SELECT count(*) FROM EmailRequest WHERE email = 'replica-write@example.com'"
+        ).fetchone() == (1,)
+    with sqlite3.connect(replica_app.replica_path) as conn:
+        assert conn.execute(
+            "SELECT count(*) FROM EmailRequest WHERE email = 'replica-write@example.com'"
+        ).fetchone() == (0,)
+    assert app.extensions["db_replica"].stats["replica_reads"] == 0
+
+
+def test_reads_after_a_write_stay_on_the_primary(replica_app):
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+    from resume_site.replica import use_replica
+
+    app = replica_app()
+    with app.app_context(), use_replica():
+        assert EmailRequest.query.filter_by(email="replica-raw@example.com").first() is None
+        EmailRequest.record("RaW", "replica-raw@example.com", None)
+        db.session.commit()
+        assert EmailRequest.query.filter_by(email="replica-raw@example.com").one().name == "RaW"
+    assert app.extensions["db_replica"].stats["replica_reads"] == 1
+
+
+def test_lagging_replica_is_skipped(replica_app):
+    app = replica_app(REPLICA_LAG_QUERY="SELECT 60")
+    _add_row(replica_app.replica_path, "replica-only@example.com")
+
+    resp = app.test_client().get(ADMIN_URL, query_string=_auth())
+    assert b"replica-only@example.com" not in resp.data
+    monitor = app.extensions["db_replica"]
+    assert monitor.lag == 60 and monitor.stats["replica_reads"] == 0
+
+
+def test_unreachable_replica_falls_back_to_the_primary(make_app, tmp_path):
+    app = make_app(DATABASE_REPLICA_URL=f"sqlite:///{tmp_path}/missing/replica.db")
+    resp = app.test_client().get(ADMIN_URL, query_string=_auth())
+    assert resp.status_code == 200
+    monitor = app.extensions["db_replica"]
+    assert monitor.last_error and monitor.stats["replica_reads"] == 0
+
+
+def test_failed_replica_read_is_retried_on_the_primary(make_app, tmp_path):
+    # Reachable (SELECT 1 works) but without the schema: the query itself fails
+    app = make_app(DATABASE_REPLICA_URL=f"sqlite:///{tmp_path}/empty.db")
+    resp = app.test_client().get(ADMIN_URL, query_string=_auth())
+    assert resp.status_code == 200
+    monitor = app.extensions["db_replica"]
+    assert monitor.stats["fallbacks"] == 1
+    assert "no such table" in monitor.last_error
+
+
+def test_no_replica_configured(app):
+    assert "db_replica" not in app.extensions
+    assert not app.config["SQLALCHEMY_BINDS"]
@@ -0,0 +1,80 @@
+import json
+import logging
+
+import pytest
+
+from resume_site.request_log import JsonFormatter, RequestContextFilter
+
+
+@pytest.fixture
+def json_lines(app):
+    """Capture app.logger output as parsed JSON objects."""
+    lines = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            lines.append(json.loads(self.format(record)))
+
+    handler = _Capture()
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestContextFilter())
+    app.logger.addHandler(handler)
+    previous = app.logger.level
+    app.logger.setLevel(logging.INFO)
+    yield lines
+    app.logger.setLevel(previous)
+    app.logger.removeHandler(handler)
+
+
+def test_request_id_generated_and_echoed(client):
+    resp = client.get("/books")
+    assert len(resp.headers["X-Request-ID"]) == 32
+
+
+def test_incoming_request_id_is_kept_if_sane(client):
+    assert client.get("/books", headers={"X-Request-ID": "abc-123"}).headers["X-Request-ID"] == "abc-123"
+    bogus = client.get("/books", headers={"X-Request-ID": "bad id!"}).headers["X-Request-ID"]
+    assert bogus != "bad id!" and len(bogus) == 32
+
+
+def test_logs_carry_request_context(client, json_lines):
+    client.post(
+        "/resume", data={"name": "X", "email": "not-an-email"}, headers={"X-Request-ID": "req-42"}
+    )
+    warning = next(line for line in json_lines if line["level"] == "WARNING")
+    assert warning["message"] == "Invalid email address provided: not-an-email"
+    assert warning["request_id"] == "req-42"
+    assert warning["route"] == "/resume"
+    assert warning["method"] == "POST"
+    assert warning["client_ip"] == "127.0.0.1"
+
+    access = json_lines[-1]
+    assert access["request_id"] == "req-42"
+    assert access["status"] == 302
+    assert access["latency_ms"] >= 0
+
+
+def test_module_loggers_carry_request_context(make_app):
+    import io
+
+    from flask import g
+
+    app = make_app(LOG_JSON=True)
+    stream = io.StringIO()
+    console = next(h for h in app.logger.handlers if isinstance(h, logging.StreamHandler))
+    console.setStream(stream)
+    with app.test_request_context("/books"):
+        g.request_id = "req-module"
+        logging.getLogger("resume_site.routes").warning("from a module logger")
+    entry = json.loads(stream.getvalue().splitlines()[-1])
+    assert entry["logger"] == "resume_site.routes"
+    assert entry["request_id"] == "req-module"
+    assert entry["route"] == "/books"
+
+
+def test_json_formatter_outside_request():
+    record = logging.LogRecord("x", logging.ERROR, __file__, 1, "boom %s", ("now",), None)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "boom now"
+    assert entry["level"] == "ERROR"
+    assert "request_id" not in entry
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from resume_site.utils import send_email
+
+
+def _send(app, to="reader@example.com", attachment=None):
+    with app.app_context():
+        return send_email(app.extensions["mail"], to, "Your Requested Resume", "Hello", attachment)
+
+
+def _resume_pdf(app):
+    return os.path.join(app.static_folder, "files", "Resume.v3.4.pdf")
+
+
+# --- The real send_email() path, end to end over SMTP ---
+def test_send_email_delivers_over_smtp(smtp_app, smtp_sink):
+    app = smtp_app()
+    assert _send(app, attachment=_resume_pdf(app)) == (True, "OK")
+
+    assert smtp_sink.wait_for(1)
+    message = smtp_sink.messages[0]
+    assert message.mail_from == "test@example.com"
+    assert message.rcpt_tos == ["reader@example.com"]
+    assert b"Subject: Your Requested Resume" in message.data
+    assert b'filename="Resume.v3.4.pdf"' in message.data
+
+
+def test_sends_reuse_one_pooled_session(smtp_app, smtp_sink):
+    app = smtp_app()
+    for i in range(5):
+        assert _send(app, to=f"r{i}@example.com")[0]
+
+    assert smtp_sink.stats["connections"] == 1
+    stats = app.extensions["mail"].pool.stats()
+    assert stats["created"] == 1 and stats["reused"] == 4
+
+
+def test_concurrent_sends_stay_within_pool_size(smtp_app, smtp_sink):
+    smtp_sink.latency = 0.02
+    app = smtp_app(MAIL_POOL_SIZE=2)
+    results = []
+
+    def worker(n):
+        for i in range(5):
+            results.append(_send(app, to=f"t{n}-{i}@example.com")[0])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [True] * 20
+    assert smtp_sink.wait_for(20)
+    assert smtp_sink.stats["connections"] <= 2
+
+
+def test_session_dropped_while_idle_is_replaced(smtp_app, smtp_sink):
+    app = smtp_app()
+    assert _send(app)[0]
+    assert smtp_sink.drop_connections() == 1
+
+    assert _send(app)[0]
+    stats = app.extensions["mail"].pool.stats()
+    assert stats["health_check_failures"] == 1 and stats["created"] == 2
+
+
+@pytest.mark.parametrize("fault, code", [("4xx", "451"), ("5xx", "554")])
+def test_rejected_message_reports_failure_and_discards_session(smtp_app, smtp_sink, fault, code):
+    app = smtp_app()
+    smtp_sink.inject(fault)
+
+    ok, message = _send(app)
+    assert not ok and code in message
+    assert app.extensions["mail"].pool.stats()["discarded"] == 1
+
+    assert _send(app)[0]  # the next message goes through
+    assert len(smtp_sink.messages) == 1
+
+
+def test_connection_drop_mid_send_fails_cleanly(smtp_app, smtp_sink):
+    app = smtp_app()
+    smtp_sink.inject("drop")
+    ok, message = _send(app)
+    assert not ok and "closed" in message.lower()
+    assert app.extensions["mail"].pool.stats()["in_use"] == 0
+    assert _send(app)[0]
+
+
+def test_accept_latency_is_recorded_in_smtp_metrics(smtp_app, smtp_sink):
+    smtp_sink.latency = 0.05
+    app = smtp_app()
+    assert _send(app)[0]
+
+    histogram = app.extensions["metrics"].registry.snapshot()["histograms"]["smtp_send_seconds"]
+    (row,) = histogram.values()
+    assert row[-1] >= 0.05  # sum of observed seconds
+
+
+def test_throughput_cap_limits_send_rate(smtp_app, smtp_sink):
+    smtp_sink.max_rate = 50  # messages/second
+    app = smtp_app()
+    started = time.perf_counter()
+    for i in range(10):
+        assert _send(app, to=f"cap{i}@example.com")[0]
+    assert time.perf_counter() - started >= 9 / 50
+
+
+def test_random_faults_are_repeatable_with_a_seed():
+    from smtp_sink import SMTPSink
+
+    draws = []
+    for _ in range(2):
+        sink = SMTPSink(transient_rate=0.3, drop_rate=0.2, seed=7)
+        draws.append([sink._next_fault() for _ in range(20)])
+        sink._server.server_close()
+    assert draws[0] == draws[1]
+    assert {"4xx", "drop", None} == set(draws[0])
+
+
+# --- Queue retries a deferred message and delivers it on the next attempt ---
+def test_queue_retries_transient_failure_then_delivers(smtp_app, smtp_sink):
+    import resume_site.mail_queue as mq
+    from resume_site.models import OutboundEmail, utcnow_naive
+
+    app = smtp_app()
+    smtp_sink.inject("4xx")
+    with app.test_request_context():
+        job_id = mq.enqueue_email("queued@example.com", "Subject", "Body").id
+
+    dispatcher = app.extensions["mail_queue"]
+    while dispatcher.process_once():
+        pass
+    with app.app_context():
+        job = OutboundEmail.query.get(job_id)
+        assert job.status == "pending" and "451" in job.last_error
+        job.next_attempt_at = utcnow_naive() - timedelta(seconds=1)
+        OutboundEmail.query.session.commit()
+
+    while dispatcher.process_once():
+        pass
+    with app.app_context():
+        job = OutboundEmail.query.get(job_id)
+        assert job.status == "sent" and job.attempts == 2
+    # (rows left due by other tests may be delivered too)
+    assert [m.rcpt_tos for m in smtp_sink.messages].count(["queued@example.com"]) == 1
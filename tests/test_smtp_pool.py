@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP; records NOOP/QUIT and sent messages."""
+
+    def __init__(self):
+        self.noop_code = 250
+        self.closed = False
+        self.sent = []
+
+    def noop(self):
+        return self.noop_code, b"OK"
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.sent.append(to_addrs)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(**kwargs):
+    from resume_site.smtp_pool import SMTPConnectionPool
+    made = []
+
+    def factory():
+        made.append(FakeSMTP())
+        return made[-1]
+
+    return SMTPConnectionPool(factory, **kwargs), made
+
+
+def test_pool_reuses_healthy_session():
+    pool, made = _pool(max_size=2)
+    lease = pool.acquire()
+    pool.release(lease)
+    again = pool.acquire()
+    assert again.host is made[0]
+    pool.release(again)
+    stats = pool.stats()
+    assert stats["created"] == 1 and stats["reused"] == 1 and stats["idle"] == 1
+
+
+def test_pool_replaces_session_failing_noop():
+    pool, made = _pool()
+    lease = pool.acquire()
+    pool.release(lease)
+    made[0].noop_code = 421
+
+    fresh = pool.acquire()
+    assert fresh.host is made[1]
+    assert made[0].closed
+    assert pool.stats()["health_check_failures"] == 1
+
+
+def test_pool_recycles_after_max_messages_and_idle_timeout():
+    pool, made = _pool(max_messages=2, idle_timeout=60)
+    lease = pool.acquire()
+    lease.messages = 2
+    pool.release(lease)
+    assert made[0].closed
+
+    lease = pool.acquire()
+    pool.release(lease)
+    lease.last_used = time.monotonic() - 120  # pretend it sat idle
+    pool.acquire()
+    assert made[1].closed
+    assert pool.stats()["recycled"] == 2
+
+
+def test_pool_is_bounded():
+    from resume_site.smtp_pool import SMTPPoolTimeout
+    pool, _ = _pool(max_size=1, acquire_timeout=0.05)
+    pool.acquire()
+    with pytest.raises(SMTPPoolTimeout):
+        pool.acquire()
+    assert pool.stats()["acquire_timeouts"] == 1
+
+
+# --- Flask-Mail sends go through the pool and keep the session open ---
+def test_mail_send_uses_pooled_session(app):
+    from flask_mail import Message
+
+    state = app.extensions["mail"]
+    state.suppress = False
+    fake = FakeSMTP()
+    state.pool._factory = lambda: fake
+
+    with app.app_context():
+        for to in ("a@example.com", "b@example.com"):
+            state.send(Message("Hi", sender="me@example.com", recipients=[to], body="x"))
+
+    assert len(fake.sent) == 2
+    assert not fake.closed
+    stats = state.pool.stats()
+    assert stats["created"] == 1 and stats["reused"] == 1
@@ -0,0 +1,133 @@
+import threading
+import time
+
+from sqlalchemy import text
+
+from resume_site.sqlite_tuning import WriteQueue, is_file_sqlite
+
+
+def _pragma(app, name):
+    from resume_site.extensions import db
+
+    with app.app_context():
+        return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_profile_is_applied_on_connect(make_app):
+    app = make_app(SQLITE_BUSY_TIMEOUT_MS=1234, SQLITE_CACHE_SIZE_KB=2048)
+    assert _pragma(app, "journal_mode") == "wal"
+    assert _pragma(app, "synchronous") == 1  # NORMAL
+    assert _pragma(app, "busy_timeout") == 1234
+    assert _pragma(app, "cache_size") == -2048
+    assert "PRAGMA mmap_size=268435456" in app.extensions["sqlite_tuning"].pragmas
+
+
+def test_profile_can_be_turned_off(make_app):
+    app = make_app(SQLITE_TUNING=False)
+    assert "sqlite_tuning" not in app.extensions
+    assert _pragma(app, "synchronous") == 2  # SQLite's default, FULL
+
+
+def test_invalid_pragma_values_fall_back_to_defaults(make_app):
+    app = make_app(SQLITE_SYNCHRONOUS="sometimes", SQLITE_CHECKPOINT_MODE="; DROP TABLE x")
+    tuning = app.extensions["sqlite_tuning"]
+    assert "PRAGMA synchronous=NORMAL" in tuning.pragmas
+    assert tuning.maintenance.checkpoint_mode == "PASSIVE"
+
+
+def test_only_file_databases_are_tuned():
+    assert is_file_sqlite("sqlite:////srv/site.db")
+    assert not is_file_sqlite("sqlite:///:memory:")
+    assert not is_file_sqlite("sqlite:///file:x?mode=memory&uri=true")
+    assert not is_file_sqlite("postgresql://db/site")
+
+
+def test_write_slot_is_held_until_the_transaction_ends(app):
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+
+    queue = app.extensions["sqlite_tuning"].write_queue
+    with app.app_context():
+        EmailRequest.query.filter_by(email="slot@example.com").first()  # reads don't queue
+        assert queue._owner is None
+        EmailRequest.record("Slot", "slot@example.com", None)
+        assert queue._owner == threading.get_ident()
+        db.session.commit()
+        assert queue._owner is None
+
+        db.session.add(EmailRequest(name="Slot", email="slot-2@example.com"))
+        db.session.flush()
+        assert queue._owner == threading.get_ident()
+        db.session.rollback()
+        assert queue._owner is None
+
+
+def test_write_queue_is_fifo_and_reentrant():
+    queue = WriteQueue(timeout=5)
+    assert queue.acquire() and queue.acquire()  # same thread: reentrant
+    order = []
+
+    def writer(n):
+        queue.acquire()
+        order.append(n)
+        queue.release()
+
+    threads = []
+    for n in range(4):
+        t = threading.Thread(target=writer, args=(n,))
+        t.start()
+        threads.append(t)
+        while len(queue._waiting) < n + 1:  # queued in start order
+            time.sleep(0.001)
+    queue.release()
+    assert order == []  # still held once
+    queue.release()
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2, 3]
+    assert queue.stats["waited"] == 4
+
+
+def test_write_queue_timeout_lets_sqlite_arbitrate():
+    queue = WriteQueue(timeout=0.05)
+    queue.acquire()
+    results = []
+    t = threading.Thread(target=lambda: results.append(queue.acquire()))
+    t.start()
+    t.join()
+    assert results == [False] and queue.stats["timeouts"] == 1
+
+
+def test_concurrent_writers_do_not_hit_database_is_locked(make_app):
+    from resume_site.extensions import db
+    from resume_site.models import EmailRequest
+
+    app = make_app()
+    errors = []
+
+    def writer(n):
+        for i in range(10):
+            try:
+                with app.app_context():
+                    EmailRequest.record("Writer", f"writer-{n}-{i}@example.com", None)
+                    db.session.commit()
+            except Exception as e:  # pragma: no cover - the failure being guarded against
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with app.app_context():
+        assert EmailRequest.query.filter(EmailRequest.email.like("writer-%")).count() == 160
+
+
+def test_maintenance_checkpoints_and_optimizes(app):
+    maintenance = app.extensions["sqlite_tuning"].maintenance
+    busy, wal_pages, checkpointed = maintenance.run_once()
+    assert busy == 0 and checkpointed <= wal_pages
+    assert maintenance.stats["runs"] == 1 and maintenance.stats["failed"] == 0
+    assert maintenance._thread is None  # no thread under TESTING; started per process otherwise
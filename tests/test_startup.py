@@ -0,0 +1,43 @@
+from resume_site.startup import StartupTimer, config_defaults, create_all_once
+
+
+def test_factory_reports_startup_phases(app):
+    timings = app.extensions["startup_timings"]
+    assert {"config", "extensions", "routes_and_hooks", "schema", "total"} <= set(timings)
+    assert timings["total"] >= sum(v for k, v in timings.items() if k != "total") - 0.01
+
+
+def test_config_defaults_match_from_object():
+    from flask import Config as FlaskConfig
+
+    from config import Config
+
+    expected = FlaskConfig(".")
+    expected.from_object(Config)
+    assert config_defaults(Config) == dict(expected)
+    assert config_defaults(Config) is config_defaults(Config)
+
+
+def test_create_all_runs_once_per_database(app, tmp_path, monkeypatch):
+    from resume_site.extensions import db
+
+    calls = []
+    monkeypatch.setattr(db, "create_all", lambda *a, **k: calls.append(1))
+    (tmp_path / "once.db").touch()
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'once.db'}"
+    assert create_all_once(app, db) is True
+    assert create_all_once(app, db) is False
+    assert len(calls) == 1
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    assert create_all_once(app, db) is True
+    assert create_all_once(app, db) is True  # a fresh in-memory DB every time
+
+
+def test_timer_laps_accumulate():
+    timer = StartupTimer()
+    timer.lap("a")
+    timer.lap("a")
+    timer.lap("b")
+    assert set(timer.phases) == {"a", "b"}
+    assert "total=" in timer.report()
@@ -0,0 +1,62 @@
+import gzip
+import shutil
+
+import pytest
+
+
+@pytest.fixture
+def built_static(app, tmp_path):
+    """A throwaway static folder with a built manifest, wired into the app."""
+    from resume_site.static_assets import build_static_assets, init_static_assets
+
+    static = tmp_path / "static"
+    (static / "images").mkdir(parents=True)
+    (static / "style.css").write_text("body { color: black; }\n" * 200)
+    shutil.copy(f"{app.static_folder}/images/don.jpg", static / "images" / "don.jpg")
+    manifest = build_static_assets(static)
+
+    original = app.static_folder
+    app.static_folder = str(static)
+    app.config["STATIC_MANIFEST"] = None
+    init_static_assets(app)
+    yield manifest
+    app.static_folder = original
+    app.extensions["static_manifest"] = None
+
+
+def test_build_writes_hashed_files_and_variants(built_static, tmp_path):
+    css = built_static["files"]["style.css"]
+    assert css["path"].startswith("dist/style.") and css["path"].endswith(".css")
+    assert "gzip" in css["encodings"]
+    # JPEGs don't compress, so no variant is kept
+    assert built_static["files"]["images/don.jpg"]["encodings"] == []
+    assert (tmp_path / "static" / (css["path"] + ".gz")).exists()
+
+
+def test_url_for_emits_hashed_url(app, built_static):
+    from flask import url_for
+
+    with app.test_request_context():
+        assert url_for("static", filename="style.css", v=16) == (
+            "/static/" + built_static["files"]["style.css"]["path"]
+        )
+        # Unknown files keep their plain URL
+        assert url_for("static", filename="missing.txt") == "/static/missing.txt"
+
+
+def test_hashed_asset_served_precompressed_and_immutable(client, built_static):
+    path = "/static/" + built_static["files"]["style.css"]["path"]
+
+    resp = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.mimetype == "text/css"
+    assert gzip.decompress(resp.data).startswith(b"body { color: black; }")
+
+    plain = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data.startswith(b"body")
+    plain.close()
+    resp.close()
@@ -0,0 +1,50 @@
+from resume_site.template_cache import cache_dir, warm_templates, warmable_templates
+
+
+def test_drafts_are_not_warmed(app):
+    names = warmable_templates(app)
+    assert "base.html" in names
+    assert "components/job_entry.html" in names
+    assert not [n for n in names if n.startswith("_drafts/")]
+
+
+def test_create_app_compiles_templates(make_app, tmp_path):
+    app = make_app(TEMPLATE_CACHE_DIR=str(tmp_path))
+    summary = app.extensions["template_cache"]
+    assert summary["templates"] == len(warmable_templates(app))
+    assert summary["bytecode_cache"] is True
+    # One bytecode file per warmed template
+    assert len(list(tmp_path.glob("*.jinja"))) == summary["templates"]
+
+
+def test_bytecode_cache_is_reused_by_the_next_app(make_app, tmp_path, monkeypatch):
+    make_app(TEMPLATE_CACHE_DIR=str(tmp_path))
+    app = make_app(TEMPLATE_CACHE_DIR=str(tmp_path), TEMPLATE_WARMUP=False)
+
+    compiled = []
+    original = app.jinja_env.compile
+    monkeypatch.setattr(app.jinja_env, "compile", lambda *a, **k: compiled.append(a) or original(*a, **k))
+    assert warm_templates(app) == len(warmable_templates(app))
+    assert compiled == []
+    assert cache_dir(app) == tmp_path
+
+
+def test_edited_template_is_recompiled(make_app, tmp_path, monkeypatch):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "page.html").write_text("v1")
+    app = make_app(TEMPLATE_CACHE_DIR=str(tmp_path / "cache"), TEMPLATE_WARMUP=False)
+    from jinja2 import FileSystemLoader
+
+    app.jinja_env.loader = FileSystemLoader(str(templates))
+    assert app.jinja_env.get_template("page.html").render() == "v1"
+
+    (templates / "page.html").write_text("v2")
+    app.jinja_env.cache.clear()
+    assert app.jinja_env.get_template("page.html").render() == "v2"
+
+
+def test_warmup_can_be_disabled(make_app):
+    app = make_app(TEMPLATE_WARMUP=False, TEMPLATE_BYTECODE_CACHE=False)
+    assert app.extensions["template_cache"] == {"bytecode_cache": False, "templates": 0}
+    assert app.jinja_env.bytecode_cache is None
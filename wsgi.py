@@ -1,4 +1,7 @@
 # wsgi.py
 
 from resume_site import create_app
+from resume_site.lifecycle import warm_app
+
 app = create_app()
+warm_app(app)  # in the gunicorn master under preload, so workers share the result